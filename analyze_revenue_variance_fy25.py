@@ -1,171 +1,40 @@
 """Analyze Revenue Variance Drivers for FY25 using dimensions from local CSV files."""
 
 import asyncio
-import csv
 import json
 from pathlib import Path
 from typing import Optional, List
 from planning_agent.agent import initialize_agent, execute_tool
+from planning_agent.utils.metadata import list_member_names
 
 # Load dimensions from local CSV files
 def load_scenarios_from_csv() -> List[str]:
     """Load scenario names from ExportedMetadata_Scenario.csv"""
-    csv_file = Path("ExportedMetadata_Scenario.csv")
-    scenarios = []
-    if csv_file.exists():
-        with open(csv_file, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                scenario = row.get("Scenario", "").strip()
-                if scenario and scenario != "Scenario":  # Skip header
-                    scenarios.append(scenario)
-    return scenarios if scenarios else ["Actual", "Budget", "Forecast"]
+    return list_member_names("Scenario", ["Actual", "Budget", "Forecast"])
 
 def load_currencies_from_csv() -> List[str]:
     """Load currency names from ExportedMetadata_Currency.csv"""
-    csv_file = Path("ExportedMetadata_Currency.csv")
-    currencies = []
-    if csv_file.exists():
-        encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-        for encoding in encodings:
-            try:
-                with open(csv_file, "r", encoding=encoding) as f:
-                    reader = csv.DictReader(f)
-                    fieldnames = reader.fieldnames
-                    if fieldnames:
-                        currency_col = fieldnames[0]  # First column
-                        for row in reader:
-                            currency = row.get(currency_col, "").strip()
-                            if currency and currency != currency_col:
-                                currencies.append(currency)
-                    break
-            except Exception:
-                if encoding == encodings[-1]:
-                    raise
-                continue
-    return currencies if currencies else ["USD"]
+    return list_member_names("Currency", ["USD"])
 
 def load_costcenters_from_csv() -> List[str]:
     """Load CostCenter members from ExportedMetadata_CostCenter.csv"""
-    csv_file = Path("ExportedMetadata_CostCenter.csv")
-    costcenters = []
-    if csv_file.exists():
-        encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-        for encoding in encodings:
-            try:
-                with open(csv_file, "r", encoding=encoding) as f:
-                    reader = csv.DictReader(f)
-                    fieldnames = reader.fieldnames
-                    if fieldnames:
-                        cc_col = fieldnames[0]
-                        for row in reader:
-                            cc = row.get(cc_col, "").strip()
-                            if cc and cc != cc_col:
-                                costcenters.append(cc)
-                    break
-            except Exception:
-                if encoding == encodings[-1]:
-                    raise
-                continue
-    return costcenters if costcenters else ["No CostCenter"]
+    return list_member_names("CostCenter", ["No CostCenter"])
 
 def load_versions_from_csv() -> List[str]:
     """Load Version members from ExportedMetadata_Version.csv"""
-    csv_file = Path("ExportedMetadata_Version.csv")
-    versions = []
-    if csv_file.exists():
-        encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-        for encoding in encodings:
-            try:
-                with open(csv_file, "r", encoding=encoding) as f:
-                    reader = csv.DictReader(f)
-                    fieldnames = reader.fieldnames
-                    if fieldnames:
-                        version_col = fieldnames[0]
-                        for row in reader:
-                            version = row.get(version_col, "").strip()
-                            if version and version != version_col:
-                                versions.append(version)
-                    break
-            except Exception:
-                if encoding == encodings[-1]:
-                    raise
-                continue
-    return versions if versions else ["Working"]
+    return list_member_names("Version", ["Working"])
 
 def load_regions_from_csv() -> List[str]:
     """Load Region members from ExportedMetadata_Region.csv"""
-    csv_file = Path("ExportedMetadata_Region.csv")
-    regions = []
-    if csv_file.exists():
-        encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-        for encoding in encodings:
-            try:
-                with open(csv_file, "r", encoding=encoding) as f:
-                    reader = csv.DictReader(f)
-                    fieldnames = reader.fieldnames
-                    if fieldnames:
-                        region_col = fieldnames[0]
-                        for row in reader:
-                            region = row.get(region_col, "").strip()
-                            if region and region != region_col:
-                                regions.append(region)
-                    break
-            except Exception:
-                if encoding == encodings[-1]:
-                    raise
-                continue
-    return regions if regions else ["No Region"]
+    return list_member_names("Region", ["No Region"])
 
 def load_future1_from_csv() -> List[str]:
     """Load Future1 members from ExportedMetadata_Future1.csv"""
-    csv_file = Path("ExportedMetadata_Future1.csv")
-    future1_members = []
-    if csv_file.exists():
-        encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-        for encoding in encodings:
-            try:
-                with open(csv_file, "r", encoding=encoding) as f:
-                    reader = csv.DictReader(f)
-                    fieldnames = reader.fieldnames
-                    if fieldnames:
-                        future1_col = fieldnames[0]  # First column
-                        for row in reader:
-                            future1 = row.get(future1_col, "").strip()
-                            if future1 and future1 != future1_col:
-                                future1_members.append(future1)
-                    break
-            except Exception:
-                if encoding == encodings[-1]:
-                    raise
-                continue
-    return future1_members if future1_members else ["No Future1"]
+    return list_member_names("Future1", ["No Future1"])
 
 def load_entities_from_csv() -> List[str]:
     """Load entity names from ExportedMetadata_Entity.csv"""
-    csv_file = Path("ExportedMetadata_Entity.csv")
-    entities = []
-    if csv_file.exists():
-        encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-        for encoding in encodings:
-            try:
-                with open(csv_file, "r", encoding=encoding) as f:
-                    reader = csv.DictReader(f)
-                    # Get the first column name (should be "Entity")
-                    fieldnames = reader.fieldnames
-                    if fieldnames:
-                        entity_col = fieldnames[0]  # First column
-                        for row in reader:
-                            entity = row.get(entity_col, "").strip()
-                            if entity and entity != entity_col:  # Skip header
-                                entities.append(entity)
-                    break
-            except Exception as e:
-                print(f"  [WARNING] Error loading entities: {e}")
-                if encoding == encodings[-1]:
-                    raise
-                continue
-    return entities if entities else ["Total Entity"]
+    return list_member_names("Entity", ["Total Entity"])
 
 async def get_revenue_value(
     account: str,
@@ -36,6 +36,8 @@ def init_dashboard():
                     discount_factor=config.rl_discount_factor,
                     min_samples=config.rl_min_samples
                 )
+                rl_service.sync_policy()
+                rl_service.start_policy_sync()
             except Exception:
                 # RL service initialization is optional
                 pass
@@ -313,8 +315,7 @@ def run_dashboard():
                     
                     # Group Q-values by tool
                     tool_q_values = {}
-                    for key, value in policy_dict.items():
-                        tool_name = key.split(":")[0]
+                    for (tool_name, _), value in policy_dict.items():
                         if tool_name not in tool_q_values:
                             tool_q_values[tool_name] = []
                         tool_q_values[tool_name].append(value)
@@ -2,9 +2,10 @@
 
 import asyncio
 import sys
-import csv
 from planning_agent.client.planning_client import PlanningClient
 from planning_agent.config import load_config
+from planning_agent.utils.metadata import load_dimension_metadata
+from planning_agent.utils.data_slice import decode_data_slice
 
 # Fix encoding for Windows
 if sys.platform == 'win32':
@@ -17,17 +18,13 @@ async def get_top_10_products():
     # Load all leaf-level revenue accounts from CSV
     revenue_accounts = []
     try:
-        with open('ExportedMetadata_Account.csv', 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            for row in reader:
-                if row and len(row) > 5:
-                    account_name = row[0].strip()
-                    data_storage = row[5].strip() if len(row) > 5 else ''
-                    # Get leaf-level (store) revenue accounts
-                    if account_name and account_name.startswith('4') and len(account_name) == 6 and account_name.isdigit():
-                        if data_storage.lower() == 'store':
-                            revenue_accounts.append(account_name)
+        accounts = load_dimension_metadata("Account")
+        if accounts is None:
+            raise FileNotFoundError("ExportedMetadata_Account.csv not found")
+        for i in accounts.filter({"Data Storage": "store"}):
+            account_name = accounts.names[i]
+            if account_name.startswith('4') and len(account_name) == 6 and account_name.isdigit():
+                revenue_accounts.append(account_name)
     except Exception as e:
         print(f"Error reading CSV: {e}")
         return
@@ -75,25 +72,13 @@ async def get_top_10_products():
         rows = result.get("rows", [])
         print(f"Rows returned: {len(rows)}")
         
-        # Extract revenue data
-        revenue_data = []
-        for row in rows:
-            account = row.get("memberName") or row.get("member", "")
-            data = row.get("data", [])
-            if data and len(data) > 0:
-                # Sum all values for this account
-                total_revenue = sum(float(v) for v in data if v is not None)
-                if total_revenue > 0:
-                    revenue_data.append({
-                        "account": account,
-                        "revenue": total_revenue
-                    })
-        
-        # Sort by revenue descending
-        revenue_data.sort(key=lambda x: x["revenue"], reverse=True)
-        
-        # Get top 10
-        top_10 = revenue_data[:10]
+        # Rank accounts by their row totals (vectorized, #Missing ignored)
+        decoded = decode_data_slice(result)
+        top_10 = [
+            {"account": account, "revenue": revenue}
+            for account, revenue in decoded.top_n(10)
+            if revenue > 0
+        ]
         
         print("\n" + "="*60)
         print("TOP 10 PRODUCTS BY REVENUE")
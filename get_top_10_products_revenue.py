@@ -3,9 +3,9 @@
 import asyncio
 import json
 import sys
-import csv
 from planning_agent.client.planning_client import PlanningClient
 from planning_agent.config import load_config
+from planning_agent.utils.metadata import load_dimension_metadata
 
 # Fix encoding for Windows
 if sys.platform == 'win32':
@@ -18,17 +18,13 @@ async def get_top_10_products():
     # Load revenue accounts from CSV - only leaf-level (store) accounts
     revenue_accounts = []
     try:
-        with open('ExportedMetadata_Account.csv', 'r', encoding='utf-8') as f:
-            reader = csv.reader(f)
-            next(reader)  # Skip header
-            for row in reader:
-                if row and len(row) > 5:
-                    account_name = row[0].strip()
-                    data_storage = row[5].strip() if len(row) > 5 else ''
-                    # Look for revenue accounts (400000, 410000, 420000, etc.) that are "store" (leaf level)
-                    if account_name and account_name.startswith('4') and len(account_name) == 6 and account_name.isdigit():
-                        if data_storage.lower() == 'store':
-                            revenue_accounts.append(account_name)
+        accounts = load_dimension_metadata("Account")
+        if accounts is None:
+            raise FileNotFoundError("ExportedMetadata_Account.csv not found")
+        for i in accounts.filter({"Data Storage": "store"}):
+            account_name = accounts.names[i]
+            if account_name.startswith('4') and len(account_name) == 6 and account_name.isdigit():
+                revenue_accounts.append(account_name)
     except Exception as e:
         print(f"Error reading CSV: {e}")
         # Fallback to known leaf-level revenue accounts
@@ -1,35 +1,26 @@
 """Get top 10 products by revenue using local CSV files for dimensions and hierarchies."""
 
 import asyncio
-import csv
 import json
-from pathlib import Path
 from planning_agent.agent import initialize_agent, execute_tool
+from planning_agent.utils.metadata import load_dimension_metadata
 
 def load_accounts_from_csv():
     """Load account dimension from local CSV file."""
-    csv_file = Path("ExportedMetadata_Account.csv")
-    accounts = []
-    
-    if csv_file.exists():
-        try:
-            with open(csv_file, "r", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    account_name = row.get("Account", "").strip()
-                    parent = row.get("Parent", "").strip()
-                    account_type = row.get("Account Type", "").strip()
-                    
-                    if account_name and account_name != "Account":
-                        accounts.append({
-                            "name": account_name,
-                            "parent": parent if parent else "Root",
-                            "account_type": account_type
-                        })
-        except Exception as e:
-            print(f"Error loading accounts from CSV: {e}")
-    
-    return accounts
+    metadata = load_dimension_metadata("Account")
+    if metadata is None:
+        print("Error loading accounts from CSV: ExportedMetadata_Account.csv not found")
+        return []
+
+    account_types = metadata.columns.get("Account Type")
+    return [
+        {
+            "name": name,
+            "parent": metadata.parents[i] or "Root",
+            "account_type": (account_types[i] if account_types is not None else None) or ""
+        }
+        for i, name in enumerate(metadata.names)
+    ]
 
 def find_revenue_accounts(accounts):
     """Find revenue-related accounts from the account list."""
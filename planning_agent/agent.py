@@ -1,29 +1,37 @@
 """ADK Agent - Main agent definition with all Planning tools."""
 
+import asyncio
 import sys
+from pathlib import Path
 from typing import Any, Optional
 
 from planning_agent.config import config, PlanningConfig
 from planning_agent.client.planning_client import PlanningClient
 from planning_agent.services.feedback_service import (
     init_feedback_service,
+    close_feedback_service,
     before_tool_callback,
-    after_tool_callback,
-    get_feedback_service
+    after_tool_callback
 )
 from planning_agent.services.rl_service import (
     init_rl_service,
+    close_rl_service,
     get_rl_service
 )
+from planning_agent.services.execution_context import ExecutionContext
+from planning_agent.services.retention import RetentionManager, run_compaction
 
 # Import all tool modules
 from planning_agent.tools import application, jobs, dimensions, data, variables, documents, snapshots, feedback
 from planning_agent.tools.feedback import track_last_execution
+from planning_agent.utils.cache import configure_members_memory_cache
+from planning_agent.utils.session_store import SessionStore
 
 # Global state
 _planning_client: Optional[PlanningClient] = None
 _app_name: Optional[str] = None
-_session_state: dict[str, dict[str, Any]] = {}  # Track session state for RL
+_session_state = SessionStore(namespace="agent")  # Track session state for RL
+_retention_task: Optional[asyncio.Task] = None
 
 
 def get_client() -> PlanningClient:
@@ -39,16 +47,50 @@ def get_app_name() -> Optional[str]:
     return _app_name
 
 
+def get_http_pool_stats() -> Optional[dict[str, Any]]:
+    """Get connection pool statistics of the active Planning client, if any."""
+    if _planning_client is None:
+        return None
+    return _planning_client.get_pool_stats()
+
+
+def get_session_stats() -> dict[str, Any]:
+    """Get session store statistics."""
+    return _session_state.get_stats()
+
+
+def get_slice_cache_stats() -> Optional[dict[str, Any]]:
+    """Get export_data_slice result cache statistics of the active Planning client, if any."""
+    if _planning_client is None:
+        return None
+    return _planning_client.get_slice_cache_stats()
+
+
 async def initialize_agent(cfg: Optional[PlanningConfig] = None) -> str:
     """Initialize the agent and connect to Planning.
 
     Returns:
         str: The application name or error message.
     """
-    global _planning_client, _app_name
+    global _planning_client, _app_name, _session_state
 
     use_config = cfg or config
 
+    # Session state (RL context and last execution per session), bounded by TTL and count
+    shared_path = Path(use_config.session_store_path) if use_config.session_store_path else None
+    _session_state = SessionStore(
+        use_config.session_ttl_seconds, use_config.session_max_entries, shared_path, namespace="agent"
+    )
+    feedback.set_session_store(SessionStore(
+        use_config.session_ttl_seconds, use_config.session_max_entries, shared_path, namespace="last_execution"
+    ))
+
+    # Parsed dimension members shared by every client in this process
+    configure_members_memory_cache(
+        int(use_config.planning_member_cache_max_mb * 1024 * 1024),
+        use_config.planning_member_cache_check_interval
+    )
+
     # Initialize Planning client (with error handling)
     try:
         _planning_client = PlanningClient(use_config)
@@ -82,7 +124,16 @@ async def initialize_agent(cfg: Optional[PlanningConfig] = None) -> str:
     # Initialize feedback service (optional - don't break if it fails)
     feedback_service = None
     try:
-        feedback_service = init_feedback_service(use_config.database_url)
+        feedback_service = init_feedback_service(
+            use_config.database_url,
+            background_writes=use_config.feedback_background_writes,
+            batch_size=use_config.feedback_batch_size,
+            flush_interval=use_config.feedback_flush_interval_ms / 1000.0,
+            result_inline_max_bytes=use_config.feedback_result_inline_max_bytes,
+            result_preview_chars=use_config.feedback_result_preview_chars,
+            blob_dir=Path(use_config.feedback_result_blob_dir) if use_config.feedback_result_blob_store else None,
+            metrics_ttl=use_config.feedback_metrics_ttl_ms / 1000.0
+        )
         print("Feedback service initialized", file=sys.stderr)
     except Exception as e:
         print(f"Warning: Could not initialize feedback service: {e}", file=sys.stderr)
@@ -100,13 +151,30 @@ async def initialize_agent(cfg: Optional[PlanningConfig] = None) -> str:
                 exploration_rate=use_config.rl_exploration_rate,
                 learning_rate=use_config.rl_learning_rate,
                 discount_factor=use_config.rl_discount_factor,
-                min_samples=use_config.rl_min_samples
+                min_samples=use_config.rl_min_samples,
+                background_writes=use_config.rl_background_writes,
+                batch_size=use_config.rl_policy_batch_size,
+                flush_interval=use_config.rl_policy_flush_interval_ms / 1000.0,
+                journal_path=Path(use_config.rl_policy_journal) if use_config.rl_policy_journal else None,
+                policy_sync_interval=use_config.rl_policy_sync_interval_ms / 1000.0
             )
+            # Load the policy now rather than on the first recommendation, then keep it in sync
+            await asyncio.to_thread(get_rl_service().sync_policy)
+            get_rl_service().start_policy_sync()
             print("RL service initialized", file=sys.stderr)
         except Exception as e:
             print(f"Warning: Could not initialize RL service: {e}", file=sys.stderr)
             print("RL features will be disabled", file=sys.stderr)
 
+    # Periodically compact old feedback rows into daily rollups
+    if feedback_service and use_config.retention_interval_hours > 0:
+        _start_retention_task(RetentionManager(
+            feedback_service,
+            get_rl_service(),
+            execution_retention_days=use_config.feedback_retention_days,
+            episode_retention_days=use_config.rl_episode_retention_days
+        ), use_config.retention_interval_hours * 3600)
+
     # Try to connect to Planning and get application name
     try:
         print("Connecting to Planning to retrieve application info...", file=sys.stderr)
@@ -131,13 +199,47 @@ async def initialize_agent(cfg: Optional[PlanningConfig] = None) -> str:
         return f"Connection failed: {e}"
 
 
+def _start_retention_task(manager: RetentionManager, interval_seconds: float):
+    """Run compaction now and then every interval, off the event loop."""
+    global _retention_task
+
+    async def run():
+        while True:
+            stats = await asyncio.to_thread(run_compaction, manager)
+            if any(stats.values()):
+                print(f"Retention compacted {stats}", file=sys.stderr)
+            await asyncio.sleep(interval_seconds)
+
+    if _retention_task is not None:
+        _retention_task.cancel()
+    _retention_task = asyncio.create_task(run())
+
+
 async def close_agent():
     """Clean up agent resources."""
-    global _planning_client
+    global _planning_client, _retention_task
     if _planning_client:
         await _planning_client.close()
         _planning_client = None
 
+    if _retention_task is not None:
+        _retention_task.cancel()
+        try:
+            await _retention_task
+        except asyncio.CancelledError:
+            pass
+        _retention_task = None
+
+    # Drain queued policy and feedback writes without blocking the event loop
+    try:
+        await asyncio.to_thread(close_rl_service)
+    except Exception as e:
+        print(f"Warning: Could not flush RL service: {e}", file=sys.stderr)
+    try:
+        await asyncio.to_thread(close_feedback_service)
+    except Exception as e:
+        print(f"Warning: Could not flush feedback service: {e}", file=sys.stderr)
+
 
 # Tool registry - maps tool names to handler functions
 TOOL_HANDLERS = {
@@ -152,8 +254,12 @@ TOOL_HANDLERS = {
     "get_dimensions": dimensions.get_dimensions,
     "get_members": dimensions.get_members,
     "get_member": dimensions.get_member,
+    "get_descendants": dimensions.get_descendants,
+    "get_ancestors": dimensions.get_ancestors,
+    "find_members": dimensions.find_members,
     # Data
     "export_data_slice": data.export_data_slice,
+    "export_data_slices_batch": data.export_data_slices_batch,
     "copy_data": data.copy_data,
     "clear_data": data.clear_data,
     # Variables
@@ -206,29 +312,24 @@ async def execute_tool(
         return {"status": "error", "error": f"Unknown tool: {tool_name}"}
 
     # Initialize session state if needed
-    if session_id not in _session_state:
-        _session_state[session_id] = {
-            "tool_sequence": [],
-            "previous_tool": None,
-            "session_length": 0,
-            "user_query": user_query
-        }
-
-    session_state = _session_state[session_id]
+    session_state = _session_state.get(session_id) or _new_session_state(user_query)
+
     previous_tool = session_state["previous_tool"]
     session_length = session_state["session_length"]
 
-    # Track execution start (non-blocking)
+    # Per-call execution context - concurrent calls in one session are timed independently
     try:
-        before_tool_callback(session_id, tool_name, arguments)
+        execution = before_tool_callback(session_id, tool_name, arguments)
     except Exception:
-        pass  # Ignore feedback service errors
+        # Ignore feedback service errors, but keep timing the call
+        execution = ExecutionContext(session_id, tool_name)
 
     # Get RL service for context and learning
     rl_service = get_rl_service() if use_rl else None
     context_hash = None
     
     if rl_service:
+        execution.begin("context")
         try:
             # Create context hash for RL
             context_hash = rl_service.tool_selector.create_context_hash(
@@ -238,92 +339,127 @@ async def execute_tool(
             )
         except Exception:
             pass  # Continue without RL context
+        execution.end("context")
 
+    execution.begin("tool")
     try:
         result = await handler(**arguments)
-
-        # Update session state FIRST (needed for next context hash calculation)
-        session_state["tool_sequence"].append(tool_name)
-        session_state["previous_tool"] = tool_name
-        session_state["session_length"] += 1
-
-        # Track execution end (non-blocking)
-        # This will also trigger RL policy update via feedback_service callback
+    except Exception as e:
+        execution.end("tool")
+        error_result = {"status": "error", "error": str(e)}
         try:
-            execution_id = after_tool_callback(session_id, tool_name, arguments, result, context_hash)
-            
-            # Track last execution for rate_last_tool
-            if execution_id:
-                track_last_execution(session_id, execution_id, tool_name, context_hash)
-
-            # Update RL policy with context if available
-            if rl_service and context_hash and execution_id:
-                try:
-                    # Get execution from feedback service to calculate reward
-                    feedback_service = get_feedback_service()
-                    if feedback_service:
-                        from planning_agent.services.feedback_service import ToolExecution
-                        with feedback_service.Session() as session:
-                            execution = session.get(ToolExecution, execution_id)
-                            if execution:
-                                execution_doc = {
-                                    "success": execution.success,
-                                    "user_rating": execution.user_rating,
-                                    "execution_time_ms": execution.execution_time_ms,
-                                    "tool_name": execution.tool_name
-                                }
-                                reward = rl_service.calculate_reward(execution_doc)
-
-                                # Calculate next context hash for Q-learning
-                                next_context_hash = rl_service.tool_selector.create_context_hash(
-                                    session_state.get("user_query", ""),
-                                    session_state["previous_tool"],
-                                    session_state["session_length"]
-                                )
-
-                                # Get available tools for max Q calculation
-                                available_tools = list(TOOL_HANDLERS.keys())
-
-                                # Q-learning update with next state
-                                rl_service.update_policy(
-                                    session_id,
-                                    tool_name,
-                                    context_hash,
-                                    reward,
-                                    next_context_hash=next_context_hash,
-                                    available_tools=available_tools,
-                                    is_terminal=False
-                                )
-                except Exception:
-                    pass  # Silently fail RL updates
+            after_tool_callback(session_id, tool_name, arguments, error_result, context_hash, execution=execution)
         except Exception:
             pass  # Ignore feedback service errors
 
-        # Add RL metadata to result if available
-        if rl_service and context_hash:
+        # Update session state even on error
+        try:
+            _advance_session(session_id, tool_name, user_query)
+        except Exception:
+            pass  # Ignore session store errors
+
+        return error_result
+    execution.end("tool")
+
+    # Bookkeeping below is guarded step by step: a successful call is never
+    # logged twice or reported as an error because of it
+
+    # Update session state FIRST (needed for next context hash calculation)
+    try:
+        session_state = _advance_session(session_id, tool_name, user_query)
+    except Exception:
+        # Ignore session store errors; the next context still follows this call
+        session_state = _advanced(session_state, tool_name)
+
+    # Track execution end (non-blocking)
+    # This will also trigger RL policy update via feedback_service callback
+    try:
+        execution.begin("logging")
+        execution_id = after_tool_callback(
+            session_id, tool_name, arguments, result, context_hash, execution=execution
+        )
+        execution.end("logging")
+
+        # Track last execution for rate_last_tool
+        if execution_id:
+            track_last_execution(session_id, execution_id, tool_name, context_hash)
+
+        # Update RL policy with context if available
+        if rl_service and context_hash and execution_id and execution.record:
+            execution.begin("rl_update")
             try:
-                confidence = rl_service.get_tool_confidence(tool_name, context_hash)
-                result["rl_metadata"] = {
-                    "confidence": confidence,
-                    "context_hash": context_hash
-                }
+                # Reward from the record just logged - no database read
+                reward = rl_service.calculate_reward(execution.record)
+
+                # Calculate next context hash for Q-learning
+                next_context_hash = rl_service.tool_selector.create_context_hash(
+                    session_state.get("user_query", ""),
+                    session_state["previous_tool"],
+                    session_state["session_length"]
+                )
+
+                # Get available tools for max Q calculation
+                available_tools = list(TOOL_HANDLERS.keys())
+
+                # Q-learning update with next state
+                rl_service.update_policy(
+                    session_id,
+                    tool_name,
+                    context_hash,
+                    reward,
+                    next_context_hash=next_context_hash,
+                    available_tools=available_tools,
+                    is_terminal=False
+                )
             except Exception:
-                pass
+                pass  # Silently fail RL updates
+            execution.end("rl_update")
+    except Exception:
+        pass  # Ignore feedback service errors
 
-        return result
-    except Exception as e:
-        error_result = {"status": "error", "error": str(e)}
+    # Add RL metadata to result if available
+    if rl_service and context_hash:
         try:
-            after_tool_callback(session_id, tool_name, arguments, error_result, context_hash)
+            confidence = rl_service.get_tool_confidence(tool_name, context_hash)
+            result["rl_metadata"] = {
+                "confidence": confidence,
+                "context_hash": context_hash
+            }
         except Exception:
-            pass  # Ignore feedback service errors
+            pass
 
-        # Update session state even on error
-        session_state["tool_sequence"].append(tool_name)
-        session_state["previous_tool"] = tool_name
-        session_state["session_length"] += 1
+    return result
 
-        return error_result
+
+def _new_session_state(user_query: str = "") -> dict[str, Any]:
+    return {
+        "tool_sequence": [],
+        "previous_tool": None,
+        "session_length": 0,
+        "user_query": user_query
+    }
+
+
+def _advanced(session_state: dict[str, Any], tool_name: str) -> dict[str, Any]:
+    """Session state with a tool call recorded."""
+    return {
+        **session_state,
+        "tool_sequence": [*session_state["tool_sequence"], tool_name],
+        "previous_tool": tool_name,
+        "session_length": session_state["session_length"] + 1
+    }
+
+
+def _advance_session(session_id: str, tool_name: str, user_query: str = "") -> dict[str, Any]:
+    """Record a tool call in the stored session state (atomically) and return the new state.
+
+    The read-modify-write happens inside the store, so concurrent calls - in
+    this process or other workers sharing the store - are all counted.
+    """
+    return _session_state.update(
+        session_id,
+        lambda state: _advanced(state or _new_session_state(user_query), tool_name)
+    )
 
 
 async def execute_tool_with_rl(
@@ -353,7 +489,7 @@ async def execute_tool_with_rl(
     
     if rl_service:
         try:
-            session_state = _session_state.get(session_id, {})
+            session_state = _session_state.get(session_id) or {}
             recommendations = rl_service.get_tool_recommendations(
                 user_query=user_query or session_state.get("user_query", ""),
                 previous_tool=session_state.get("previous_tool"),
@@ -382,10 +518,10 @@ def finalize_session(session_id: str, outcome: str = "success"):
         session_id: Session ID to finalize.
         outcome: Session outcome ('success', 'partial', 'failure').
     """
-    if session_id not in _session_state:
+    session_state = _session_state.get(session_id)
+    if session_state is None:
         return
 
-    session_state = _session_state[session_id]
     tool_sequence = session_state.get("tool_sequence", [])
 
     if not tool_sequence:
@@ -427,8 +563,7 @@ def finalize_session(session_id: str, outcome: str = "success"):
         except Exception:
             pass  # Silently fail
     
-    # Clean up session state (keep for a while in case of late feedback)
-    # Could implement TTL cleanup later
+    # Session state is kept for late feedback and expires with the session store's TTL
 
 
 def get_tool_definitions() -> list[dict]:
@@ -461,7 +596,10 @@ Available tools:
 - get_application_info: Get Planning application details
 - list_jobs, get_job_status, execute_job: Monitor and execute jobs
 - get_dimensions, get_members, get_member: Explore dimensions
+- get_descendants, get_ancestors: Navigate member hierarchies
+- find_members: Find members by metadata properties (e.g. Account Type, Data Storage)
 - export_data_slice, copy_data, clear_data: Query and manage data
+- export_data_slices_batch: Export many grids concurrently in one call
 - get_substitution_variables, set_substitution_variable: Manage variables
 - get_documents: Access library documents
 - get_snapshots: List application snapshots
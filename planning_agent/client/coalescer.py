@@ -0,0 +1,268 @@
+"""Grid coalescing - merge concurrent export_data_slice requests into one wide grid."""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Optional
+
+SendSlice = Callable[[str, str, dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+def _requests_aliases(options: dict[str, Any]) -> bool:
+    """True if grid or POV options ask for alias headers (rows then can't be matched by name)."""
+    return any("alias" in str(k).lower() and v for k, v in options.items())
+
+
+def _group_key(app_name: str, plan_type: str, grid: dict[str, Any]) -> Optional[tuple]:
+    """Key of the requests a grid can be merged with, or None if it can't be merged.
+
+    Mergeable grids have single-member POVs, row segments that name their
+    dimensions and plain member names (no functions such as ILvl0Descendants),
+    and don't ask for aliases, so response rows can be matched back to the
+    request by their headers. Anything else is sent on its own right away
+    rather than merged, sent, and retried when the split fails.
+    """
+    pov = grid.get("pov")
+    rows = grid.get("rows")
+    if not isinstance(pov, dict) or not isinstance(rows, list) or not rows:
+        return None
+
+    pov_members = pov.get("members")
+    if not isinstance(pov_members, list):
+        return None
+    if not all(isinstance(m, list) and len(m) == 1 and isinstance(m[0], str) for m in pov_members):
+        return None
+    pov_dims = pov.get("dimensions")
+    if pov_dims is not None and (not isinstance(pov_dims, list) or len(pov_dims) != len(pov_members)):
+        return None
+    if _requests_aliases(grid) or _requests_aliases(pov):
+        return None
+
+    row_dims = None
+    for segment in rows:
+        if not isinstance(segment, dict):
+            return None
+        dims = segment.get("dimensions")
+        members = segment.get("members")
+        if not isinstance(dims, list) or not isinstance(members, list) or len(dims) != len(members):
+            return None
+        if row_dims is None:
+            row_dims = dims
+        elif dims != row_dims:
+            return None
+        for dim_members in members:
+            if not isinstance(dim_members, list):
+                return None
+            if not all(isinstance(m, str) and "(" not in m for m in dim_members):
+                return None
+        if _requests_aliases(segment):
+            return None
+
+    # A POV dimension moved onto rows must not already be a row dimension
+    if pov_dims and set(pov_dims) & set(row_dims):
+        return None
+
+    # POVs without dimension names are positional, so only identical POVs can be merged
+    pov_part = tuple(pov_dims) if pov_dims else json.dumps(pov_members)
+    pov_extra = {k: v for k, v in pov.items() if k not in ("dimensions", "members")}
+    other = {k: v for k, v in grid.items() if k not in ("pov", "rows")}
+
+    return (
+        app_name,
+        plan_type,
+        json.dumps(other, sort_keys=True),
+        json.dumps(pov_extra, sort_keys=True),
+        pov_part,
+        tuple(row_dims),
+    )
+
+
+def merge_grids(
+    grids: list[dict[str, Any]]
+) -> tuple[dict[str, Any], Callable[[dict[str, Any]], list[dict[str, Any]]]]:
+    """Merge grids sharing a group key into one grid.
+
+    POV dimensions whose member differs between grids are moved onto the rows:
+    each request contributes its own row segments extended with its POV members,
+    so the merged grid asks for exactly the cells of the original requests.
+
+    Returns:
+        The merged grid definition and a function splitting the merged
+        response back into one response per input grid.
+    """
+    first = grids[0]
+    pov = first["pov"]
+    pov_dims = pov.get("dimensions")
+    pov_count = len(pov["members"])
+
+    moved = []
+    if pov_dims:
+        moved = [
+            i for i in range(pov_count)
+            if any(g["pov"]["members"][i] != pov["members"][i] for g in grids[1:])
+        ]
+    kept = [i for i in range(pov_count) if i not in moved]
+
+    merged_pov = {k: v for k, v in pov.items() if k not in ("dimensions", "members")}
+    if pov_dims:
+        merged_pov["dimensions"] = [pov_dims[i] for i in kept]
+    merged_pov["members"] = [pov["members"][i] for i in kept]
+
+    row_dims = first["rows"][0]["dimensions"]
+    moved_dims = [pov_dims[i] for i in moved]
+    moved_values = [[g["pov"]["members"][i][0] for i in moved] for g in grids]
+
+    segments = []
+    seen = set()
+    for grid, values in zip(grids, moved_values):
+        for segment in grid["rows"]:
+            merged_segment = {
+                **segment,
+                "dimensions": row_dims + moved_dims,
+                "members": segment["members"] + [[v] for v in values],
+            }
+            segment_key = json.dumps(merged_segment, sort_keys=True)
+            if segment_key not in seen:
+                seen.add(segment_key)
+                segments.append(merged_segment)
+
+    merged = {**first, "pov": merged_pov, "rows": segments}
+
+    row_width = len(row_dims)
+    header_width = row_width + len(moved)
+
+    def matches(grid: dict[str, Any], values: list[str], headers: list[str]) -> bool:
+        if headers[row_width:] != values:
+            return False
+        row_headers = headers[:row_width]
+        return any(
+            all(h in segment["members"][d] for d, h in enumerate(row_headers))
+            for segment in grid["rows"]
+        )
+
+    def split(response: dict[str, Any]) -> list[dict[str, Any]]:
+        rows = response.get("rows")
+        if not isinstance(rows, list):
+            raise ValueError("Merged data slice response has no rows list")
+
+        assigned = [False] * len(rows)
+        results = []
+        for grid, values in zip(grids, moved_values):
+            selected = []
+            for index, row in enumerate(rows):
+                headers = row.get("headers") if isinstance(row, dict) else None
+                if not isinstance(headers, list) or len(headers) != header_width:
+                    raise ValueError("Unexpected row headers in merged data slice response")
+                if matches(grid, values, headers):
+                    assigned[index] = True
+                    selected.append({**row, "headers": headers[:row_width]})
+
+            result = {**response, "rows": selected}
+            if isinstance(response.get("pov"), list):
+                result["pov"] = [m[0] for m in grid["pov"]["members"]]
+            results.append(result)
+
+        if not all(assigned):
+            # Headers came back in a form we can't map (e.g. aliases) - don't guess
+            raise ValueError("Could not map merged data slice rows back to requests")
+        return results
+
+    return merged, split
+
+
+class _SliceGroup:
+    """Requests waiting to be sent together."""
+
+    def __init__(self, app_name: str, plan_type: str):
+        self.app_name = app_name
+        self.plan_type = plan_type
+        self.grids: list[dict[str, Any]] = []
+        self.futures: list[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class GridCoalescer:
+    """Collect export_data_slice requests for a short window and send them as one grid.
+
+    Requests that can't be merged are sent straight through. If a merged
+    request fails, or its response can't be split reliably, each request is
+    retried on its own so callers see exactly the result they would have
+    received without coalescing.
+    """
+
+    def __init__(self, send: SendSlice, window_ms: float, max_requests: int = 50):
+        self._send = send
+        self._window = window_ms / 1000.0
+        self._max_requests = max(1, max_requests)
+        self._groups: dict[tuple, _SliceGroup] = {}
+        # Dispatches in flight, kept referenced until done and awaited by close()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(
+        self,
+        app_name: str,
+        plan_type: str,
+        grid_definition: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Queue a grid for export and wait for its share of the merged response."""
+        key = _group_key(app_name, plan_type, grid_definition)
+        if key is None:
+            return await self._send(app_name, plan_type, grid_definition)
+
+        loop = asyncio.get_running_loop()
+        group = self._groups.get(key)
+        if group is None:
+            group = _SliceGroup(app_name, plan_type)
+            group.timer = loop.call_later(self._window, self._flush, key, group)
+            self._groups[key] = group
+
+        future = loop.create_future()
+        group.grids.append(grid_definition)
+        group.futures.append(future)
+
+        if len(group.grids) >= self._max_requests:
+            group.timer.cancel()
+            self._flush(key, group)
+
+        return await future
+
+    async def close(self):
+        """Send every waiting group now and wait until all dispatches are done."""
+        for key, group in list(self._groups.items()):
+            group.timer.cancel()
+            self._flush(key, group)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self, key: tuple, group: _SliceGroup):
+        if self._groups.get(key) is group:
+            del self._groups[key]
+        task = asyncio.ensure_future(self._dispatch(group))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, group: _SliceGroup):
+        if len(group.grids) > 1:
+            try:
+                merged, split = merge_grids(group.grids)
+                response = await self._send(group.app_name, group.plan_type, merged)
+                results = split(response)
+            except Exception:
+                results = None
+
+            if results is not None:
+                for future, result in zip(group.futures, results):
+                    if not future.done():
+                        future.set_result(result)
+                return
+
+        outcomes = await asyncio.gather(
+            *(self._send(group.app_name, group.plan_type, g) for g in group.grids),
+            return_exceptions=True
+        )
+        for future, outcome in zip(group.futures, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
@@ -1,12 +1,18 @@
 """Planning HTTP Client - Async client for Oracle Planning REST API."""
 
 import base64
+from collections import OrderedDict
 from typing import Any, Optional
 from urllib.parse import quote
 
 import httpx
 
 from planning_agent.config import PlanningConfig
+from planning_agent.client.transport import InstrumentedTransport, build_http_client
+from planning_agent.client.coalescer import GridCoalescer
+from planning_agent.utils.data_slice import DecodedSlice, decode_data_slice
+from planning_agent.utils.result_cache import SLICES_CACHE_DIR, SliceResultCache
+from planning_agent.utils.member_index import MemberIndex
 from planning_agent.client.mock_data import (
     MOCK_APPLICATIONS,
     MOCK_JOBS,
@@ -23,8 +29,18 @@ from planning_agent.client.mock_data import (
 from planning_agent.utils.cache import (
     load_members_from_cache,
     save_members_to_cache,
+    load_endpoint_variant,
+    save_endpoint_variant,
+    strip_member_properties,
+    get_members_signature,
 )
 
+# Finished jobs remembered so each one invalidates cached data only once
+FINISHED_JOBS_MAX = 1024
+# Job status codes of a job that has stopped: success, error, cancelled, invalid
+# parameter (-1 = in progress, 2 = cancel pending)
+TERMINAL_JOB_STATUSES = frozenset({0, 1, 3, 4})
+
 
 class PlanningClient:
     """Async HTTP client for Oracle Planning REST API."""
@@ -33,7 +49,13 @@ class PlanningClient:
         self.config = config
         self.admin_mode = False
         self._client: Optional[httpx.AsyncClient] = None
+        self._transport: Optional[InstrumentedTransport] = None
+        self._coalescer: Optional[GridCoalescer] = None
+        self._slice_cache: Optional[SliceResultCache] = None
+        # (app, dimension) -> (signature of the member sources the index was built from, index)
+        self._member_indexes: dict[tuple[str, str], tuple[tuple, MemberIndex]] = {}
         self._is_fccs_app: Optional[bool] = None  # Cache for FCCS detection
+        self._finished_jobs: OrderedDict[tuple[str, str], None] = OrderedDict()
 
         if not config.planning_mock_mode:
             if not all([config.planning_url, config.planning_username, config.planning_password]):
@@ -52,23 +74,84 @@ class PlanningClient:
                 "Content-Type": "application/json",
             }
 
-            self._client = httpx.AsyncClient(
-                base_url=base_url,
-                headers=headers,
-                timeout=60.0,
-            )
+            self._client, self._transport = build_http_client(config, base_url, headers)
+
+            if config.planning_slice_cache_ttl > 0 or config.planning_slice_cache_plan_type_ttls:
+                self._slice_cache = SliceResultCache(
+                    default_ttl=config.planning_slice_cache_ttl,
+                    max_bytes=int(config.planning_slice_cache_max_mb * 1024 * 1024),
+                    plan_type_ttls=config.planning_slice_cache_plan_type_ttls,
+                    disk_dir=SLICES_CACHE_DIR if config.planning_slice_cache_disk else None
+                )
+
+            if config.planning_coalesce_window_ms > 0:
+                self._coalescer = GridCoalescer(
+                    self._post_data_slice,
+                    config.planning_coalesce_window_ms,
+                    config.planning_coalesce_max_requests
+                )
 
     async def close(self):
         """Close HTTP client."""
+        if self._coalescer:
+            # Merged exports still in flight need the client
+            await self._coalescer.close()
         if self._client:
             await self._client.aclose()
 
+    def get_pool_stats(self) -> Optional[dict[str, Any]]:
+        """Get HTTP connection pool usage statistics (None in mock mode)."""
+        if self._transport is None:
+            return None
+        return self._transport.stats.to_dict()
+
+    def get_slice_cache_stats(self) -> Optional[dict[str, Any]]:
+        """Get export_data_slice result cache statistics (None if disabled)."""
+        if self._slice_cache is None:
+            return None
+        return self._slice_cache.get_stats()
+
+    def _invalidate_data(self, app_name: str):
+        """Forget cached data slices after an operation that may change data."""
+        if self._slice_cache:
+            self._slice_cache.invalidate(app_name)
+
     def _get_query_params(self, has_existing_query: bool = False) -> str:
         """Get admin mode query parameter if needed."""
         if not self.admin_mode:
             return ""
         return "&adminMode=true" if has_existing_query else "?adminMode=true"
 
+    async def _get_first_success(
+        self,
+        app_name: str,
+        operation: str,
+        endpoints: list[str]
+    ) -> Optional[dict[str, Any]]:
+        """GET the first endpoint variant that answers 200, trying the known-good one first.
+
+        The index of the working variant is persisted per app and API version so
+        later calls skip the variants that are known to fail on this tenant.
+        """
+        api_version = self.config.planning_api_version
+        known = load_endpoint_variant(app_name, api_version, operation)
+
+        order = list(range(len(endpoints)))
+        if known is not None and 0 <= known < len(endpoints):
+            order.remove(known)
+            order.insert(0, known)
+
+        for index in order:
+            try:
+                response = await self._client.get(endpoints[index])
+                if response.status_code == 200:
+                    save_endpoint_variant(app_name, api_version, operation, index)
+                    return response.json()
+            except Exception:
+                continue
+
+        return None
+
     # ========== Application Methods ==========
 
     async def get_applications(self) -> dict[str, Any]:
@@ -156,7 +239,16 @@ class PlanningClient:
             f"/{app_name}/jobs/{job_id}{self._get_query_params()}"
         )
         response.raise_for_status()
-        return response.json()
+        status = response.json()
+        # Jobs change data when they finish, not when submitted; later polls of a
+        # finished job don't invalidate again
+        key = (app_name, job_id)
+        if status.get("status") in TERMINAL_JOB_STATUSES and key not in self._finished_jobs:
+            self._invalidate_data(app_name)
+            self._finished_jobs[key] = None
+            if len(self._finished_jobs) > FINISHED_JOBS_MAX:
+                self._finished_jobs.popitem(last=False)
+        return status
 
     async def execute_job(
         self,
@@ -179,6 +271,8 @@ class PlanningClient:
             json=payload
         )
         response.raise_for_status()
+        # Rules, imports and refreshes can all change cube data
+        self._invalidate_data(app_name)
         return response.json()
 
     # ========== Dimension Methods ==========
@@ -196,13 +290,9 @@ class PlanningClient:
             f"/{app_name}/metadata/dimensions",
         ]
 
-        for endpoint in endpoints:
-            try:
-                response = await self._client.get(endpoint)
-                if response.status_code == 200:
-                    return response.json()
-            except Exception:
-                continue
+        dimensions = await self._get_first_success(app_name, "get_dimensions", endpoints)
+        if dimensions is not None:
+            return dimensions
 
         # Fallback dimensions - check if it's an FCCS app
         if self._is_fccs_application(app_name):
@@ -242,14 +332,18 @@ class PlanningClient:
     async def get_members(
         self,
         app_name: str,
-        dimension_name: str
+        dimension_name: str,
+        include_properties: bool = True
     ) -> dict[str, Any]:
-        """Get dimension members / Obter membros da dimensao."""
+        """Get dimension members / Obter membros da dimensao.
+
+        The result is shared with other callers and must not be modified.
+        """
         if self.config.planning_mock_mode:
             return MOCK_MEMBERS
 
         # First, try to load from local cache
-        cached_members = load_members_from_cache(app_name, dimension_name)
+        cached_members = load_members_from_cache(app_name, dimension_name, include_properties)
         if cached_members is not None:
             return cached_members
 
@@ -263,19 +357,36 @@ class PlanningClient:
             f"/{app_name}/dimensions/{dimension_name}",
         ]
 
-        for endpoint in endpoints:
-            try:
-                response = await self._client.get(endpoint)
-                if response.status_code == 200:
-                    members = response.json()
-                    # Save to cache for future use
-                    save_members_to_cache(app_name, dimension_name, members)
-                    return members
-            except Exception:
-                continue
+        members = await self._get_first_success(app_name, "get_members", endpoints)
+        if members is not None:
+            # Save to cache for future use
+            save_members_to_cache(app_name, dimension_name, members)
+            return members if include_properties else strip_member_properties(members)
 
         raise ValueError(f"Could not retrieve members for dimension: {dimension_name}")
 
+    async def get_member_index(
+        self,
+        app_name: str,
+        dimension_name: str
+    ) -> MemberIndex:
+        """Get the hierarchy index for a dimension / Obter o indice de hierarquia da dimensao.
+
+        The index is rebuilt only when the member sources (cache file or
+        metadata export) change.
+        """
+        key = (app_name, dimension_name)
+        # Read before loading, so a change during the load rebuilds next time
+        signature = ("mock",) if self.config.planning_mock_mode else get_members_signature(app_name, dimension_name)
+        cached = self._member_indexes.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        members = await self.get_members(app_name, dimension_name, include_properties=False)
+        index = MemberIndex.from_members(members)
+        self._member_indexes[key] = (signature, index)
+        return index
+
     async def get_member(
         self,
         app_name: str,
@@ -309,6 +420,40 @@ class PlanningClient:
         if self.config.planning_mock_mode:
             return MOCK_DATA_SLICE
 
+        generation = None
+        if self._slice_cache:
+            cached = self._slice_cache.get(app_name, plan_type, grid_definition)
+            if cached is not None:
+                return cached
+            generation = self._slice_cache.generation(app_name)
+
+        if self._coalescer:
+            result = await self._coalescer.submit(app_name, plan_type, grid_definition)
+        else:
+            result = await self._post_data_slice(app_name, plan_type, grid_definition)
+
+        if self._slice_cache:
+            self._slice_cache.put(app_name, plan_type, grid_definition, result, generation)
+        return result
+
+    async def export_data_slice_decoded(
+        self,
+        app_name: str,
+        plan_type: str,
+        grid_definition: dict[str, Any]
+    ) -> DecodedSlice:
+        """Export data slice decoded into NumPy arrays / Exportar fatia de dados em formato colunar."""
+        return decode_data_slice(
+            await self.export_data_slice(app_name, plan_type, grid_definition)
+        )
+
+    async def _post_data_slice(
+        self,
+        app_name: str,
+        plan_type: str,
+        grid_definition: dict[str, Any]
+    ) -> dict[str, Any]:
+        """POST a single exportdataslice request."""
         payload = {"gridDefinition": grid_definition}
 
         response = await self._client.post(
@@ -336,6 +481,7 @@ class PlanningClient:
             json=payload
         )
         response.raise_for_status()
+        self._invalidate_data(app_name)
         return response.json()
 
     async def clear_data(
@@ -353,6 +499,7 @@ class PlanningClient:
             json=payload
         )
         response.raise_for_status()
+        self._invalidate_data(app_name)
         return response.json()
 
     # ========== Substitution Variables Methods ==========
@@ -396,6 +543,8 @@ class PlanningClient:
             json=payload
         )
         response.raise_for_status()
+        # Grids can reference substitution variables
+        self._invalidate_data(app_name)
         return response.json()
 
     # ========== Documents Methods ==========
@@ -0,0 +1,186 @@
+"""HTTP transport for the Planning client - tuned connection pool with usage stats."""
+
+import asyncio
+import sys
+import time
+from typing import Any, Optional
+
+import httpx
+
+from planning_agent.config import PlanningConfig
+
+
+# httpcore's default SETTINGS_MAX_CONCURRENT_STREAMS per HTTP/2 connection
+HTTP2_STREAMS_PER_CONNECTION = 100
+
+
+class PoolStats:
+    """Running counters for connection pool usage (exposed on /metrics)."""
+
+    def __init__(self, max_in_flight: int, http2: bool = False):
+        self.max_in_flight = max_in_flight
+        self.http2 = http2
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.total_requests = 0
+        self.waited_requests = 0  # Requests that found the pool saturated
+        self.total_wait_ms = 0.0
+        self.max_wait_ms = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return a JSON-serializable snapshot of the counters."""
+        return {
+            "http2": self.http2,
+            "max_in_flight": self.max_in_flight,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "saturation": self.in_use / self.max_in_flight if self.max_in_flight else 0.0,
+            "total_requests": self.total_requests,
+            "waited_requests": self.waited_requests,
+            "avg_wait_ms": self.total_wait_ms / self.total_requests if self.total_requests else 0.0,
+            "max_wait_ms": self.max_wait_ms,
+        }
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response stream that frees its pool slot once the body is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            self._release()
+
+
+class InstrumentedTransport(httpx.AsyncHTTPTransport):
+    """AsyncHTTPTransport that tracks how long requests wait for a pooled connection.
+
+    A semaphore sized to the pool's request capacity sits in front of the httpx
+    pool so the time spent waiting for a free slot can be measured; the slot is
+    held until the response body is closed, mirroring httpx's own release.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int,
+        pool_timeout: Optional[float],
+        http2: bool = False,
+        **kwargs
+    ):
+        super().__init__(http2=http2, **kwargs)
+        self.stats = PoolStats(max_in_flight, http2)
+        self._pool_timeout = pool_timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.stats.max_in_flight)
+        return self._slots
+
+    def _release(self):
+        self.stats.in_use -= 1
+        self._get_slots().release()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        slots = self._get_slots()
+        stats = self.stats
+
+        start = time.perf_counter()
+        if not slots.locked():
+            # Free slot: acquire() completes without suspending
+            await slots.acquire()
+        else:
+            stats.waited_requests += 1
+            try:
+                await asyncio.wait_for(slots.acquire(), timeout=self._pool_timeout)
+            except asyncio.TimeoutError:
+                raise httpx.PoolTimeout(
+                    f"Timed out waiting for a connection ({stats.max_in_flight} requests in flight)",
+                    request=request,
+                )
+        wait_ms = (time.perf_counter() - start) * 1000
+
+        stats.total_requests += 1
+        stats.total_wait_ms += wait_ms
+        stats.max_wait_ms = max(stats.max_wait_ms, wait_ms)
+        stats.in_use += 1
+        stats.peak_in_use = max(stats.peak_in_use, stats.in_use)
+
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            self._release()
+            raise
+
+        response.stream = _ReleasingStream(response.stream, self._release)
+        return response
+
+
+def _http2_available() -> bool:
+    """Check whether the optional h2 package is installed."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def build_http_client(
+    config: PlanningConfig,
+    base_url: str,
+    headers: dict[str, str]
+) -> tuple[httpx.AsyncClient, InstrumentedTransport]:
+    """Build the shared AsyncClient for Planning using the pool settings from config.
+
+    Returns:
+        The client and its transport (for pool statistics).
+    """
+    http2 = config.planning_http2
+    if http2 and not _http2_available():
+        print(
+            "Warning: PLANNING_HTTP2=true but the 'h2' package is not installed; "
+            "falling back to HTTP/1.1 (pip install 'httpx[http2]')",
+            file=sys.stderr
+        )
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=config.planning_http_max_connections,
+        max_keepalive_connections=config.planning_http_max_keepalive_connections,
+        keepalive_expiry=config.planning_http_keepalive_expiry,
+    )
+    timeout = httpx.Timeout(
+        connect=config.planning_http_connect_timeout,
+        read=config.planning_http_read_timeout,
+        write=config.planning_http_write_timeout,
+        pool=config.planning_http_pool_timeout,
+    )
+
+    # HTTP/2 multiplexes many requests over each connection
+    max_in_flight = config.planning_http_max_connections
+    if http2:
+        max_in_flight *= HTTP2_STREAMS_PER_CONNECTION
+
+    transport = InstrumentedTransport(
+        max_in_flight=max_in_flight,
+        pool_timeout=config.planning_http_pool_timeout,
+        limits=limits,
+        http2=http2,
+    )
+
+    client = httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        timeout=timeout,
+        transport=transport,
+    )
+    return client, transport
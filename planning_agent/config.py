@@ -15,12 +15,62 @@ class PlanningConfig(BaseSettings):
     planning_api_version: str = Field("v3", alias="PLANNING_API_VERSION")
     planning_mock_mode: bool = Field(False, alias="PLANNING_MOCK_MODE")
 
+    # HTTP connection pool (shared by all sessions using the Planning client)
+    planning_http_max_connections: int = Field(20, alias="PLANNING_HTTP_MAX_CONNECTIONS")
+    planning_http_max_keepalive_connections: int = Field(10, alias="PLANNING_HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    planning_http_keepalive_expiry: float = Field(30.0, alias="PLANNING_HTTP_KEEPALIVE_EXPIRY")
+    planning_http2: bool = Field(False, alias="PLANNING_HTTP2")  # Requires the 'h2' package
+    planning_http_connect_timeout: float = Field(10.0, alias="PLANNING_HTTP_CONNECT_TIMEOUT")
+    planning_http_read_timeout: float = Field(60.0, alias="PLANNING_HTTP_READ_TIMEOUT")
+    planning_http_write_timeout: float = Field(60.0, alias="PLANNING_HTTP_WRITE_TIMEOUT")
+    planning_http_pool_timeout: float = Field(30.0, alias="PLANNING_HTTP_POOL_TIMEOUT")
+
+    # Batch data exports (export_data_slices_batch)
+    planning_batch_concurrency: int = Field(4, alias="PLANNING_BATCH_CONCURRENCY")
+    planning_rate_limit_per_second: float = Field(0.0, alias="PLANNING_RATE_LIMIT_PER_SECOND")  # 0 = unlimited
+    planning_rate_limit_burst: int = Field(5, alias="PLANNING_RATE_LIMIT_BURST")
+
+    # Grid coalescing: merge export_data_slice calls arriving within the window (0 = off)
+    planning_coalesce_window_ms: float = Field(0.0, alias="PLANNING_COALESCE_WINDOW_MS")
+    planning_coalesce_max_requests: int = Field(50, alias="PLANNING_COALESCE_MAX_REQUESTS")
+
+    # export_data_slice result cache (invalidated by copy_data, clear_data and execute_job)
+    planning_slice_cache_ttl: float = Field(0.0, alias="PLANNING_SLICE_CACHE_TTL")  # Seconds, 0 = off
+    planning_slice_cache_plan_type_ttls: dict[str, float] = Field(
+        default_factory=dict, alias="PLANNING_SLICE_CACHE_PLAN_TYPE_TTLS"
+    )  # JSON, e.g. {"FinPlan": 600}
+    planning_slice_cache_max_mb: float = Field(64.0, alias="PLANNING_SLICE_CACHE_MAX_MB")
+    planning_slice_cache_disk: bool = Field(False, alias="PLANNING_SLICE_CACHE_DISK")
+
+    # Process-level cache of parsed dimension members
+    planning_member_cache_max_mb: float = Field(128.0, alias="PLANNING_MEMBER_CACHE_MAX_MB")
+    planning_member_cache_check_interval: float = Field(5.0, alias="PLANNING_MEMBER_CACHE_CHECK_INTERVAL")  # Seconds
+
     # Database (SQLite for sessions + feedback + RL)
     database_url: str = Field(
         "sqlite:///./planning_agent.db",
         alias="DATABASE_URL"
     )
 
+    # Feedback logging: queue tool executions and write them in batches from a background thread
+    # (unset = only on PostgreSQL; SQLite batching assumes a single writing process)
+    feedback_background_writes: Optional[bool] = Field(None, alias="FEEDBACK_BACKGROUND_WRITES")
+    feedback_batch_size: int = Field(100, alias="FEEDBACK_BATCH_SIZE")
+    feedback_flush_interval_ms: float = Field(500.0, alias="FEEDBACK_FLUSH_INTERVAL_MS")
+    feedback_metrics_ttl_ms: float = Field(30000.0, alias="FEEDBACK_METRICS_TTL_MS")  # Reload of cached tool metrics
+
+    # Tool results above this size are stored as digest + size + preview; the full
+    # result is kept compressed in the blob store if enabled
+    feedback_result_inline_max_bytes: int = Field(16384, alias="FEEDBACK_RESULT_INLINE_MAX_BYTES")
+    feedback_result_preview_chars: int = Field(1000, alias="FEEDBACK_RESULT_PREVIEW_CHARS")
+    feedback_result_blob_store: bool = Field(False, alias="FEEDBACK_RESULT_BLOB_STORE")
+    feedback_result_blob_dir: str = Field(".cache/results", alias="FEEDBACK_RESULT_BLOB_DIR")
+
+    # Retention: rows older than this are compacted into daily rollups (0 = keep forever)
+    feedback_retention_days: int = Field(90, alias="FEEDBACK_RETENTION_DAYS")
+    rl_episode_retention_days: int = Field(365, alias="RL_EPISODE_RETENTION_DAYS")
+    retention_interval_hours: float = Field(24.0, alias="RETENTION_INTERVAL_HOURS")  # 0 = only via scripts/compact_db.py
+
     # Gemini Model
     google_api_key: Optional[str] = Field(None, alias="GOOGLE_API_KEY")
     model_id: str = Field("gemini-2.0-flash", alias="MODEL_ID")
@@ -28,12 +78,23 @@ class PlanningConfig(BaseSettings):
     # Server
     port: int = Field(8080, alias="PORT")
 
+    # Session state (per session ID): expiry after the last tool call, max sessions kept,
+    # and an optional SQLite file shared by workers on this host (empty = per process)
+    session_ttl_seconds: float = Field(21600.0, alias="SESSION_TTL_SECONDS")
+    session_max_entries: int = Field(10000, alias="SESSION_MAX_ENTRIES")
+    session_store_path: str = Field("", alias="SESSION_STORE_PATH")
+
     # Reinforcement Learning Configuration
     rl_enabled: bool = Field(True, alias="RL_ENABLED")
     rl_exploration_rate: float = Field(0.1, alias="RL_EXPLORATION_RATE")
     rl_learning_rate: float = Field(0.1, alias="RL_LEARNING_RATE")
     rl_discount_factor: float = Field(0.9, alias="RL_DISCOUNT_FACTOR")
     rl_min_samples: int = Field(5, alias="RL_MIN_SAMPLES")  # Minimum samples before using RL
+    rl_background_writes: bool = Field(True, alias="RL_BACKGROUND_WRITES")
+    rl_policy_batch_size: int = Field(500, alias="RL_POLICY_BATCH_SIZE")
+    rl_policy_flush_interval_ms: int = Field(1000, alias="RL_POLICY_FLUSH_INTERVAL_MS")
+    rl_policy_journal: str = Field(".cache/rl_policy.journal", alias="RL_POLICY_JOURNAL")  # Empty = no journal
+    rl_policy_sync_interval_ms: int = Field(5000, alias="RL_POLICY_SYNC_INTERVAL_MS")  # 0 = load once
 
     model_config = {
         "env_file": ".env",
@@ -0,0 +1,126 @@
+"""Background writer that persists queued records in batches, off the event loop."""
+
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Optional
+
+_STOP = object()
+_TIMEOUT = object()
+
+
+class BatchWriter:
+    """Queue records and write them from a background thread in bulk.
+
+    A batch is written when it reaches ``batch_size`` records or
+    ``flush_interval`` seconds after its first record arrived, whichever
+    comes first. ``write_batch`` runs on the writer thread only, so it can
+    use blocking database I/O without stalling the event loop.
+
+    Write errors are reported on stderr and counted, never raised to the
+    code that submitted the records.
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[list[Any]], None],
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        name: str = "batch-writer"
+    ):
+        self._write_batch = write_batch
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def submit(self, record: Any):
+        """Queue a record for writing."""
+        if self._closed:
+            raise RuntimeError("BatchWriter is closed")
+        self._queue.put(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Write everything queued so far and wait for it.
+
+        Returns:
+            False if the timeout expired before the queued records were written.
+        """
+        if self._closed or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Write any queued records and stop the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "batches": self.batches,
+            "failed": self.failed,
+            "batch_size": self.batch_size,
+            "flush_interval": self.flush_interval,
+        }
+
+    def _run(self):
+        batch: list[Any] = []
+        waiters: list[threading.Event] = []
+        deadline: Optional[float] = None
+        stop = False
+
+        while not stop:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = _TIMEOUT
+
+            if item is _STOP:
+                stop = True
+            elif isinstance(item, threading.Event):
+                # Flush request - the queue is FIFO, so everything submitted before it is in the batch
+                waiters.append(item)
+            elif item is not _TIMEOUT:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            if batch:
+                self._write(batch)
+                batch = []
+            deadline = None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+    def _write(self, batch: list[Any]):
+        try:
+            self._write_batch(batch)
+            self.written += len(batch)
+            self.batches += 1
+        except Exception as e:
+            self.failed += len(batch)
+            print(f"Warning: Failed to write batch of {len(batch)} records: {e}", file=sys.stderr)
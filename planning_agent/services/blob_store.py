@@ -0,0 +1,60 @@
+"""Content-addressed, compressed blob store on local disk."""
+
+import hashlib
+import os
+import zlib
+from pathlib import Path
+from typing import Optional
+
+
+def content_digest(data: bytes) -> str:
+    """SHA-256 hex digest used as a blob's address."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    """Stores payloads zlib-compressed under ``root/<first 2 hex>/<digest>.z``.
+
+    Identical payloads are stored once. Writes are atomic (temp file and
+    rename), so concurrent writers of the same blob are harmless.
+    """
+
+    def __init__(self, root: Path, compression_level: int = 6):
+        self.root = Path(root)
+        self.compression_level = compression_level
+
+    def _path(self, digest: str) -> Path:
+        return self.root / digest[:2] / f"{digest}.z"
+
+    def put(self, data: bytes, digest: Optional[str] = None) -> str:
+        """Store a payload (if not already stored) and return its digest."""
+        digest = digest or content_digest(data)
+        path = self._path(digest)
+        if path.exists():
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(zlib.compress(data, self.compression_level))
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """Read a payload back, or None if it isn't stored."""
+        try:
+            with open(self._path(digest), "rb") as f:
+                return zlib.decompress(f.read())
+        except (OSError, zlib.error):
+            return None
+
+    def has(self, digest: str) -> bool:
+        return self._path(digest).exists()
+
+    def delete(self, digest: str) -> bool:
+        """Remove a payload; returns False if it wasn't stored."""
+        try:
+            self._path(digest).unlink()
+            return True
+        except OSError:
+            return False
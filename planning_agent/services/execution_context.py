@@ -0,0 +1,70 @@
+"""Per-invocation tool execution context with monotonic phase timings."""
+
+import time
+from contextvars import ContextVar, Token
+from typing import Any, Optional
+
+_current_execution: ContextVar[Optional["ExecutionContext"]] = ContextVar("tool_execution", default=None)
+
+
+class ExecutionContext:
+    """State of one tool invocation.
+
+    Each call gets its own context (held in a ContextVar, so concurrent
+    calls - even in the same session - never share one). Phases are
+    timed with ``time.perf_counter``, unaffected by wall-clock changes.
+    """
+
+    def __init__(self, session_id: str, tool_name: str):
+        self.session_id = session_id
+        self.tool_name = tool_name
+        self.started_at = time.perf_counter()
+        self._phase_start: dict[str, float] = {}
+        self._phase_end: dict[str, float] = {}
+        self._token: Optional[Token] = None
+        # What was logged for this call (set by after_tool_callback)
+        self.record: Optional[dict[str, Any]] = None
+
+    def begin(self, phase: str):
+        """Mark the start of a phase."""
+        self._phase_start[phase] = time.perf_counter()
+
+    def end(self, phase: str):
+        """Mark the end of a phase."""
+        self._phase_end[phase] = time.perf_counter()
+
+    def phase_ms(self, phase: str) -> Optional[float]:
+        """Duration of a phase (up to now if it hasn't ended), or None if it never began."""
+        start = self._phase_start.get(phase)
+        if start is None:
+            return None
+        return (self._phase_end.get(phase, time.perf_counter()) - start) * 1000
+
+    def elapsed_ms(self) -> float:
+        """Time since the invocation started."""
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def timings_ms(self) -> dict[str, float]:
+        """Duration of every phase that began, plus the total so far."""
+        timings = {phase: self.phase_ms(phase) for phase in self._phase_start}
+        timings["total"] = self.elapsed_ms()
+        return timings
+
+
+def start_execution(session_id: str, tool_name: str) -> ExecutionContext:
+    """Create the context of a new invocation and make it current."""
+    execution = ExecutionContext(session_id, tool_name)
+    execution._token = _current_execution.set(execution)
+    return execution
+
+
+def end_execution(execution: ExecutionContext):
+    """Restore the context that was current before ``start_execution`` (once)."""
+    if execution._token is not None:
+        _current_execution.reset(execution._token)
+        execution._token = None
+
+
+def current_execution() -> Optional[ExecutionContext]:
+    """Context of the invocation running in this task, if any."""
+    return _current_execution.get()
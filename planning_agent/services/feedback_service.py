@@ -1,17 +1,40 @@
 """Feedback Service - PostgreSQL-based tracking for reinforcement learning."""
 
+import json
+import sys
+import threading
 import time
+from collections import deque
 from datetime import datetime
+from pathlib import Path
 from typing import Any, Optional
 
 from sqlalchemy import (
-    Column, Integer, String, Float, DateTime, JSON, Boolean,
-    create_engine, func
+    Column, Integer, String, Float, Date, DateTime, JSON, Boolean, Index,
+    case, cast, create_engine, insert, inspect, select, text, update
 )
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from planning_agent.services import latency_sketch
+from planning_agent.services.batch_writer import BatchWriter
+from planning_agent.services.blob_store import BlobStore, content_digest
+from planning_agent.services.execution_context import (
+    ExecutionContext,
+    current_execution,
+    end_execution,
+    start_execution,
+)
+from planning_agent.services.upsert import dialect_insert, increment_upsert
+
 Base = declarative_base()
 
+# Execution IDs reserved per database round trip when writes are batched
+ID_BLOCK_SIZE = 100
+
+# Counters kept per tool by the in-memory metrics snapshot
+_SNAPSHOT_COUNTERS = ("total_calls", "success_count", "total_execution_time_ms", "rating_sum", "rating_count")
+
 
 class ToolExecution(Base):
     """Track tool executions for feedback and RL."""
@@ -22,11 +45,13 @@ class ToolExecution(Base):
     session_id = Column(String, index=True)
     tool_name = Column(String, index=True)
     arguments = Column(JSON)
-    result = Column(JSON)
+    result = Column(JSON)  # Whole result, or a preview if it was larger than the inline limit
+    result_digest = Column(String(64), nullable=True)  # SHA-256 of the result JSON
+    result_size = Column(Integer, nullable=True)  # Bytes of the result JSON
     success = Column(Boolean)
     error_message = Column(String, nullable=True)
     execution_time_ms = Column(Float)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
     # User feedback (added later via API)
     user_rating = Column(Integer, nullable=True)  # 1-5 scale
@@ -35,6 +60,11 @@ class ToolExecution(Base):
     # RL context for retroactive Q-value updates
     context_hash = Column(String(64), nullable=True, index=True)
 
+    __table_args__ = (
+        # Per-tool history in time order (recent executions, per-tool scans)
+        Index("ix_tool_executions_tool_created", "tool_name", "created_at"),
+    )
+
 
 class ToolMetrics(Base):
     """Aggregated metrics per tool for analysis."""
@@ -47,18 +77,140 @@ class ToolMetrics(Base):
     success_count = Column(Integer, default=0, nullable=False, server_default="0")
     failure_count = Column(Integer, default=0, nullable=False, server_default="0")
     avg_execution_time_ms = Column(Float, default=0, nullable=False, server_default="0")
+    total_execution_time_ms = Column(Float, default=0, nullable=False, server_default="0")
+    rating_sum = Column(Integer, default=0, nullable=False, server_default="0")
+    rating_count = Column(Integer, default=0, nullable=False, server_default="0")
     avg_user_rating = Column(Float, nullable=True)
     last_updated = Column(DateTime, default=datetime.utcnow)
 
 
+class ToolLatencyBucket(Base):
+    """Execution time histogram per tool (log buckets, see latency_sketch)."""
+
+    __tablename__ = "tool_latency_buckets"
+
+    tool_name = Column(String, primary_key=True)
+    bucket = Column(Integer, primary_key=True, autoincrement=False)
+    count = Column(Integer, default=0, nullable=False, server_default="0")
+
+
+class ToolExecutionDaily(Base):
+    """Daily per-tool rollup of executions removed by retention (see services.retention)."""
+
+    __tablename__ = "tool_execution_daily"
+
+    tool_name = Column(String, primary_key=True)
+    day = Column(Date, primary_key=True)
+    total_calls = Column(Integer, default=0, nullable=False, server_default="0")
+    success_count = Column(Integer, default=0, nullable=False, server_default="0")
+    failure_count = Column(Integer, default=0, nullable=False, server_default="0")
+    total_execution_time_ms = Column(Float, default=0, nullable=False, server_default="0")
+    rating_sum = Column(Integer, default=0, nullable=False, server_default="0")
+    rating_count = Column(Integer, default=0, nullable=False, server_default="0")
+
+
+# Columns added after the first release: table -> column -> (DDL type, backfill expression)
+_COLUMN_MIGRATIONS = {
+    "tool_executions": {
+        "result_digest": ("VARCHAR(64)", None),
+        "result_size": ("INTEGER", None),
+    },
+    "tool_metrics": {
+        "total_execution_time_ms": (
+            "FLOAT NOT NULL DEFAULT 0",
+            "COALESCE(avg_execution_time_ms, 0) * COALESCE(total_calls, 0)"
+        ),
+        "rating_sum": (
+            "INTEGER NOT NULL DEFAULT 0",
+            "COALESCE((SELECT SUM(e.user_rating) FROM tool_executions e "
+            "WHERE e.tool_name = tool_metrics.tool_name), 0)"
+        ),
+        "rating_count": (
+            "INTEGER NOT NULL DEFAULT 0",
+            "(SELECT COUNT(e.user_rating) FROM tool_executions e "
+            "WHERE e.tool_name = tool_metrics.tool_name)"
+        ),
+    },
+}
+
+# Key marking a result column that holds a preview instead of the result
+OFFLOADED_KEY = "_offloaded"
+
+
 class FeedbackService:
-    """Service for tracking tool executions and user feedback."""
+    """Service for tracking tool executions and user feedback.
+
+    With ``background_writes`` enabled, log_execution only queues the
+    execution: a BatchWriter thread inserts queued executions and updates
+    the tool metrics in bulk, so tool calls never wait on the database.
+    Execution IDs are reserved in blocks ahead of time (the writer thread
+    tops the block up), so callers still get the ID immediately. PostgreSQL
+    reserves them from the id sequence. SQLite has no sequence and the
+    blocks come from MAX(id), which is only safe with a single writing
+    process, so by default (``background_writes=None``) batching is only
+    used on PostgreSQL; a row whose ID another process took anyway is
+    written with a database-assigned ID rather than lost.
+
+    Results larger than ``result_inline_max_bytes`` are stored as a digest,
+    size and truncated preview. With ``blob_dir`` set, the full result is
+    also written compressed to a content-addressed BlobStore and can be read
+    back with get_execution_result.
+    """
 
-    def __init__(self, db_url: str):
+    def __init__(
+        self,
+        db_url: str,
+        background_writes: Optional[bool] = False,
+        batch_size: int = 100,
+        flush_interval: float = 0.5,
+        result_inline_max_bytes: int = 16384,
+        result_preview_chars: int = 1000,
+        blob_dir: Optional[Path] = None,
+        metrics_ttl: float = 30.0
+    ):
         self.engine = create_engine(db_url)
         Base.metadata.create_all(self.engine)
+        self._migrate_schema()
         self.Session = sessionmaker(bind=self.engine)
 
+        self.result_inline_max_bytes = result_inline_max_bytes
+        self.result_preview_chars = result_preview_chars
+        self._blob_store = BlobStore(blob_dir) if blob_dir else None
+
+        # Queued executions not yet written, by reserved ID
+        self._pending: dict[int, dict[str, Any]] = {}
+        self._reserved_ids: deque[int] = deque()
+        self._id_floor = 0
+        self._lock = threading.Lock()
+        # Serializes ID reservation (database I/O), kept apart from _lock so
+        # log_execution never waits on it
+        self._reserve_lock = threading.Lock()
+
+        # In-memory tool metrics (see get_metrics_snapshot)
+        self.metrics_ttl = metrics_ttl
+        self._metrics_lock = threading.Lock()
+        # Held from a counter commit until its delta is in the snapshot, and
+        # from a reload's query until its swap, so each commit is counted by
+        # exactly one of them
+        self._metrics_sync_lock = threading.Lock()
+        self._metrics_counters: dict[str, dict[str, Any]] = {}
+        self._metrics_snapshot: dict[str, dict] = {}
+        self._metrics_loaded_at: Optional[float] = None
+        self._metrics_refreshing = False
+
+        if background_writes is None:
+            background_writes = self.engine.dialect.name != "sqlite"
+
+        self._writer: Optional[BatchWriter] = None
+        if background_writes:
+            self._refill_ids()
+            self._writer = BatchWriter(
+                self._write_executions,
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                name="feedback-writer"
+            )
+
     def log_execution(
         self,
         session_id: str,
@@ -70,29 +222,47 @@ class FeedbackService:
         execution_time_ms: float,
         context_hash: Optional[str] = None
     ) -> int:
-        """Log a tool execution and return its ID."""
+        """Log a tool execution and return its ID.
+
+        With background writes the result is serialized, hashed and (if
+        large) offloaded by the writer thread, so a multi-MB result doesn't
+        hold up the caller.
+        """
+        record = {
+            "session_id": session_id,
+            "tool_name": tool_name,
+            "arguments": arguments,
+            "result": result if success else None,
+            "success": success,
+            "error_message": error_message,
+            "execution_time_ms": execution_time_ms,
+            "context_hash": context_hash,
+            "created_at": datetime.utcnow(),
+        }
+
+        if self._writer is not None:
+            execution_id = -1
+            try:
+                execution_id = self._reserve_id()
+                record["id"] = execution_id
+                with self._lock:
+                    self._pending[execution_id] = record
+                self._writer.submit(record)
+                return execution_id
+            except Exception:
+                with self._lock:
+                    self._pending.pop(execution_id, None)
+                return -1
+
         try:
             with self.Session() as session:
-                execution = ToolExecution(
-                    session_id=session_id,
-                    tool_name=tool_name,
-                    arguments=arguments,
-                    result=result if success else None,
-                    success=success,
-                    error_message=error_message,
-                    execution_time_ms=execution_time_ms,
-                    context_hash=context_hash
-                )
+                execution = ToolExecution(**self._prepare_row(record))
                 session.add(execution)
                 session.commit()
                 execution_id = execution.id
 
             # Update aggregated metrics in a separate session to avoid conflicts
-            try:
-                self._update_metrics_separate_session(tool_name, success, execution_time_ms)
-            except Exception:
-                # If metrics update fails, just log the execution without metrics
-                pass
+            self._update_metrics([record])
 
             return execution_id
         except Exception:
@@ -100,25 +270,256 @@ class FeedbackService:
             # but don't raise - we don't want to break tool execution
             return -1
 
+    def _migrate_schema(self):
+        """Add columns and indexes that tables created by older versions are missing."""
+        for index in ToolExecution.__table__.indexes:
+            index.create(self.engine, checkfirst=True)
+
+        inspector = inspect(self.engine)
+        for table, columns in _COLUMN_MIGRATIONS.items():
+            existing = {c["name"] for c in inspector.get_columns(table)}
+            missing = {k: v for k, v in columns.items() if k not in existing}
+            if not missing:
+                continue
+            with self.engine.begin() as conn:
+                for column, (ddl, backfill) in missing.items():
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+                    if backfill:
+                        conn.execute(text(f"UPDATE {table} SET {column} = {backfill}"))
+
+    def _reserve_id(self) -> int:
+        """Next reserved execution ID.
+
+        The writer thread refills the block once it is half used, so this
+        only touches the database if a burst used up a whole block first.
+        """
+        while True:
+            with self._lock:
+                if self._reserved_ids:
+                    return self._reserved_ids.popleft()
+            self._refill_ids()
+
+    def _refill_ids(self):
+        """Top the reserved ID block up if it is half used."""
+        with self._reserve_lock:
+            with self._lock:
+                if len(self._reserved_ids) >= ID_BLOCK_SIZE // 2:
+                    return
+            ids = self._reserve_ids(ID_BLOCK_SIZE)
+            with self._lock:
+                self._reserved_ids.extend(ids)
+
+    def _reserve_ids(self, count: int) -> list[int]:
+        """Reserve ``count`` execution IDs that no other writer will use."""
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name == "postgresql":
+                return list(conn.execute(
+                    text(
+                        "SELECT nextval(pg_get_serial_sequence('tool_executions', 'id')) "
+                        "FROM generate_series(1, :count)"
+                    ),
+                    {"count": count}
+                ).scalars())
+
+            max_id = conn.execute(text("SELECT MAX(id) FROM tool_executions")).scalar() or 0
+        # Queued rows aren't in MAX(id) yet, so never go below the last block
+        start = max(max_id, self._id_floor) + 1
+        self._id_floor = start + count - 1
+        return list(range(start, start + count))
+
+    def _write_executions(self, records: list[dict[str, Any]]):
+        """Insert a batch of queued executions and fold them into the tool metrics.
+
+        If the batch insert fails, rows are retried one by one so a single
+        bad row doesn't lose the batch; a row whose reserved ID is already
+        taken is inserted with a database-assigned ID instead.
+        """
+        try:
+            self._refill_ids()
+        except Exception as e:
+            print(f"Warning: Could not reserve execution IDs: {e}", file=sys.stderr)
+
+        try:
+            rows = [self._prepare_row(record) for record in records]
+            try:
+                with self.Session() as session:
+                    session.execute(insert(ToolExecution), rows)
+                    session.commit()
+                written = records
+            except Exception as e:
+                print(f"Warning: Batch insert of {len(rows)} executions failed, retrying row by row: {getattr(e, 'orig', e)}",
+                      file=sys.stderr)
+                written = [record for record, row in zip(records, rows) if self._write_execution(row)]
+            self._update_metrics(written)
+        finally:
+            with self._lock:
+                for record in records:
+                    self._pending.pop(record["id"], None)
+
+    def _write_execution(self, row: dict[str, Any]) -> bool:
+        """Insert one execution row, with a new ID if its ID is taken. Returns success."""
+        try:
+            with self.Session() as session:
+                session.execute(insert(ToolExecution), [row])
+                session.commit()
+            return True
+        except IntegrityError:
+            reassigned = {k: v for k, v in row.items() if k != "id"}
+            try:
+                with self.Session() as session:
+                    session.execute(insert(ToolExecution), [reassigned])
+                    session.commit()
+                print(f"Warning: Execution ID {row['id']} was taken by another writer; "
+                      f"stored with a new ID", file=sys.stderr)
+                return True
+            except Exception as e:
+                print(f"Warning: Could not write execution {row['id']}: {e}", file=sys.stderr)
+        except Exception as e:
+            print(f"Warning: Could not write execution {row['id']}: {e}", file=sys.stderr)
+        return False
+
+    def _prepare_row(self, record: dict[str, Any]) -> dict[str, Any]:
+        """Execution row for a record, with large results replaced by a preview."""
+        row = dict(record)
+        result = record["result"]
+        if result is None:
+            return row
+
+        payload = _encode_result(result)
+        digest = content_digest(payload)
+        row["result_digest"] = digest
+        row["result_size"] = len(payload)
+        if len(payload) <= self.result_inline_max_bytes:
+            return row
+
+        stored = False
+        if self._blob_store is not None:
+            try:
+                self._blob_store.put(payload, digest)
+                stored = True
+            except OSError as e:
+                print(f"Warning: Could not store execution result: {e}", file=sys.stderr)
+
+        row["result"] = {
+            OFFLOADED_KEY: True,
+            "digest": digest,
+            "size": len(payload),
+            "stored": stored,
+            "preview": payload[:self.result_preview_chars].decode("utf-8", errors="ignore"),
+        }
+        return row
+
+    @property
+    def blob_store(self) -> Optional[BlobStore]:
+        """Where offloaded results are stored, if anywhere."""
+        return self._blob_store
+
+    def get_execution_result(self, execution_id: int) -> Optional[dict[str, Any]]:
+        """Full result of an execution, loaded from the blob store if it was offloaded.
+
+        Returns:
+            {"execution_id", "result", "size", "digest", "complete"} or None if
+            the execution doesn't exist. ``complete`` is False when only the
+            preview is available (``result`` is then the preview text).
+        """
+        with self._lock:
+            record = self._pending.get(execution_id)
+        if record is not None:
+            # Still queued with the whole result; size and digest as they will be stored
+            result, size, digest = record["result"], None, None
+            if result is not None:
+                payload = _encode_result(result)
+                size, digest = len(payload), content_digest(payload)
+        else:
+            with self.Session() as session:
+                row = session.query(
+                    ToolExecution.result, ToolExecution.result_size, ToolExecution.result_digest
+                ).filter(ToolExecution.id == execution_id).first()
+            if row is None:
+                return None
+            result, size, digest = row
+
+        complete = True
+        if isinstance(result, dict) and result.get(OFFLOADED_KEY):
+            payload = self._blob_store.get(result["digest"]) if self._blob_store else None
+            if payload is not None:
+                result = json.loads(payload)
+            else:
+                result = result.get("preview")
+                complete = False
+
+        return {
+            "execution_id": execution_id,
+            "result": result,
+            "size": size,
+            "digest": digest,
+            "complete": complete
+        }
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued executions are written (no-op without background writes)."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Write queued executions and stop the background writer."""
+        if self._writer is not None:
+            self._writer.close(timeout)
+
+    def get_writer_stats(self) -> Optional[dict[str, Any]]:
+        """Background writer counters, or None if writes are synchronous."""
+        if self._writer is None:
+            return None
+        return self._writer.get_stats()
+
     def add_user_feedback(
         self,
         execution_id: int,
         rating: int,
         feedback: Optional[str] = None
     ):
-        """Add user feedback to an execution."""
+        """Add user feedback to an execution.
+
+        The tool's rating sum and count are adjusted in the same transaction
+        (a re-rating replaces the previous rating), so this stays O(1)
+        however many executions are stored.
+        """
+        if execution_id in self._pending:
+            self.flush()
+
         with self.Session() as session:
-            execution = session.get(ToolExecution, execution_id)
+            execution = session.get(ToolExecution, execution_id, with_for_update=True)
             if execution:
+                previous_rating = execution.user_rating
                 execution.user_rating = rating
                 execution.user_feedback = feedback
-                session.commit()
-
-                # Update tool's average rating
-                self._update_rating_metrics(session, execution.tool_name)
+                self._apply_rating(session, execution.tool_name, previous_rating, rating)
+                with self._metrics_sync_lock:
+                    session.commit()
+                    self._apply_to_snapshot(
+                        execution.tool_name,
+                        rating_sum=rating - (previous_rating or 0),
+                        rating_count=0 if previous_rating is not None else 1
+                    )
 
     def get_execution(self, execution_id: int) -> Optional[dict]:
         """Get execution details by ID for retroactive RL updates."""
+        with self._lock:
+            record = self._pending.get(execution_id)
+        if record is not None:
+            # Still queued - answer from memory instead of waiting for the writer
+            return {
+                "id": execution_id,
+                "session_id": record["session_id"],
+                "tool_name": record["tool_name"],
+                "success": record["success"],
+                "execution_time_ms": record["execution_time_ms"],
+                "user_rating": None,
+                "context_hash": record["context_hash"],
+                "created_at": record["created_at"].isoformat()
+            }
+
         with self.Session() as session:
             execution = session.get(ToolExecution, execution_id)
             if execution:
@@ -134,13 +535,22 @@ class FeedbackService:
                 }
             return None
 
-    def get_tool_metrics(self, tool_name: Optional[str] = None) -> list[dict]:
-        """Get aggregated metrics for tools."""
+    def get_tool_metrics(
+        self,
+        tool_name: Optional[str] = None,
+        include_percentiles: bool = False
+    ) -> list[dict]:
+        """Get aggregated metrics for tools.
+
+        Args:
+            tool_name: Only this tool.
+            include_percentiles: Add p50/p95/p99 execution times (one more query).
+        """
         with self.Session() as session:
             query = session.query(ToolMetrics)
             if tool_name:
                 query = query.filter(ToolMetrics.tool_name == tool_name)
-            return [
+            metrics = [
                 {
                     "tool_name": m.tool_name,
                     "total_calls": m.total_calls,
@@ -151,12 +561,91 @@ class FeedbackService:
                 for m in query.all()
             ]
 
+        if include_percentiles:
+            latencies = self.get_latency_percentiles(tool_name)
+            for m in metrics:
+                tool_latency = latencies.get(m["tool_name"], {})
+                m["p50_execution_time_ms"] = tool_latency.get(0.5)
+                m["p95_execution_time_ms"] = tool_latency.get(0.95)
+                m["p99_execution_time_ms"] = tool_latency.get(0.99)
+        return metrics
+
+    def get_metrics_snapshot(self) -> dict[str, dict]:
+        """Tool name -> metrics (as returned by get_tool_metrics), served from memory.
+
+        The snapshot is loaded on first use and then kept current by this
+        process's own writes. Once it is older than ``metrics_ttl`` seconds
+        it is reloaded from the database in the background, to pick up other
+        processes' writes, while callers keep reading the current one.
+        Do not modify the returned dict.
+        """
+        if self._metrics_loaded_at is None:
+            self.refresh_metrics_snapshot()
+        elif time.monotonic() - self._metrics_loaded_at >= self.metrics_ttl:
+            with self._metrics_lock:
+                if self._metrics_refreshing:
+                    return self._metrics_snapshot
+                self._metrics_refreshing = True
+            threading.Thread(
+                target=self.refresh_metrics_snapshot, name="metrics-refresh", daemon=True
+            ).start()
+        return self._metrics_snapshot
+
+    def refresh_metrics_snapshot(self):
+        """Reload the metrics snapshot from the database.
+
+        This process's counter commits wait while the reload runs, so none
+        lands between the query and the swap (where it would be lost) or is
+        both read and applied again (counted twice).
+        """
+        table = ToolMetrics.__table__
+        with self._metrics_sync_lock:
+            counters = None
+            try:
+                with self.Session() as session:
+                    rows = session.execute(
+                        select(table.c.tool_name, *(table.c[name] for name in _SNAPSHOT_COUNTERS))
+                    ).all()
+                counters = {
+                    row.tool_name: {name: getattr(row, name) or 0 for name in _SNAPSHOT_COUNTERS}
+                    for row in rows
+                }
+            except Exception as e:
+                print(f"Warning: Failed to load tool metrics: {e}", file=sys.stderr)
+
+            with self._metrics_lock:
+                if counters is not None:
+                    self._metrics_counters = counters
+                    self._metrics_snapshot = {
+                        tool_name: _snapshot_entry(tool_name, c) for tool_name, c in counters.items()
+                    }
+                # Set with the swap, so commits right after it are applied to the new
+                # snapshot; also after a failure, so a broken database isn't queried
+                # on every call
+                self._metrics_loaded_at = time.monotonic()
+                self._metrics_refreshing = False
+
+    def _apply_to_snapshot(self, tool_name: str, **deltas):
+        """Add committed counter changes to the metrics snapshot, if loaded."""
+        with self._metrics_lock:
+            if self._metrics_loaded_at is None:
+                return
+            counters = self._metrics_counters.setdefault(
+                tool_name, {name: 0 for name in _SNAPSHOT_COUNTERS}
+            )
+            for name, delta in deltas.items():
+                counters[name] += delta
+            # Copy on write, so readers never see a half-updated snapshot
+            self._metrics_snapshot = {**self._metrics_snapshot, tool_name: _snapshot_entry(tool_name, counters)}
+
     def get_recent_executions(
         self,
         tool_name: Optional[str] = None,
         limit: int = 50
     ) -> list[dict]:
         """Get recent tool executions."""
+        self.flush()
+
         with self.Session() as session:
             query = session.query(ToolExecution).order_by(
                 ToolExecution.created_at.desc()
@@ -178,103 +667,232 @@ class FeedbackService:
                 for e in query.all()
             ]
 
-    def _update_metrics_separate_session(
-        self,
-        tool_name: str,
-        success: bool,
-        execution_time_ms: float
-    ):
-        """Update aggregated metrics for a tool using a separate session."""
+    def _update_metrics(self, records: list[dict[str, Any]]):
+        """Fold executions into the aggregated metrics and latency histograms.
+
+        Counters and sums are incremented by the database (one UPSERT per tool
+        and one for the histogram buckets), so concurrent writers never
+        overwrite each other's updates.
+        """
+        totals: dict[str, list] = {}
+        buckets: dict[tuple[str, int], int] = {}
+        for record in records:
+            tool_name = record["tool_name"]
+            time_ms = record["execution_time_ms"] or 0.0
+            calls, successes, total_ms = totals.get(tool_name, (0, 0, 0.0))
+            totals[tool_name] = [calls + 1, successes + (1 if record["success"] else 0), total_ms + time_ms]
+            key = (tool_name, latency_sketch.bucket_index(time_ms))
+            buckets[key] = buckets.get(key, 0) + 1
+
         try:
+            now = datetime.utcnow()
             with self.Session() as session:
-                # Use merge to get or create, and ensure we have a clean object
-                metrics = session.query(ToolMetrics).filter_by(tool_name=tool_name).first()
-                
-                if not metrics:
-                    # Create new metrics record with explicit defaults
-                    metrics = ToolMetrics(
-                        tool_name=tool_name,
-                        total_calls=0,
-                        success_count=0,
-                        failure_count=0,
-                        avg_execution_time_ms=0.0
-                    )
-                    session.add(metrics)
-                    session.flush()
-                
-                # Refresh to get latest values from database and handle any NULLs
-                session.refresh(metrics)
-                
-                # Safely read current values, handling None explicitly
-                current_total = int(metrics.total_calls) if metrics.total_calls is not None else 0
-                current_success = int(metrics.success_count) if metrics.success_count is not None else 0
-                current_failure = int(metrics.failure_count) if metrics.failure_count is not None else 0
-                current_avg = float(metrics.avg_execution_time_ms) if metrics.avg_execution_time_ms is not None else 0.0
-
-                # Calculate new values
-                new_total = current_total + 1
-                if success:
-                    new_success = current_success + 1
-                    new_failure = current_failure
-                else:
-                    new_success = current_success
-                    new_failure = current_failure + 1
-
-                # Calculate new average execution time
-                if new_total == 1:
-                    new_avg = execution_time_ms
-                else:
-                    old_total_time = current_avg * current_total
-                    new_avg = (old_total_time + execution_time_ms) / new_total
-
-                # Update all values at once using assignment (not +=)
-                # This ensures SQLAlchemy doesn't try to do increment operations
-                metrics.total_calls = new_total
-                metrics.success_count = new_success
-                metrics.failure_count = new_failure
-                metrics.avg_execution_time_ms = new_avg
-                metrics.last_updated = datetime.utcnow()
-                
-                session.commit()
+                for tool_name, (calls, successes, time_ms) in totals.items():
+                    self._upsert_metrics(session, tool_name, calls, successes, time_ms, now)
+                self._upsert_latency_buckets(session, buckets)
+                with self._metrics_sync_lock:
+                    session.commit()
+                    for tool_name, (calls, successes, time_ms) in totals.items():
+                        self._apply_to_snapshot(
+                            tool_name, total_calls=calls, success_count=successes, total_execution_time_ms=time_ms
+                        )
         except Exception as e:
             # Log error but don't raise - we don't want to break tool execution
-            import sys
             print(f"Warning: Failed to update metrics: {e}", file=sys.stderr)
-            # Silently fail - metrics are optional
 
-    def _update_rating_metrics(self, session, tool_name: str):
-        """Update average rating for a tool."""
-        avg_rating = session.query(func.avg(ToolExecution.user_rating)).filter(
-            ToolExecution.tool_name == tool_name,
-            ToolExecution.user_rating.isnot(None)
-        ).scalar()
+    def _upsert_metrics(
+        self,
+        session,
+        tool_name: str,
+        calls: int,
+        successes: int,
+        time_ms: float,
+        now: datetime
+    ):
+        table = ToolMetrics.__table__
+        c = table.c
+        values = {
+            "tool_name": tool_name,
+            "total_calls": calls,
+            "success_count": successes,
+            "failure_count": calls - successes,
+            "total_execution_time_ms": time_ms,
+            "avg_execution_time_ms": time_ms / calls,
+            "last_updated": now,
+        }
+
+        insert_fn = dialect_insert(self.engine.dialect.name)
+        if insert_fn is not None:
+            stmt = insert_fn(table).values(**values)
+            new = stmt.excluded
+            # Column references in SET are the stored row's values
+            total_calls = c.total_calls + new.total_calls
+            total_time = c.total_execution_time_ms + new.total_execution_time_ms
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[c.tool_name],
+                set_={
+                    "total_calls": total_calls,
+                    "success_count": c.success_count + new.success_count,
+                    "failure_count": c.failure_count + new.failure_count,
+                    "total_execution_time_ms": total_time,
+                    "avg_execution_time_ms": total_time / total_calls,
+                    "last_updated": new.last_updated,
+                }
+            )
+            session.execute(stmt)
+            return
+
+        # Other databases: atomic increment, insert if the row doesn't exist yet
+        result = session.execute(
+            update(table)
+            .where(c.tool_name == tool_name)
+            .values(
+                total_calls=c.total_calls + calls,
+                success_count=c.success_count + successes,
+                failure_count=c.failure_count + (calls - successes),
+                total_execution_time_ms=c.total_execution_time_ms + time_ms,
+                avg_execution_time_ms=(c.total_execution_time_ms + time_ms) / (c.total_calls + calls),
+                last_updated=now
+            )
+        )
+        if result.rowcount == 0:
+            session.execute(insert(table).values(**values))
+
+    def _upsert_latency_buckets(self, session, buckets: dict[tuple[str, int], int]):
+        rows = [
+            {"tool_name": tool_name, "bucket": bucket, "count": count}
+            for (tool_name, bucket), count in buckets.items()
+        ]
+        increment_upsert(session, ToolLatencyBucket.__table__, ("tool_name", "bucket"), rows)
+
+    def get_latency_percentiles(
+        self,
+        tool_name: Optional[str] = None,
+        quantiles: tuple[float, ...] = (0.5, 0.95, 0.99)
+    ) -> dict[str, dict[float, float]]:
+        """Execution time percentiles (ms) per tool from the latency histograms."""
+        with self.Session() as session:
+            query = session.query(
+                ToolLatencyBucket.tool_name, ToolLatencyBucket.bucket, ToolLatencyBucket.count
+            )
+            if tool_name:
+                query = query.filter(ToolLatencyBucket.tool_name == tool_name)
+            by_tool: dict[str, list[tuple[int, int]]] = {}
+            for name, bucket, count in query.all():
+                by_tool.setdefault(name, []).append((bucket, count))
+
+        return {
+            name: latency_sketch.percentiles(buckets, quantiles)
+            for name, buckets in by_tool.items()
+        }
+
+    def _apply_rating(
+        self,
+        session,
+        tool_name: str,
+        previous_rating: Optional[int],
+        rating: int
+    ):
+        """Adjust a tool's rating sum/count and average for a new or changed rating."""
+        table = ToolMetrics.__table__
+        c = table.c
+        sum_delta = rating - (previous_rating or 0)
+        count_delta = 0 if previous_rating is not None else 1
+
+        rating_sum = c.rating_sum + sum_delta
+        rating_count = c.rating_count + count_delta
+        result = session.execute(
+            update(table)
+            .where(c.tool_name == tool_name)
+            .values(
+                rating_sum=rating_sum,
+                rating_count=rating_count,
+                avg_user_rating=case(
+                    (rating_count > 0, cast(rating_sum, Float) / rating_count),
+                    else_=None
+                )
+            )
+        )
+        if result.rowcount == 0:
+            # Metrics row not written yet (e.g. its update failed) - start one
+            session.execute(insert(table).values(
+                tool_name=tool_name,
+                rating_sum=rating,
+                rating_count=1,
+                avg_user_rating=float(rating),
+                last_updated=datetime.utcnow()
+            ))
+
 
-        metrics = session.query(ToolMetrics).filter_by(tool_name=tool_name).first()
-        if metrics:
-            metrics.avg_user_rating = avg_rating
-            session.commit()
+def _encode_result(result: Any) -> bytes:
+    """Result JSON as stored and hashed."""
+    return json.dumps(result, ensure_ascii=False, default=str).encode("utf-8")
+
+
+def _snapshot_entry(tool_name: str, counters: dict[str, Any]) -> dict:
+    """Metrics dict of one tool, computed from its counters."""
+    calls = counters["total_calls"]
+    return {
+        "tool_name": tool_name,
+        "total_calls": calls,
+        "success_rate": counters["success_count"] / calls if calls > 0 else 0,
+        "avg_execution_time_ms": counters["total_execution_time_ms"] / calls if calls > 0 else 0,
+        "avg_user_rating": counters["rating_sum"] / counters["rating_count"] if counters["rating_count"] else None
+    }
 
 
 # Global state for tracking
 _feedback_service: Optional[FeedbackService] = None
-_execution_start_times: dict[str, float] = {}
 
 
-def init_feedback_service(db_url: str) -> FeedbackService:
+def init_feedback_service(
+    db_url: str,
+    background_writes: Optional[bool] = False,
+    batch_size: int = 100,
+    flush_interval: float = 0.5,
+    result_inline_max_bytes: int = 16384,
+    result_preview_chars: int = 1000,
+    blob_dir: Optional[Path] = None,
+    metrics_ttl: float = 30.0
+) -> FeedbackService:
     """Initialize the global feedback service."""
     global _feedback_service
-    _feedback_service = FeedbackService(db_url)
+    if _feedback_service is not None:
+        _feedback_service.close()
+    _feedback_service = FeedbackService(
+        db_url,
+        background_writes=background_writes,
+        batch_size=batch_size,
+        flush_interval=flush_interval,
+        result_inline_max_bytes=result_inline_max_bytes,
+        result_preview_chars=result_preview_chars,
+        blob_dir=blob_dir,
+        metrics_ttl=metrics_ttl
+    )
     return _feedback_service
 
 
+def close_feedback_service(timeout: Optional[float] = None):
+    """Drain queued writes of the global feedback service and release it."""
+    global _feedback_service
+    if _feedback_service is not None:
+        _feedback_service.close(timeout)
+        _feedback_service.engine.dispose()
+        _feedback_service = None
+
+
 def get_feedback_service() -> Optional[FeedbackService]:
     """Get the global feedback service instance."""
     return _feedback_service
 
 
-def before_tool_callback(session_id: str, tool_name: str, args: dict) -> None:
-    """Track tool execution start time (call before tool execution)."""
-    _execution_start_times[session_id] = time.time()
+def before_tool_callback(session_id: str, tool_name: str, args: dict) -> ExecutionContext:
+    """Start timing a tool execution (call before tool execution).
+
+    Returns:
+        The invocation's execution context, current until after_tool_callback.
+    """
+    return start_execution(session_id, tool_name)
 
 
 def after_tool_callback(
@@ -282,19 +900,40 @@ def after_tool_callback(
     tool_name: str,
     args: dict,
     result: Any,
-    context_hash: Optional[str] = None
+    context_hash: Optional[str] = None,
+    execution: Optional[ExecutionContext] = None
 ) -> Optional[int]:
     """Log tool execution result (call after tool execution).
-    
+
+    The execution time is the invocation's "tool" phase if it was marked,
+    otherwise the time since before_tool_callback. The logged fields are
+    also kept as the execution context's ``record``.
+
     Returns:
         Execution ID if logging was successful, None otherwise.
     """
-    start_time = _execution_start_times.pop(session_id, time.time())
-    execution_time_ms = (time.time() - start_time) * 1000
+    execution = execution or current_execution()
+    if execution is not None:
+        execution_time_ms = execution.phase_ms("tool")
+        if execution_time_ms is None:
+            execution_time_ms = execution.elapsed_ms()
+        end_execution(execution)
+    else:
+        execution_time_ms = 0.0
 
     success = isinstance(result, dict) and result.get("status") == "success"
     error_message = result.get("error") if isinstance(result, dict) else None
 
+    if execution is not None:
+        # Kept on the context so the RL update needn't read the execution back
+        execution.record = {
+            "tool_name": tool_name,
+            "success": success,
+            "user_rating": None,
+            "execution_time_ms": execution_time_ms,
+            "context_hash": context_hash
+        }
+
     if _feedback_service:
         try:
             execution_id = _feedback_service.log_execution(
@@ -311,7 +950,6 @@ def after_tool_callback(
             return execution_id
         except Exception as e:
             # Silently fail feedback logging to not break tool execution
-            import sys
             print(f"Warning: Failed to log execution to feedback service: {e}", file=sys.stderr)
             return None
     
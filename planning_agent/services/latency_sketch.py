@@ -0,0 +1,68 @@
+"""Mergeable log-bucket sketch for streaming latency percentiles.
+
+Values are counted in logarithmic buckets (as in DDSketch): bucket ``i``
+covers ``(gamma^(i-1), gamma^i]`` with ``gamma = (1 + a) / (1 - a)``, so any
+percentile read back is within relative accuracy ``a`` of the true value.
+Sketches merge by adding bucket counts, which lets the database maintain
+them with plain increments.
+"""
+
+import math
+from typing import Iterable
+
+RELATIVE_ACCURACY = 0.02
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = math.log(GAMMA)
+
+# Values at or below this (in ms) share one bucket that reads back as 0
+MIN_VALUE = 0.001
+ZERO_BUCKET = -(2 ** 15)
+
+
+def bucket_index(value: float) -> int:
+    """Bucket holding a value."""
+    if value is None or value <= MIN_VALUE:
+        return ZERO_BUCKET
+    return math.ceil(math.log(value) / _LOG_GAMMA)
+
+
+def bucket_value(index: int) -> float:
+    """Representative value of a bucket (within the relative accuracy of every value in it)."""
+    if index == ZERO_BUCKET:
+        return 0.0
+    return 2.0 * GAMMA ** index / (GAMMA + 1.0)
+
+
+def bucket_counts(values: Iterable[float]) -> dict[int, int]:
+    """Count values per bucket."""
+    counts: dict[int, int] = {}
+    for value in values:
+        index = bucket_index(value)
+        counts[index] = counts.get(index, 0) + 1
+    return counts
+
+
+def percentiles(
+    buckets: Iterable[tuple[int, int]],
+    quantiles: Iterable[float] = (0.5, 0.95, 0.99)
+) -> dict[float, float]:
+    """Estimate quantiles from (bucket index, count) pairs.
+
+    Returns:
+        Quantile -> value; empty if there are no counts.
+    """
+    ordered = sorted((index, count) for index, count in buckets if count > 0)
+    total = sum(count for _, count in ordered)
+    if total == 0:
+        return {}
+
+    result = {}
+    for q in quantiles:
+        rank = q * (total - 1)
+        seen = 0
+        for index, count in ordered:
+            seen += count
+            if seen > rank:
+                result[q] = bucket_value(index)
+                break
+    return result
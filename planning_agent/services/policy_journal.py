@@ -0,0 +1,106 @@
+"""Append-only journal of policy updates not yet persisted to the database."""
+
+import json
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Any
+
+
+class PolicyJournal:
+    """JSON-lines files of Q-value updates, replayed after a crash.
+
+    Each entry holds the absolute value and visit count of one
+    (tool, context) pair, so replaying an entry that was already written
+    is harmless. Entries reach the OS on append (surviving a process
+    crash); ``sync`` forces them to disk.
+
+    Entries are appended to ``path``. ``rotate`` seals it as segment
+    ``<path>.<n>`` and starts a new file; a sealed segment is deleted with
+    ``discard`` once all of its entries are in the database, so the journal
+    only holds updates still waiting to be written.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._file = open(self.path, "a", encoding="utf-8")
+        # Whether the current file has entries
+        self._dirty = self.path.stat().st_size > 0
+        sealed = self._sealed_segments()
+        self._segment = sealed[-1] + 1 if sealed else 0
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.path.with_name(f"{self.path.name}.{segment}")
+
+    def _sealed_segments(self) -> list[int]:
+        prefix = f"{self.path.name}."
+        segments = []
+        for segment_path in self.path.parent.glob(f"{self.path.name}.*"):
+            suffix = segment_path.name[len(prefix):]
+            if suffix.isdigit():
+                segments.append(int(suffix))
+        return sorted(segments)
+
+    def append(self, entry: dict[str, Any]) -> int:
+        """Append an entry; returns the segment it went to."""
+        with self._lock:
+            self._file.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            self._file.flush()
+            self._dirty = True
+            return self._segment
+
+    def sync(self):
+        with self._lock:
+            os.fsync(self._file.fileno())
+
+    def rotate(self):
+        """Seal the current file as a segment and start a new one (no-op if it is empty)."""
+        with self._lock:
+            if not self._dirty:
+                return
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self.path, self._segment_path(self._segment))
+            self._file = open(self.path, "a", encoding="utf-8")
+            self._dirty = False
+            self._segment += 1
+
+    def discard(self, segment: int):
+        """Delete a sealed segment (call once its entries are all in the database)."""
+        with self._lock:
+            if segment == self._segment:
+                return
+            try:
+                self._segment_path(segment).unlink()
+            except FileNotFoundError:
+                pass
+
+    def truncate(self):
+        """Drop every entry, sealed segments included (call once they are all in the database)."""
+        with self._lock:
+            for segment in self._sealed_segments():
+                self._segment_path(segment).unlink()
+            self._file.truncate(0)
+            self._file.seek(0)
+            self._dirty = False
+
+    def read(self) -> list[dict[str, Any]]:
+        """Entries in the order they were written; a torn last line is ignored."""
+        entries = []
+        with self._lock:
+            paths = [self._segment_path(segment) for segment in self._sealed_segments()] + [self.path]
+            for path in paths:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            entries.append(json.loads(line))
+                        except json.JSONDecodeError:
+                            print(f"Warning: Skipping unreadable policy journal entry in {path}", file=sys.stderr)
+        return entries
+
+    def close(self):
+        with self._lock:
+            self._file.close()
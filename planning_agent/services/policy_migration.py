@@ -0,0 +1,125 @@
+"""Fold rl_policy rows keyed by the old per-query context hash into bucketed contexts."""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import delete, select
+
+from planning_agent.services.rl_service import CONTEXT_ID_PREFIX, RLPolicy, RLService, context_hash
+from planning_agent.services.upsert import UPSERT_CHUNK_ROWS, replace_upsert
+
+
+def legacy_context_hash(previous_tool: str, session_length: int, keywords: Iterable[str] = ()) -> str:
+    """Context hash as computed before contexts were bucketed."""
+    context = {
+        "keywords": sorted(keywords),
+        "previous_tool": previous_tool,
+        "session_length": session_length
+    }
+    return hashlib.sha256(json.dumps(context, sort_keys=True).encode()).hexdigest()
+
+
+def fold_legacy_policy(
+    rl_service: RLService,
+    tool_names: Iterable[str] = (),
+    max_session_length: int = 1000,
+    dry_run: bool = False,
+    drop_unrecoverable: bool = False
+) -> dict[str, Any]:
+    """Replace old-format rl_policy rows with rows in the current context format.
+
+    Old context hashes cannot be reversed, so the contexts they stood for
+    are recovered by recomputing the old hash of every context without a
+    query (each previous tool, session lengths up to ``max_session_length``),
+    which covers calls made without a user query. Rows recovered for the same
+    tool and new context are merged with each other and with any current
+    row: values are averaged weighted by visits, and visits are summed.
+
+    Rows whose context cannot be recovered held per-query states that are
+    never looked up again. They are left in place unless
+    ``drop_unrecoverable`` is set, in which case they are deleted.
+
+    Returns:
+        Counts of old rows, rows folded, unrecoverable rows kept or
+        dropped, and rows written.
+    """
+    t = RLPolicy.__table__
+    stats = {"legacy_rows": 0, "folded": 0, "kept": 0, "dropped": 0, "policy_rows": 0}
+
+    with rl_service.Session() as session:
+        legacy = session.execute(
+            select(t.c.id, t.c.tool_name, t.c.context_hash, t.c.action_value, t.c.visit_count)
+            .where(~t.c.context_hash.startswith(CONTEXT_ID_PREFIX))
+        ).all()
+        stats["legacy_rows"] = len(legacy)
+        if not legacy:
+            return stats
+
+        wanted = {row.context_hash for row in legacy}
+        previous_tools = {""} | set(tool_names) | {row.tool_name for row in legacy}
+        recovered: dict[str, str] = {}
+        for previous_tool in previous_tools:
+            for session_length in range(max_session_length + 1):
+                old_hash = legacy_context_hash(previous_tool, session_length)
+                if old_hash in wanted:
+                    recovered[old_hash] = context_hash("", previous_tool, session_length)
+
+        # (tool, new context) -> [visit-weighted value sum, weight, visits]
+        folded: dict[tuple[str, str], list] = {}
+        removed_ids = []
+        for row in legacy:
+            new_context = recovered.get(row.context_hash)
+            if new_context is None:
+                if drop_unrecoverable:
+                    stats["dropped"] += 1
+                    removed_ids.append(row.id)
+                else:
+                    stats["kept"] += 1
+                continue
+            _accumulate(folded, (row.tool_name, new_context), row.action_value, row.visit_count)
+            stats["folded"] += 1
+            removed_ids.append(row.id)
+
+        if folded:
+            current = session.execute(
+                select(t.c.tool_name, t.c.context_hash, t.c.action_value, t.c.visit_count)
+                .where(t.c.context_hash.in_({context for _, context in folded}))
+            ).all()
+            for row in current:
+                key = (row.tool_name, row.context_hash)
+                if key in folded:
+                    _accumulate(folded, key, row.action_value, row.visit_count)
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "tool_name": tool_name,
+                "context_hash": context,
+                "action_value": value_sum / weight,
+                "visit_count": visits,
+                # Newer than any worker's copy, so running workers pick the merged rows up
+                "last_updated": now,
+            }
+            for (tool_name, context), (value_sum, weight, visits) in folded.items()
+        ]
+        stats["policy_rows"] = len(rows)
+        if dry_run:
+            return stats
+
+        for start in range(0, len(removed_ids), UPSERT_CHUNK_ROWS):
+            session.execute(delete(t).where(t.c.id.in_(removed_ids[start:start + UPSERT_CHUNK_ROWS])))
+        replace_upsert(session, t, ("tool_name", "context_hash"), rows)
+        session.commit()
+
+    return stats
+
+
+def _accumulate(folded: dict, key: tuple[str, str], value, visits):
+    visits = visits or 0
+    weight = max(visits, 1)
+    entry = folded.setdefault(key, [0.0, 0, 0])
+    entry[0] += (value or 0.0) * weight
+    entry[1] += weight
+    entry[2] += visits
@@ -0,0 +1,61 @@
+"""In-memory Q-value table indexed by context, then tool."""
+
+from typing import Iterable, Iterator, Optional
+
+
+class PolicyStore:
+    """Q-values held as ``context_hash -> {tool_name: value}``.
+
+    Everything the RL service asks of the policy is about one context
+    (its max Q-value, one tool's value, every tool's value for ranking),
+    so indexing by context first makes those lookups cost at most the
+    number of tools seen in that context, independent of policy size.
+    """
+
+    def __init__(self):
+        self._contexts: dict[str, dict[str, float]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def get(self, tool_name: str, context_hash: str, default: float = 0.0) -> float:
+        """Q-value of a tool in a context."""
+        return self._contexts.get(context_hash, {}).get(tool_name, default)
+
+    def set(self, tool_name: str, context_hash: str, value: float):
+        """Store a tool's Q-value in a context."""
+        tools = self._contexts.setdefault(context_hash, {})
+        if tool_name not in tools:
+            self._size += 1
+        tools[tool_name] = value
+
+    def context_values(self, context_hash: str) -> dict[str, float]:
+        """Tool name -> Q-value for one context (do not modify)."""
+        return self._contexts.get(context_hash, {})
+
+    def max_value(self, context_hash: str, tool_names: Optional[Iterable[str]] = None) -> float:
+        """Largest Q-value in a context, optionally among some tools only (0.0 if none is positive)."""
+        tools = self._contexts.get(context_hash)
+        if not tools:
+            return 0.0
+        if tool_names is None:
+            values = tools.values()
+        else:
+            values = [tools[name] for name in tool_names if name in tools]
+        return max(0.0, *values) if values else 0.0
+
+    def items(self) -> Iterator[tuple[tuple[str, str], float]]:
+        """((tool_name, context_hash), value) for every entry."""
+        for context_hash, tools in self._contexts.items():
+            for tool_name, value in tools.items():
+                yield (tool_name, context_hash), value
+
+    def values(self) -> Iterator[float]:
+        """Every Q-value."""
+        for tools in self._contexts.values():
+            yield from tools.values()
+
+    def clear(self):
+        self._contexts.clear()
+        self._size = 0
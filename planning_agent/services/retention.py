@@ -0,0 +1,225 @@
+"""Retention for tool_executions and rl_episodes - compact old rows into daily rollups."""
+
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Optional
+
+from sqlalchemy import delete, select
+
+from planning_agent.services.feedback_service import (
+    FeedbackService,
+    ToolExecution,
+    ToolExecutionDaily,
+)
+from planning_agent.services.rl_service import RLEpisode, RLEpisodeDaily, RLService
+from planning_agent.services.upsert import increment_upsert
+
+# Consecutive chunks lost to a concurrent compactor before giving up the pass
+MAX_RACE_RETRIES = 3
+
+
+class RetentionManager:
+    """Move rows older than the retention window into daily rollup tables.
+
+    Old rows are handled in id order, one chunk per transaction: the chunk
+    is deleted, and only if every row was actually deleted by us are its
+    daily aggregates added to the rollup table. If another process compacts
+    the same rows concurrently the transaction is rolled back, so rollups
+    are never counted twice. Rollup tables are used on every database
+    (rather than native partitions) so SQLite and PostgreSQL behave alike.
+
+    Offloaded results of compacted executions are deleted from the blob
+    store once no remaining execution references them.
+
+    ToolMetrics totals are maintained incrementally and are unaffected.
+    A retention of 0 days keeps rows forever.
+    """
+
+    def __init__(
+        self,
+        feedback_service: FeedbackService,
+        rl_service: Optional[RLService] = None,
+        execution_retention_days: int = 90,
+        episode_retention_days: int = 365,
+        chunk_size: int = 5000
+    ):
+        self.feedback_service = feedback_service
+        self.rl_service = rl_service
+        self.execution_retention_days = execution_retention_days
+        self.episode_retention_days = episode_retention_days
+        self.chunk_size = max(1, chunk_size)
+        # Result digests of the execution chunk being compacted
+        self._released_digests: set[str] = set()
+
+    def compact(self, now: Optional[datetime] = None) -> dict[str, Any]:
+        """Compact everything past the retention windows.
+
+        Returns:
+            Number of rows compacted per table, and of result blobs deleted.
+        """
+        now = now or datetime.utcnow()
+        stats = {"tool_executions": 0, "rl_episodes": 0, "result_blobs": 0}
+
+        if self.execution_retention_days > 0:
+            cutoff = now - timedelta(days=self.execution_retention_days)
+            self.feedback_service.flush()
+
+            def release_blobs():
+                stats["result_blobs"] += self._delete_unreferenced_blobs()
+
+            stats["tool_executions"] = self._compact(
+                self.feedback_service.Session, cutoff, self._compact_executions, on_commit=release_blobs
+            )
+
+        if self.rl_service is not None and self.episode_retention_days > 0:
+            cutoff = now - timedelta(days=self.episode_retention_days)
+            stats["rl_episodes"] = self._compact(
+                self.rl_service.Session, cutoff, self._compact_episodes
+            )
+
+        return stats
+
+    def _compact(self, session_factory, cutoff: datetime, compact_chunk, on_commit=None) -> int:
+        total = 0
+        races = 0
+        while True:
+            with session_factory() as session:
+                count = compact_chunk(session, cutoff)
+                if count is None:
+                    # Another compactor took some of these rows - retry with fresh ones,
+                    # but leave the rest to it if that keeps happening
+                    session.rollback()
+                    races += 1
+                    if races >= MAX_RACE_RETRIES:
+                        return total
+                    continue
+                session.commit()
+            if on_commit is not None:
+                on_commit()
+            races = 0
+            total += count
+            if count < self.chunk_size:
+                return total
+
+    def _compact_executions(self, session, cutoff: datetime) -> Optional[int]:
+        t = ToolExecution.__table__
+        rows = session.execute(
+            select(t.c.id, t.c.tool_name, t.c.created_at, t.c.success, t.c.execution_time_ms,
+                   t.c.user_rating, t.c.result_digest)
+            .where(t.c.created_at < cutoff)
+            .order_by(t.c.id)
+            .limit(self.chunk_size)
+        ).all()
+        self._released_digests = {r.result_digest for r in rows if r.result_digest}
+        if not rows:
+            return 0
+
+        deleted = session.execute(delete(t).where(t.c.id.in_([r.id for r in rows]))).rowcount
+        if deleted != len(rows):
+            return None
+
+        daily: dict[tuple, dict[str, Any]] = {}
+        for r in rows:
+            key = (r.tool_name or "", r.created_at.date())
+            day = daily.get(key)
+            if day is None:
+                day = daily[key] = {
+                    "tool_name": key[0], "day": key[1], "total_calls": 0, "success_count": 0,
+                    "failure_count": 0, "total_execution_time_ms": 0.0, "rating_sum": 0, "rating_count": 0,
+                }
+            day["total_calls"] += 1
+            day["success_count" if r.success else "failure_count"] += 1
+            day["total_execution_time_ms"] += r.execution_time_ms or 0.0
+            if r.user_rating is not None:
+                day["rating_sum"] += r.user_rating
+                day["rating_count"] += 1
+
+        increment_upsert(session, ToolExecutionDaily.__table__, ("tool_name", "day"), list(daily.values()))
+        return len(rows)
+
+    def _delete_unreferenced_blobs(self) -> int:
+        """Delete the committed chunk's result blobs that no execution references any more.
+
+        Blobs are content-addressed, so one may still back a newer execution
+        with the same result. Returns the number of blobs deleted.
+        """
+        digests, self._released_digests = self._released_digests, set()
+        blob_store = self.feedback_service.blob_store
+        if blob_store is None or not digests:
+            return 0
+
+        t = ToolExecution.__table__
+        with self.feedback_service.Session() as session:
+            referenced = set(session.execute(
+                select(t.c.result_digest).where(t.c.result_digest.in_(digests)).distinct()
+            ).scalars())
+        return sum(blob_store.delete(digest) for digest in digests - referenced)
+
+    def _compact_episodes(self, session, cutoff: datetime) -> Optional[int]:
+        t = RLEpisode.__table__
+        rows = session.execute(
+            select(t.c.id, t.c.created_at, t.c.outcome, t.c.episode_reward)
+            .where(t.c.created_at < cutoff)
+            .order_by(t.c.id)
+            .limit(self.chunk_size)
+        ).all()
+        if not rows:
+            return 0
+
+        deleted = session.execute(delete(t).where(t.c.id.in_([r.id for r in rows]))).rowcount
+        if deleted != len(rows):
+            return None
+
+        daily: dict[tuple, dict[str, Any]] = {}
+        for r in rows:
+            key = (r.created_at.date(), r.outcome or "")
+            reward = r.episode_reward or 0.0
+            day = daily.get(key)
+            if day is None:
+                day = daily[key] = {
+                    "day": key[0], "outcome": key[1], "episode_count": 0,
+                    "total_reward": 0.0, "max_reward": reward,
+                }
+            day["episode_count"] += 1
+            day["total_reward"] += reward
+            day["max_reward"] = max(day["max_reward"], reward)
+
+        increment_upsert(
+            session, RLEpisodeDaily.__table__, ("day", "outcome"), list(daily.values()),
+            max_columns=("max_reward",)
+        )
+        return len(rows)
+
+
+def get_daily_tool_metrics(
+    feedback_service: FeedbackService,
+    tool_name: Optional[str] = None,
+    since: Optional[datetime] = None
+) -> list[dict[str, Any]]:
+    """Daily per-tool metrics from the rollup table (compacted days only)."""
+    with feedback_service.Session() as session:
+        query = session.query(ToolExecutionDaily)
+        if tool_name:
+            query = query.filter(ToolExecutionDaily.tool_name == tool_name)
+        if since:
+            query = query.filter(ToolExecutionDaily.day >= since.date())
+        return [
+            {
+                "tool_name": d.tool_name,
+                "day": d.day.isoformat(),
+                "total_calls": d.total_calls,
+                "success_rate": d.success_count / d.total_calls if d.total_calls else 0,
+                "avg_execution_time_ms": d.total_execution_time_ms / d.total_calls if d.total_calls else 0,
+                "avg_user_rating": d.rating_sum / d.rating_count if d.rating_count else None,
+            }
+            for d in query.order_by(ToolExecutionDaily.day, ToolExecutionDaily.tool_name).all()
+        ]
+
+
+def run_compaction(manager: RetentionManager) -> dict[str, Any]:
+    """Run one compaction pass, reporting (not raising) errors."""
+    try:
+        return manager.compact()
+    except Exception as e:
+        print(f"Warning: Retention compaction failed: {e}", file=sys.stderr)
+        return {}
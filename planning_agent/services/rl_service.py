@@ -1,18 +1,34 @@
 """Reinforcement Learning Service for tool selection and optimization using PostgreSQL."""
 
 import hashlib
-import json
-from datetime import datetime
-from typing import Optional
+import re
+import sys
+import threading
+from bisect import bisect_right
+from collections import Counter
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
 
 import numpy as np
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, create_engine, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Date, DateTime, JSON, Index, create_engine, select, UniqueConstraint
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from planning_agent.services.batch_writer import BatchWriter
 from planning_agent.services.feedback_service import FeedbackService
+from planning_agent.services.policy_journal import PolicyJournal
+from planning_agent.services.policy_store import PolicyStore
+from planning_agent.services.upsert import replace_upsert
 
 Base = declarative_base()
 
+# Rows fetched per round trip when syncing the in-memory policy
+POLICY_SYNC_CHUNK_ROWS = 10000
+# Rows updated this long before the watermark are re-read, since write-behind
+# commits (and other workers' clocks) can lag the last_updated they carry
+POLICY_SYNC_OVERLAP = timedelta(seconds=30)
+
 
 class RLPolicy(Base):
     """RL Policy table for storing Q-values and action values."""
@@ -28,6 +44,8 @@ class RLPolicy(Base):
 
     __table_args__ = (
         UniqueConstraint('tool_name', 'context_hash', name='uq_tool_context'),
+        # Incremental policy sync (RLService.sync_policy)
+        Index("ix_rl_policy_last_updated", "last_updated"),
     )
 
 
@@ -43,6 +61,74 @@ class RLEpisode(Base):
     outcome = Column(String(50))  # 'success', 'partial', 'failure'
     created_at = Column(DateTime, default=datetime.utcnow, index=True)
 
+    __table_args__ = (
+        # Best episodes by outcome (get_successful_sequences)
+        Index("ix_rl_episodes_outcome_reward", "outcome", "episode_reward"),
+    )
+
+
+class RLEpisodeDaily(Base):
+    """Daily rollup of episodes removed by retention (see services.retention)."""
+
+    __tablename__ = "rl_episode_daily"
+
+    day = Column(Date, primary_key=True)
+    outcome = Column(String(50), primary_key=True)
+    episode_count = Column(Integer, default=0, nullable=False, server_default="0")
+    total_reward = Column(Float, default=0, nullable=False, server_default="0")
+    max_reward = Column(Float, nullable=True)
+
+
+# Common Planning-related keywords
+PLANNING_KEYWORDS = (
+    "dimension", "member", "account", "entity", "period", "scenario",
+    "version", "plan", "data", "retrieve", "export", "import",
+    "rule", "job", "status", "hierarchy", "variable", "document",
+    "snapshot", "costcenter", "region"
+)
+# Every keyword occurrence in one pass; the lookahead also finds overlapping ones
+_KEYWORD_PATTERN = re.compile("(?=(" + "|".join(map(re.escape, PLANNING_KEYWORDS)) + "))")
+_KEYWORD_BITS = {keyword: 1 << i for i, keyword in enumerate(PLANNING_KEYWORDS)}
+
+# Session lengths are bucketed as 0, 1, 2, 3-4, 5-8, 9+
+SESSION_LENGTH_BOUNDS = (0, 1, 2, 3, 5, 9)
+# Contexts are hashed into this many states, bounding rl_policy at (tools x buckets)
+CONTEXT_BUCKETS = 1 << 16
+# Prefix of context IDs in the current format (older rows hold a bare SHA-256)
+CONTEXT_ID_PREFIX = "v2:"
+
+# Distinct (query, previous tool, session length) contexts memoized
+CONTEXT_CACHE_SIZE = 4096
+
+
+def keyword_mask(query: str) -> int:
+    """Bitmask of the Planning keywords found in a query (bit i = PLANNING_KEYWORDS[i])."""
+    mask = 0
+    if query:
+        for match in _KEYWORD_PATTERN.finditer(query.lower()):
+            mask |= _KEYWORD_BITS[match.group(1)]
+    return mask
+
+
+def session_length_bucket(session_length: int) -> int:
+    """Index of the session length bucket (see SESSION_LENGTH_BOUNDS)."""
+    return max(0, bisect_right(SESSION_LENGTH_BOUNDS, session_length) - 1)
+
+
+@lru_cache(maxsize=CONTEXT_CACHE_SIZE)
+def context_hash(user_query: str, previous_tool: str, session_length: int) -> str:
+    """ID of the RL state for a context, as stored in rl_policy and tool_executions.
+
+    The state is the query's keyword bitmask, the previous tool and the
+    bucketed session length, hashed into CONTEXT_BUCKETS buckets, so the
+    policy stays bounded however varied the queries are. Memoized, and the
+    returned strings are interned, making policy lookups by them cheap.
+    """
+    state = f"{keyword_mask(user_query)}|{previous_tool}|{session_length_bucket(session_length)}"
+    digest = hashlib.sha256(state.encode()).digest()
+    bucket = int.from_bytes(digest[:8], "big") % CONTEXT_BUCKETS
+    return sys.intern(f"{CONTEXT_ID_PREFIX}{bucket}")
+
 
 class RewardCalculator:
     """Calculate rewards from tool execution results."""
@@ -103,6 +189,7 @@ class ToolSelector:
         self.exploration_rate = exploration_rate
         self.min_samples = min_samples
         self._tool_metadata_cache: Optional[dict] = None
+        self._features_cache: Optional[tuple] = None
 
     def create_context_hash(
         self,
@@ -110,7 +197,7 @@ class ToolSelector:
         previous_tool: Optional[str] = None,
         session_length: int = 0
     ) -> str:
-        """Create a hash representing the current state/context.
+        """Create an ID representing the current state/context.
         
         Args:
             user_query: User's query or intent
@@ -118,125 +205,158 @@ class ToolSelector:
             session_length: Number of tools executed in this session
             
         Returns:
-            str: SHA256 hash of the context
+            str: Context ID, one of CONTEXT_BUCKETS (memoized, see context_hash)
         """
-        # Extract keywords from query (simple approach)
-        keywords = self._extract_keywords(user_query)
-        
-        context = {
-            "keywords": sorted(keywords),
-            "previous_tool": previous_tool or "",
-            "session_length": session_length
-        }
-        
-        context_str = json.dumps(context, sort_keys=True)
-        return hashlib.sha256(context_str.encode()).hexdigest()
-
-    def _extract_keywords(self, query: str) -> list[str]:
-        """Extract relevant keywords from user query."""
-        if not query:
-            return []
-        
-        # Common Planning-related keywords
-        planning_keywords = [
-            "dimension", "member", "account", "entity", "period", "scenario",
-            "version", "plan", "data", "retrieve", "export", "import",
-            "rule", "job", "status", "hierarchy", "variable", "document",
-            "snapshot", "costcenter", "region"
-        ]
-        
-        query_lower = query.lower()
-        found_keywords = [kw for kw in planning_keywords if kw in query_lower]
-        
-        # Also include first few words as keywords
-        words = query_lower.split()[:5]
-        found_keywords.extend(words)
-        
-        return list(set(found_keywords))  # Remove duplicates
+        return context_hash(user_query or "", previous_tool or "", session_length)
 
     def get_tool_recommendations(
         self,
         context_hash: str,
         available_tools: list[str],
-        rl_policy: Optional[dict] = None
+        rl_policy: Optional[dict[str, float]] = None,
+        top_k: Optional[int] = None
     ) -> list[dict]:
-        """Get ranked list of recommended tools with confidence scores."""
-        recommendations = []
-        
-        # Get tool metrics from feedback service
-        all_metrics = self.feedback_service.get_tool_metrics()
-        metrics_dict = {m["tool_name"]: m for m in all_metrics}
-        
-        for tool_name in available_tools:
-            confidence = 0.5  # Default confidence
-            reason = "Baseline recommendation"
-            
-            # Get metrics for this tool
-            tool_metrics = metrics_dict.get(tool_name, {})
-            
-            # Calculate confidence based on multiple factors
-            factors = []
-            
-            # Factor 1: Success rate
-            success_rate = tool_metrics.get("success_rate", 0.5)
-            if success_rate > 0.8:
-                confidence += 0.2
-                factors.append("high success rate")
-            elif success_rate < 0.5:
-                confidence -= 0.2
-                factors.append("low success rate")
-            
-            # Factor 2: User ratings
-            avg_rating = tool_metrics.get("avg_user_rating")
-            if avg_rating:
-                if avg_rating >= 4.0:
-                    confidence += 0.15
-                    factors.append("high user rating")
-                elif avg_rating < 3.0:
-                    confidence -= 0.15
-                    factors.append("low user rating")
-            
-            # Factor 3: Execution time (faster is better)
-            avg_time = tool_metrics.get("avg_execution_time_ms", 0)
-            if avg_time > 0 and avg_time < 1000:  # Less than 1 second
-                confidence += 0.1
-                factors.append("fast execution")
-            
-            # Factor 4: RL policy value (if available)
+        """Get ranked list of recommended tools with confidence scores.
+
+        Args:
+            context_hash: The context/state hash
+            available_tools: Tools to rank
+            rl_policy: Tool name -> Q-value in this context
+            top_k: Only the best k tools
+        """
+        return self.get_tool_recommendations_batch([rl_policy], available_tools, top_k)[0]
+
+    def get_tool_recommendations_batch(
+        self,
+        rl_policies: list[Optional[dict[str, float]]],
+        available_tools: list[str],
+        top_k: Optional[int] = None
+    ) -> list[list[dict]]:
+        """Rank tools for many contexts at once.
+
+        Confidence starts at 0.5 and is adjusted per tool for success rate
+        (+0.2 above 80%, -0.2 below 50%), average rating (+0.15 from 4,
+        -0.15 below 3), speed (+0.1 under 1s), RL policy value (up to +0.2)
+        and sample size (+0.05), then clamped to [0, 1]. Everything except
+        the policy value is the same for every context, so it is computed
+        once and the contexts are scored as one array.
+
+        Args:
+            rl_policies: Per context, tool name -> Q-value in that context
+            available_tools: Tools to rank
+            top_k: Only the best k tools per context
+
+        Returns:
+            Recommendations per context, best first (ties keep tool order).
+        """
+        tools = list(available_tools)
+        if not tools:
+            return [[] for _ in rl_policies]
+        features = self._tool_features(tools)
+
+        q_values = np.zeros((len(rl_policies), len(tools)))
+        for row, rl_policy in enumerate(rl_policies):
             if rl_policy:
-                policy_key = f"{tool_name}:{context_hash}"
-                action_value = rl_policy.get(policy_key, 0.0)
-                if action_value > 0:
-                    confidence += min(0.2, action_value / 10.0)  # Normalize
-                    factors.append("RL policy favor")
-            
-            # Factor 5: Sample size (more samples = more reliable)
-            total_calls = tool_metrics.get("total_calls", 0)
-            if total_calls >= self.min_samples:
-                confidence += 0.05
-                factors.append("sufficient samples")
-            
-            # Clamp confidence to [0, 1]
-            confidence = max(0.0, min(1.0, confidence))
-            
-            if factors:
-                reason = ", ".join(factors)
-            
-            recommendations.append({
-                "tool_name": tool_name,
-                "confidence": round(confidence, 3),
-                "reason": reason,
-                "metrics": {
-                    "success_rate": success_rate,
-                    "avg_rating": avg_rating,
-                    "total_calls": total_calls
-                }
-            })
-        
-        # Sort by confidence (descending)
-        recommendations.sort(key=lambda x: x["confidence"], reverse=True)
-        
-        return recommendations
+                q_values[row] = [rl_policy.get(tool_name, 0.0) for tool_name in tools]
+        rl_favor = q_values > 0
+        rl_bonus = np.where(rl_favor, np.minimum(0.2, q_values / 10.0), 0.0)
+
+        confidence = features["base_confidence"] + rl_bonus + features["sample_bonus"]
+        confidence = np.round(np.clip(confidence, 0.0, 1.0), 3)
+
+        k = len(tools) if top_k is None else max(0, min(top_k, len(tools)))
+        positions = np.arange(len(tools))
+        results = []
+        for row in range(len(rl_policies)):
+            scores = confidence[row]
+            candidates = positions
+            if 0 < k < len(tools):
+                # Partial sort: the k best, plus any tied with the k-th so ties resolve by tool order
+                threshold = np.partition(scores, len(tools) - k)[len(tools) - k]
+                candidates = positions[scores >= threshold]
+            order = candidates[np.lexsort((candidates, -scores[candidates]))][:k]
+            results.append([
+                self._recommendation(tools[i], float(scores[i]), features, i, bool(rl_favor[row, i]))
+                for i in order
+            ])
+        return results
+
+    def _tool_features(self, tools: list[str]) -> dict[str, Any]:
+        """Per-tool metric arrays and context-independent confidence parts.
+
+        Cached until the metrics snapshot (replaced on every update) or the
+        tool list changes.
+        """
+        metrics_dict = self.feedback_service.get_metrics_snapshot()
+        cached = self._features_cache
+        if cached is not None and cached[0] is metrics_dict and cached[1] == tools:
+            return cached[2]
+
+        tool_metrics = [metrics_dict.get(tool_name, {}) for tool_name in tools]
+        success_rate = np.array([m.get("success_rate", 0.5) for m in tool_metrics], dtype=float)
+        # No rating (or a 0 average) counts as unrated
+        avg_rating = np.array([m.get("avg_user_rating") or np.nan for m in tool_metrics], dtype=float)
+        avg_time = np.array([m.get("avg_execution_time_ms", 0) or 0 for m in tool_metrics], dtype=float)
+        total_calls = np.array([m.get("total_calls", 0) for m in tool_metrics], dtype=np.int64)
+
+        high_success = success_rate > 0.8
+        low_success = success_rate < 0.5
+        high_rating = avg_rating >= 4.0
+        low_rating = avg_rating < 3.0
+        fast = (avg_time > 0) & (avg_time < 1000)  # Less than 1 second
+        sufficient = total_calls >= self.min_samples
+
+        base_confidence = (
+            0.5
+            + np.where(high_success, 0.2, np.where(low_success, -0.2, 0.0))
+            + np.where(high_rating, 0.15, np.where(low_rating, -0.15, 0.0))
+            + np.where(fast, 0.1, 0.0)
+        )
+        features = {
+            "base_confidence": base_confidence,
+            "sample_bonus": np.where(sufficient, 0.05, 0.0),
+            "tool_metrics": tool_metrics,
+            "success_rate": success_rate,
+            "flags": {
+                "high success rate": high_success,
+                "low success rate": low_success,
+                "high user rating": high_rating,
+                "low user rating": low_rating,
+                "fast execution": fast,
+                "sufficient samples": sufficient,
+            },
+        }
+        self._features_cache = (metrics_dict, list(tools), features)
+        return features
+
+    @staticmethod
+    def _recommendation(
+        tool_name: str,
+        confidence: float,
+        features: dict[str, Any],
+        i: int,
+        rl_favor: bool
+    ) -> dict:
+        flags = features["flags"]
+        factors = [name for name in (
+            "high success rate", "low success rate", "high user rating", "low user rating", "fast execution"
+        ) if flags[name][i]]
+        if rl_favor:
+            factors.append("RL policy favor")
+        if flags["sufficient samples"][i]:
+            factors.append("sufficient samples")
+
+        tool_metrics = features["tool_metrics"][i]
+        return {
+            "tool_name": tool_name,
+            "confidence": confidence,
+            "reason": ", ".join(factors) if factors else "Baseline recommendation",
+            "metrics": {
+                "success_rate": tool_metrics.get("success_rate", 0.5),
+                "avg_rating": tool_metrics.get("avg_user_rating"),
+                "total_calls": tool_metrics.get("total_calls", 0)
+            }
+        }
 
 
 class RLService:
@@ -249,8 +369,24 @@ class RLService:
         exploration_rate: float = 0.1,
         learning_rate: float = 0.1,
         discount_factor: float = 0.9,
-        min_samples: int = 5
+        min_samples: int = 5,
+        background_writes: bool = False,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        journal_path: Optional[Path] = None,
+        policy_sync_interval: float = 5.0
     ):
+        """Create the service.
+
+        With ``background_writes``, Q-value updates are applied in memory and
+        written to rl_policy in batches by a background thread; if a
+        ``journal_path`` is given they are also journaled first, and any
+        journaled updates left by a crash are written on start-up.
+
+        Call sync_policy to load the policy, then start_policy_sync to pick
+        up rows written by other processes every ``policy_sync_interval``
+        seconds on a background thread (0 = never re-sync).
+        """
         self.feedback_service = feedback_service
         self.exploration_rate = exploration_rate
         self.learning_rate = learning_rate
@@ -260,7 +396,12 @@ class RLService:
         # Initialize PostgreSQL connection
         self.engine = create_engine(db_url)
         Base.metadata.create_all(self.engine)
+        # Indexes added after the first release
+        for table in (RLPolicy.__table__, RLEpisode.__table__):
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
         self.Session = sessionmaker(bind=self.engine)
+        self._warn_legacy_contexts()
         
         # Initialize components
         self.reward_calculator = RewardCalculator()
@@ -271,14 +412,59 @@ class RLService:
         )
         
         # Cache for policy values (in-memory for performance)
-        self._policy_cache: dict[str, float] = {}
-        self._cache_updated = False
+        self._policy_cache = PolicyStore()
+        self._visit_counts: dict[tuple[str, str], int] = {}
+        self._updated_at: dict[tuple[str, str], datetime] = {}
+        self.policy_sync_interval = policy_sync_interval
+        self._sync_thread: Optional[threading.Thread] = None
+        self._sync_stop = threading.Event()
+        self._policy_watermark: Optional[datetime] = None
+        # One sync at a time; also guards _policy_watermark
+        self._sync_lock = threading.Lock()
+        self._lock = threading.RLock()
+
+        # Write-behind persistence of policy updates
+        self._writer: Optional[BatchWriter] = None
+        self._journal: Optional[PolicyJournal] = None
+        # Journal segment -> journaled updates from it not yet written
+        self._segment_pending: Counter[int] = Counter()
+        # Updates whose write failed, retried with the next batch, and the
+        # journaled updates (per segment) they stand for
+        self._failed_policies: dict[tuple[str, str], dict[str, Any]] = {}
+        self._failed_segments: Counter[int] = Counter()
+        if background_writes:
+            if journal_path:
+                self._journal = PolicyJournal(journal_path)
+                self._replay_journal()
+            self._writer = BatchWriter(
+                self._write_policies,
+                batch_size=batch_size,
+                flush_interval=flush_interval,
+                name="rl-policy-writer"
+            )
+
+    def _warn_legacy_contexts(self):
+        """Point at the migration if rl_policy still holds pre-bucketing rows."""
+        try:
+            with self.Session() as session:
+                legacy = session.execute(
+                    select(RLPolicy.id).where(~RLPolicy.context_hash.startswith(CONTEXT_ID_PREFIX)).limit(1)
+                ).first()
+            if legacy:
+                print(
+                    "Warning: rl_policy has rows in the old context format; "
+                    "run scripts/migrate_rl_policy.py to fold them into the current one "
+                    "(--drop-unrecoverable deletes those it can't fold)",
+                    file=sys.stderr
+                )
+        except Exception as e:
+            print(f"Warning: Could not check rl_policy format: {e}", file=sys.stderr)
 
     def calculate_reward(self, execution_doc: dict) -> float:
         """Calculate reward for a tool execution."""
         # Get average execution time for this tool
-        metrics = self.feedback_service.get_tool_metrics(execution_doc.get("tool_name"))
-        avg_time = metrics[0].get("avg_execution_time_ms") if metrics else None
+        metrics = self.feedback_service.get_metrics_snapshot().get(execution_doc.get("tool_name"))
+        avg_time = metrics.get("avg_execution_time_ms") if metrics else None
         
         return self.reward_calculator.calculate_reward(execution_doc, avg_time)
 
@@ -287,26 +473,46 @@ class RLService:
         user_query: str = "",
         previous_tool: Optional[str] = None,
         session_length: int = 0,
-        available_tools: Optional[list[str]] = None
+        available_tools: Optional[list[str]] = None,
+        top_k: Optional[int] = None
     ) -> list[dict]:
         """Get tool recommendations for current context."""
-        # Create context hash
-        context_hash = self.tool_selector.create_context_hash(
-            user_query, previous_tool, session_length
-        )
-        
+        return self.get_tool_recommendations_batch(
+            [{"query": user_query, "previous_tool": previous_tool, "session_length": session_length}],
+            available_tools,
+            top_k
+        )[0]
+
+    def get_tool_recommendations_batch(
+        self,
+        contexts: list[dict],
+        available_tools: Optional[list[str]] = None,
+        top_k: Optional[int] = None
+    ) -> list[list[dict]]:
+        """Get tool recommendations for many contexts in one pass.
+
+        Args:
+            contexts: Dicts with optional "query", "previous_tool" and "session_length"
+            available_tools: Tools to rank (default: every tool with metrics)
+            top_k: Only the best k tools per context
+        """
         # Get available tools
         if available_tools is None:
             # Get all tools from feedback service metrics
-            all_metrics = self.feedback_service.get_tool_metrics()
-            available_tools = [m["tool_name"] for m in all_metrics]
-        
-        # Get RL policy
-        rl_policy = self._get_policy_dict()
-        
-        return self.tool_selector.get_tool_recommendations(
-            context_hash, available_tools, rl_policy
-        )
+            available_tools = list(self.feedback_service.get_metrics_snapshot())
+
+        # Get RL policy for each context
+        policy = self._get_policy_dict()
+        rl_policies = [
+            policy.context_values(self.tool_selector.create_context_hash(
+                context.get("query") or "",
+                context.get("previous_tool"),
+                context.get("session_length") or 0
+            ))
+            for context in contexts
+        ]
+
+        return self.tool_selector.get_tool_recommendations_batch(rl_policies, available_tools, top_k)
 
     def get_max_q_value(self, context_hash: str, available_tools: Optional[list[str]] = None) -> float:
         """Get the maximum Q-value for a given context across all tools.
@@ -318,16 +524,7 @@ class RLService:
         Returns:
             float: Maximum Q-value for this context (0.0 if no data)
         """
-        policy_dict = self._get_policy_dict()
-
-        max_q = 0.0
-        for key, value in policy_dict.items():
-            tool_name, ctx_hash = key.rsplit(":", 1)
-            if ctx_hash == context_hash:
-                if available_tools is None or tool_name in available_tools:
-                    max_q = max(max_q, value)
-
-        return max_q
+        return self._get_policy_dict().max_value(context_hash, available_tools)
 
     def update_policy(
         self,
@@ -343,6 +540,9 @@ class RLService:
 
         Q(s,a) = Q(s,a) + α * (r + γ * max_a' Q(s',a') - Q(s,a))
 
+        The in-memory policy is updated immediately; with background writes
+        the database row is written by the policy writer shortly after.
+
         Args:
             session_id: Session identifier
             tool_name: The tool/action that was executed
@@ -352,20 +552,10 @@ class RLService:
             available_tools: Tools available for max Q calculation
             is_terminal: Whether this is a terminal state (no future rewards)
         """
-        with self.Session() as session:
-            # Get or create policy entry
-            policy = session.query(RLPolicy).filter_by(
-                tool_name=tool_name,
-                context_hash=context_hash
-            ).first()
-
-            if not policy:
-                # Create new policy
-                old_value = 0.0
-                visit_count = 0
-            else:
-                old_value = policy.action_value or 0.0
-                visit_count = policy.visit_count or 0
+        with self._lock:
+            policy = self._get_policy_dict()
+            old_value = policy.get(tool_name, context_hash)
+            visit_count = self._visit_counts.get((tool_name, context_hash), 0)
 
             # Calculate future value (TD target)
             if is_terminal or next_context_hash is None:
@@ -373,56 +563,202 @@ class RLService:
                 future_value = 0.0
             else:
                 # Get max Q-value for next state
-                future_value = self.get_max_q_value(next_context_hash, available_tools)
+                future_value = policy.max_value(next_context_hash, available_tools)
 
             # Q-learning update: Q(s,a) = Q(s,a) + α * (r + γ * max Q(s',a') - Q(s,a))
             td_target = reward + self.discount_factor * future_value
             new_value = old_value + self.learning_rate * (td_target - old_value)
-            visit_count += 1
-
-            if policy:
-                # Update existing policy
-                policy.action_value = new_value
-                policy.visit_count = visit_count
-                policy.last_updated = datetime.utcnow()
-            else:
-                # Insert new policy
-                policy = RLPolicy(
-                    tool_name=tool_name,
-                    context_hash=context_hash,
-                    action_value=new_value,
-                    visit_count=visit_count
-                )
-                session.add(policy)
 
-            session.commit()
-
-            # Update cache
-            cache_key = f"{tool_name}:{context_hash}"
-            self._policy_cache[cache_key] = new_value
-            self._cache_updated = True
+            self._set_policy_value(tool_name, context_hash, new_value, visit_count + 1)
+
+    def _set_policy_value(self, tool_name: str, context_hash: str, value: float, visit_count: int):
+        """Update the in-memory policy and persist the entry (queued with background writes)."""
+        now = datetime.utcnow()
+        self._policy_cache.set(tool_name, context_hash, value)
+        self._visit_counts[(tool_name, context_hash)] = visit_count
+        self._updated_at[(tool_name, context_hash)] = now
+
+        record = {
+            "tool_name": tool_name,
+            "context_hash": context_hash,
+            "action_value": value,
+            "visit_count": visit_count,
+            "last_updated": now,
+        }
+        if self._writer is None:
+            self._write_policies([record])
+            return
+
+        if self._journal is not None:
+            segment = self._journal.append({**record, "last_updated": record["last_updated"].isoformat()})
+            self._segment_pending[segment] += 1
+            record["journal_segment"] = segment
+        self._writer.submit(record)
+
+    def _write_policies(self, records: list[dict[str, Any]]):
+        """Upsert policy entries (runs on the writer thread with background writes).
+
+        If the write fails, the entries are kept and retried with the next
+        batch; until then they stay in the journal, so a restart replays them.
+
+        The journal is rotated as each batch is taken, so updates journaled
+        from then on go to a new segment. A segment is deleted once every
+        update in it is written, which keeps the journal as short as the
+        backlog of unwritten updates.
+        """
+        if self._journal is not None:
+            # Every record in this batch was journaled before the batch was taken
+            try:
+                self._journal.rotate()
+            except OSError as e:
+                print(f"Warning: Could not rotate the RL policy journal: {e}", file=sys.stderr)
+
+        with self._lock:
+            failed, self._failed_policies = self._failed_policies, {}
+            segments = self._failed_segments + Counter(
+                r["journal_segment"] for r in records if "journal_segment" in r
+            )
+            self._failed_segments = Counter()
 
-    def _get_policy_dict(self) -> dict[str, float]:
-        """Get policy as dictionary for fast lookup."""
-        if not self._cache_updated:
-            # Load from database
+        # Only the latest update of each entry needs writing
+        latest = {**failed, **{(r["tool_name"], r["context_hash"]): r for r in records}}
+        rows = [{k: v for k, v in r.items() if k != "journal_segment"} for r in latest.values()]
+        try:
             with self.Session() as session:
-                for policy in session.query(RLPolicy).all():
-                    key = f"{policy.tool_name}:{policy.context_hash}"
-                    self._policy_cache[key] = policy.action_value or 0.0
-            self._cache_updated = True
-        
+                replace_upsert(session, RLPolicy.__table__, ("tool_name", "context_hash"), rows)
+                session.commit()
+        except Exception as e:
+            with self._lock:
+                # Entries updated again meanwhile keep their newer record
+                self._failed_policies = {**latest, **self._failed_policies}
+                self._failed_segments.update(segments)
+            print(f"Warning: Could not write {len(latest)} RL policy entries, will retry: {e}", file=sys.stderr)
+            return
+
+        if self._journal is not None:
+            written = []
+            with self._lock:
+                for segment, count in segments.items():
+                    self._segment_pending[segment] -= count
+                    if self._segment_pending[segment] <= 0:
+                        del self._segment_pending[segment]
+                        written.append(segment)
+            for segment in written:
+                self._journal.discard(segment)
+
+    def _replay_journal(self):
+        """Write updates journaled by a previous run that never reached the database."""
+        entries = self._journal.read()
+        if entries:
+            for entry in entries:
+                entry["last_updated"] = datetime.fromisoformat(entry["last_updated"])
+            latest = {(e["tool_name"], e["context_hash"]): e for e in entries}
+            with self.Session() as session:
+                replace_upsert(session, RLPolicy.__table__, ("tool_name", "context_hash"), list(latest.values()))
+                session.commit()
+            print(f"Recovered {len(latest)} RL policy updates from {self._journal.path}", file=sys.stderr)
+        self._journal.truncate()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until queued policy updates are written (no-op without background writes)."""
+        if self._writer is None:
+            return True
+        return self._writer.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None):
+        """Stop the policy sync, write queued policy updates and stop the background writer."""
+        self._sync_stop.set()
+        if self._sync_thread is not None:
+            self._sync_thread.join(timeout)
+        if self._writer is not None:
+            self._writer.close(timeout)
+        if self._failed_policies:
+            # Last attempt; whatever still fails is left in the journal
+            self._write_policies([])
+        if self._journal is not None:
+            self._journal.close()
+
+    def get_writer_stats(self) -> Optional[dict[str, Any]]:
+        """Background writer counters, or None if writes are synchronous."""
+        if self._writer is None:
+            return None
+        return {**self._writer.get_stats(), "retrying": len(self._failed_policies)}
+
+    def _get_policy_dict(self) -> PolicyStore:
+        """Get policy as a context-indexed store for fast lookup (never touches the database)."""
         return self._policy_cache
 
+    def start_policy_sync(self):
+        """Re-sync the policy every ``policy_sync_interval`` seconds on a background thread.
+
+        Call after the initial sync_policy, so the thread only ever loads changes.
+        """
+        if self.policy_sync_interval <= 0 or self._sync_thread is not None:
+            return
+        self._sync_thread = threading.Thread(target=self._run_policy_sync, name="rl-policy-sync", daemon=True)
+        self._sync_thread.start()
+
+    def _run_policy_sync(self):
+        while not self._sync_stop.wait(self.policy_sync_interval):
+            try:
+                self.sync_policy()
+            except Exception as e:
+                print(f"Warning: Could not sync RL policy: {e}", file=sys.stderr)
+
+    def sync_policy(self) -> int:
+        """Load rl_policy rows changed since the last sync (every row the first time).
+
+        Only the needed columns are read, in chunks. A row never replaces a
+        local entry updated at the same time or later, so updates still
+        queued for writing are kept. Concurrent calls run one after another,
+        so a sync started meanwhile only loads what the first one missed.
+
+        Returns:
+            Number of entries loaded or refreshed.
+        """
+        with self._sync_lock:
+            return self._sync_policy()
+
+    def _sync_policy(self) -> int:
+        t = RLPolicy.__table__
+        query = (
+            select(t.c.tool_name, t.c.context_hash, t.c.action_value, t.c.visit_count, t.c.last_updated)
+            # Rows in the pre-bucketing format are never looked up (see scripts/migrate_rl_policy.py)
+            .where(t.c.context_hash.startswith(CONTEXT_ID_PREFIX))
+        )
+        if self._policy_watermark is not None:
+            query = query.where(t.c.last_updated > self._policy_watermark - POLICY_SYNC_OVERLAP)
+
+        applied = 0
+        watermark = self._policy_watermark
+        with self.Session() as session:
+            result = session.execute(query.execution_options(yield_per=POLICY_SYNC_CHUNK_ROWS))
+            for rows in result.partitions():
+                with self._lock:
+                    for row in rows:
+                        key = (row.tool_name, row.context_hash)
+                        local = self._updated_at.get(key)
+                        if local is not None and (row.last_updated is None or local >= row.last_updated):
+                            continue
+                        self._policy_cache.set(row.tool_name, row.context_hash, row.action_value or 0.0)
+                        self._visit_counts[key] = row.visit_count or 0
+                        if row.last_updated is not None:
+                            self._updated_at[key] = row.last_updated
+                        applied += 1
+                for row in rows:
+                    if row.last_updated is not None and (watermark is None or row.last_updated > watermark):
+                        watermark = row.last_updated
+
+        self._policy_watermark = watermark
+        return applied
+
     def get_tool_confidence(
         self,
         tool_name: str,
         context_hash: str
     ) -> float:
         """Get confidence score for a tool in given context."""
-        policy_dict = self._get_policy_dict()
-        key = f"{tool_name}:{context_hash}"
-        action_value = policy_dict.get(key, 0.0)
+        action_value = self._get_policy_dict().get(tool_name, context_hash)
         
         # Normalize to [0, 1] range using sigmoid-like function
         confidence = 1.0 / (1.0 + np.exp(-action_value / 5.0))
@@ -497,24 +833,15 @@ class RLService:
         reward_delta = new_reward - old_reward
         
         # Update Q-value: Q = Q + alpha * reward_delta
-        with self.Session() as session:
-            policy = session.query(RLPolicy).filter_by(
-                tool_name=tool_name,
-                context_hash=context_hash
-            ).first()
-            
-            if policy:
-                policy.action_value = (policy.action_value or 0.0) + self.learning_rate * reward_delta
-                policy.last_updated = datetime.utcnow()
-                session.commit()
-                
-                # Update cache
-                cache_key = f"{tool_name}:{context_hash}"
-                self._policy_cache[cache_key] = policy.action_value
-                
-                return True
-        
-        return False
+        with self._lock:
+            policy = self._get_policy_dict()
+            visit_count = self._visit_counts.get((tool_name, context_hash))
+            if visit_count is None:
+                return False
+
+            new_value = policy.get(tool_name, context_hash) + self.learning_rate * reward_delta
+            self._set_policy_value(tool_name, context_hash, new_value, visit_count)
+        return True
 
     def get_successful_sequences(
         self,
@@ -547,7 +874,6 @@ class RLService:
                 ]
         except Exception as e:
             # Log error but don't crash - return empty list
-            import sys
             print(f"Warning: Failed to get successful sequences: {e}", file=sys.stderr)
             return []
 
@@ -562,21 +888,45 @@ def init_rl_service(
     exploration_rate: float = 0.1,
     learning_rate: float = 0.1,
     discount_factor: float = 0.9,
-    min_samples: int = 5
+    min_samples: int = 5,
+    background_writes: bool = False,
+    batch_size: int = 500,
+    flush_interval: float = 1.0,
+    journal_path: Optional[Path] = None,
+    policy_sync_interval: float = 5.0
 ) -> RLService:
-    """Initialize the global RL service."""
+    """Initialize the global RL service.
+
+    The policy isn't loaded yet: call sync_policy, then start_policy_sync.
+    """
     global _rl_service
+    if _rl_service is not None:
+        _rl_service.close()
     _rl_service = RLService(
         feedback_service,
         db_url,
         exploration_rate=exploration_rate,
         learning_rate=learning_rate,
         discount_factor=discount_factor,
-        min_samples=min_samples
+        min_samples=min_samples,
+        background_writes=background_writes,
+        batch_size=batch_size,
+        flush_interval=flush_interval,
+        journal_path=journal_path,
+        policy_sync_interval=policy_sync_interval
     )
     return _rl_service
 
 
+def close_rl_service(timeout: Optional[float] = None):
+    """Drain queued policy writes of the global RL service and release it."""
+    global _rl_service
+    if _rl_service is not None:
+        _rl_service.close(timeout)
+        _rl_service.engine.dispose()
+        _rl_service = None
+
+
 def get_rl_service() -> Optional[RLService]:
     """Get the global RL service instance."""
     return _rl_service
@@ -0,0 +1,106 @@
+"""Portable INSERT ... ON CONFLICT helpers for counter tables."""
+
+from typing import Any, Callable, Iterable, Optional
+
+from sqlalchemy import Table, case, insert, literal, update
+from sqlalchemy.dialects import postgresql, sqlite
+
+# Rows per multi-row INSERT (keeps SQLite under its bound parameter limit)
+UPSERT_CHUNK_ROWS = 500
+
+
+def dialect_insert(dialect_name: str) -> Optional[Callable]:
+    """Dialect insert() supporting ON CONFLICT, or None if the database has none."""
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+    return None
+
+
+def increment_upsert(
+    session,
+    table: Table,
+    key_columns: tuple[str, ...],
+    rows: list[dict[str, Any]],
+    max_columns: Iterable[str] = ()
+):
+    """Insert rows, or add their values onto existing rows with the same key.
+
+    Every non-key column is summed, except ``max_columns`` which keep the
+    larger value. The arithmetic happens in the database, so concurrent
+    writers never lose each other's increments.
+    """
+    if not rows:
+        return
+    max_columns = set(max_columns)
+    value_columns = [c for c in rows[0] if c not in key_columns]
+
+    def combined(column: str, new):
+        current = table.c[column]
+        if column in max_columns:
+            return case(
+                (new.is_(None), current),
+                (current.is_(None), new),
+                (new > current, new),
+                else_=current
+            )
+        return current + new
+
+    insert_fn = dialect_insert(session.get_bind().dialect.name)
+    if insert_fn is not None:
+        for start in range(0, len(rows), UPSERT_CHUNK_ROWS):
+            stmt = insert_fn(table).values(rows[start:start + UPSERT_CHUNK_ROWS])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c[k] for k in key_columns],
+                # Column references in SET are the stored row's values
+                set_={c: combined(c, stmt.excluded[c]) for c in value_columns}
+            )
+            session.execute(stmt)
+        return
+
+    # Other databases: atomic increment, insert if the row doesn't exist yet
+    for row in rows:
+        result = session.execute(
+            update(table)
+            .where(*(table.c[k] == row[k] for k in key_columns))
+            .values({c: combined(c, literal(row[c], type_=table.c[c].type)) for c in value_columns})
+        )
+        if result.rowcount == 0:
+            session.execute(insert(table).values(**row))
+
+
+def replace_upsert(
+    session,
+    table: Table,
+    key_columns: tuple[str, ...],
+    rows: list[dict[str, Any]]
+):
+    """Insert rows, or overwrite the non-key columns of existing rows with the same key.
+
+    Rows must have distinct keys.
+    """
+    if not rows:
+        return
+    value_columns = [c for c in rows[0] if c not in key_columns]
+
+    insert_fn = dialect_insert(session.get_bind().dialect.name)
+    if insert_fn is not None:
+        for start in range(0, len(rows), UPSERT_CHUNK_ROWS):
+            stmt = insert_fn(table).values(rows[start:start + UPSERT_CHUNK_ROWS])
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c[k] for k in key_columns],
+                set_={c: stmt.excluded[c] for c in value_columns}
+            )
+            session.execute(stmt)
+        return
+
+    for row in rows:
+        result = session.execute(
+            update(table)
+            .where(*(table.c[k] == row[k] for k in key_columns))
+            .values({c: row[c] for c in value_columns})
+        )
+        if result.rowcount == 0:
+            session.execute(insert(table).values(**row))
+
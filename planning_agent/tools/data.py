@@ -1,8 +1,11 @@
-"""Data tools - export_data_slice, copy_data, clear_data."""
+"""Data tools - export_data_slice, export_data_slices_batch, copy_data, clear_data."""
 
+import asyncio
 from typing import Any, Optional
 
 from planning_agent.client.planning_client import PlanningClient
+from planning_agent.utils.data_slice import decode_data_slice
+from planning_agent.utils.rate_limit import get_rate_limiter
 
 _client: PlanningClient = None
 _app_name: str = None
@@ -20,21 +23,81 @@ def set_app_name(app_name: str):
 
 async def export_data_slice(
     plan_type: str,
-    grid_definition: dict[str, Any]
+    grid_definition: dict[str, Any],
+    columnar: bool = False
 ) -> dict[str, Any]:
     """Export a specific data slice (grid) from the application / Exportar um slice de dados.
 
     Args:
         plan_type: The name of the plan type (e.g., 'FinPlan', 'FinRPT').
         grid_definition: The data grid definition with pov, columns, and rows.
+        columnar: Return numeric values with row/column headers and row totals
+            instead of the raw response (#Missing becomes null).
 
     Returns:
         dict: The exported data slice with rows and column values.
     """
     result = await _client.export_data_slice(_app_name, plan_type, grid_definition)
+    if columnar:
+        return {"status": "success", "data": decode_data_slice(result).to_dict()}
     return {"status": "success", "data": result}
 
 
+async def export_data_slices_batch(
+    grids: list[dict[str, Any]],
+    plan_type: Optional[str] = None,
+    max_concurrency: Optional[int] = None
+) -> dict[str, Any]:
+    """Export several data slices concurrently / Exportar varios slices de dados em paralelo.
+
+    Grids run under a semaphore and the tenant's rate limit. A failing grid
+    does not abort the others; its entry carries the error instead.
+
+    Args:
+        grids: List of {"grid_definition": {...}, "plan_type": "..."} items.
+        plan_type: Default plan type for items that don't specify one.
+        max_concurrency: Max grids in flight (default: PLANNING_BATCH_CONCURRENCY).
+
+    Returns:
+        dict: Per-grid results in the same order as the input.
+    """
+    config = _client.config
+    semaphore = asyncio.Semaphore(max(1, max_concurrency or config.planning_batch_concurrency))
+    limiter = get_rate_limiter(
+        config.planning_url or "mock",
+        config.planning_rate_limit_per_second,
+        config.planning_rate_limit_burst
+    )
+
+    async def run_one(index: int, item: Any) -> dict[str, Any]:
+        item_plan_type = (item.get("plan_type") if isinstance(item, dict) else None) or plan_type
+        grid_definition = item.get("grid_definition") if isinstance(item, dict) else None
+        if not item_plan_type or not isinstance(grid_definition, dict):
+            return {
+                "index": index,
+                "status": "error",
+                "error": "Each grid needs a grid_definition object and a plan_type"
+            }
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                result = await _client.export_data_slice(_app_name, item_plan_type, grid_definition)
+                return {"index": index, "status": "success", "data": result}
+            except Exception as e:
+                return {"index": index, "status": "error", "error": str(e)}
+
+    results = await asyncio.gather(*(run_one(i, item) for i, item in enumerate(grids)))
+    failed = sum(1 for r in results if r["status"] == "error")
+    return {
+        "status": "success",
+        "data": {
+            "results": list(results),
+            "succeeded": len(results) - failed,
+            "failed": failed
+        }
+    }
+
+
 async def copy_data(
     from_scenario: Optional[str] = None,
     to_scenario: Optional[str] = None,
@@ -116,10 +179,45 @@ TOOL_DEFINITIONS = [
                     "type": "object",
                     "description": "The data grid definition with pov, columns, and rows",
                 },
+                "columnar": {
+                    "type": "boolean",
+                    "description": "Return numeric values with row/column headers and row totals instead of the raw response",
+                    "default": False,
+                },
             },
             "required": ["plan_type", "grid_definition"],
         },
     },
+    {
+        "name": "export_data_slices_batch",
+        "description": "Export several data slices (grids) concurrently; one failing grid does not abort the others / Exportar varios slices de dados em paralelo",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "grids": {
+                    "type": "array",
+                    "description": "Grids to export, each with a grid_definition and optional plan_type",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "plan_type": {"type": "string", "description": "Plan type for this grid"},
+                            "grid_definition": {"type": "object", "description": "The data grid definition with pov, columns, and rows"},
+                        },
+                        "required": ["grid_definition"],
+                    },
+                },
+                "plan_type": {
+                    "type": "string",
+                    "description": "Default plan type for grids that don't specify one (e.g., 'FinPlan')",
+                },
+                "max_concurrency": {
+                    "type": "integer",
+                    "description": "Maximum grids exported at once (default from server config)",
+                },
+            },
+            "required": ["grids"],
+        },
+    },
     {
         "name": "copy_data",
         "description": "Copy data between scenarios, years, or periods / Copiar dados entre cenarios",
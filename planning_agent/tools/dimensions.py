@@ -1,8 +1,9 @@
-"""Dimension tools - get_dimensions, get_members, get_member."""
+"""Dimension tools - get_dimensions, get_members, get_member, get_descendants, get_ancestors, find_members."""
 
 from typing import Any, Optional
 
 from planning_agent.client.planning_client import PlanningClient
+from planning_agent.utils.metadata import load_dimension_metadata
 
 _client: PlanningClient = None
 _app_name: str = None
@@ -28,16 +29,18 @@ async def get_dimensions() -> dict[str, Any]:
     return {"status": "success", "data": dimensions}
 
 
-async def get_members(dimension_name: str) -> dict[str, Any]:
+async def get_members(dimension_name: str, include_properties: bool = False) -> dict[str, Any]:
     """Get members of a specific dimension / Obter membros de uma dimensao especifica.
 
     Args:
         dimension_name: The name of the dimension.
+        include_properties: Include each member's metadata properties (Data Storage,
+            Account Type, per-plan-type aggregation, ...) when they are known.
 
     Returns:
         dict: List of dimension members.
     """
-    members = await _client.get_members(_app_name, dimension_name)
+    members = await _client.get_members(_app_name, dimension_name, include_properties)
     return {"status": "success", "data": members}
 
 
@@ -60,6 +63,137 @@ async def get_member(
     return {"status": "success", "data": member}
 
 
+async def get_descendants(
+    dimension_name: str,
+    member_name: str,
+    leaves_only: bool = False,
+    max_depth: Optional[int] = None
+) -> dict[str, Any]:
+    """Get the descendants of a member from the local hierarchy index / Obter descendentes de um membro.
+
+    Args:
+        dimension_name: The name of the dimension.
+        member_name: The ancestor member.
+        leaves_only: Only return level 0 (leaf) members.
+        max_depth: Only return members at most this many generations below the member.
+
+    Returns:
+        dict: Descendant names in hierarchy order.
+    """
+    index = await _client.get_member_index(_app_name, dimension_name)
+    if member_name not in index:
+        return {"status": "error", "error": f"Member not found in {dimension_name}: {member_name}"}
+
+    descendants = index.get_descendants(member_name, leaves_only=leaves_only, max_depth=max_depth)
+    return {
+        "status": "success",
+        "data": {
+            "member": member_name,
+            "level": index.get_level(member_name),
+            "generation": index.get_generation(member_name),
+            "descendants": descendants,
+            "count": len(descendants)
+        }
+    }
+
+
+async def get_ancestors(
+    dimension_name: str,
+    member_name: str
+) -> dict[str, Any]:
+    """Get the ancestors of a member, from its parent up to the root / Obter ancestrais de um membro.
+
+    Args:
+        dimension_name: The name of the dimension.
+        member_name: The member to look up.
+
+    Returns:
+        dict: Ancestor names ordered from parent to root.
+    """
+    index = await _client.get_member_index(_app_name, dimension_name)
+    if member_name not in index:
+        return {"status": "error", "error": f"Member not found in {dimension_name}: {member_name}"}
+
+    return {
+        "status": "success",
+        "data": {
+            "member": member_name,
+            "level": index.get_level(member_name),
+            "generation": index.get_generation(member_name),
+            "ancestors": index.get_ancestors(member_name),
+            "shared_parents": index.shared_parents.get(member_name, [])
+        }
+    }
+
+
+async def find_members(
+    dimension_name: str,
+    filters: dict[str, Any],
+    ancestor: Optional[str] = None,
+    leaves_only: bool = False,
+    limit: int = 100
+) -> dict[str, Any]:
+    """Find members by metadata property values / Encontrar membros por propriedades.
+
+    Args:
+        dimension_name: The name of the dimension.
+        filters: Property name -> required value, e.g. {"Account Type": "revenue",
+            "Data Storage": "store"}. A list matches any of its values.
+        ancestor: Only return descendants of this member.
+        leaves_only: Only return level 0 (leaf) members.
+        limit: Maximum number of members to return.
+
+    Returns:
+        dict: Matching members with the filtered property values.
+    """
+    metadata = load_dimension_metadata(dimension_name)
+    if metadata is None:
+        return {"status": "error", "error": f"No exported metadata for dimension: {dimension_name}"}
+
+    try:
+        matches = metadata.filter(filters or {})
+    except (KeyError, ValueError) as e:
+        return {
+            "status": "error",
+            "error": e.args[0] if e.args else str(e),
+            "available_properties": metadata.property_names
+        }
+
+    names = [metadata.names[i] for i in matches]
+    if ancestor or leaves_only:
+        # Same rows as the candidates, so every match is in the hierarchy
+        index = metadata.member_index()
+        if ancestor and ancestor not in index:
+            return {"status": "error", "error": f"Member not found in {dimension_name}: {ancestor}"}
+        keep = [
+            n in index
+            and (not ancestor or index.is_descendant(n, ancestor))
+            and (not leaves_only or index.is_leaf(n))
+            for n in names
+        ]
+        matches = [i for i, k in zip(matches, keep) if k]
+        names = [n for n, k in zip(names, keep) if k]
+
+    columns = [metadata.resolve_property(name) for name in (filters or {})]
+    results = [
+        {
+            "name": metadata.names[i],
+            "parent": metadata.parents[i],
+            "alias": metadata.aliases[i],
+            **{column: metadata.columns[column][i] for column in columns},
+        }
+        for i in matches[:max(0, limit)]
+    ]
+    return {
+        "status": "success",
+        "data": {
+            "members": results,
+            "count": len(names),
+            "truncated": len(names) > len(results)
+        }
+    }
+
+
 TOOL_DEFINITIONS = [
     {
         "name": "get_dimensions",
@@ -79,6 +213,11 @@ TOOL_DEFINITIONS = [
                     "type": "string",
                     "description": "The name of the dimension",
                 },
+                "include_properties": {
+                    "type": "boolean",
+                    "description": "Include member metadata properties (Data Storage, Account Type, aggregation per plan type, ...)",
+                    "default": False,
+                },
             },
             "required": ["dimension_name"],
         },
@@ -105,6 +244,81 @@ TOOL_DEFINITIONS = [
             "required": ["dimension_name", "member_name"],
         },
     },
+    {
+        "name": "get_descendants",
+        "description": "Get all descendants of a member (optionally leaves only) from the cached hierarchy / Obter descendentes de um membro",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "dimension_name": {
+                    "type": "string",
+                    "description": "The name of the dimension",
+                },
+                "member_name": {
+                    "type": "string",
+                    "description": "The ancestor member",
+                },
+                "leaves_only": {
+                    "type": "boolean",
+                    "description": "Only return level 0 (leaf) members",
+                    "default": False,
+                },
+                "max_depth": {
+                    "type": "integer",
+                    "description": "Only return members at most this many generations below the member",
+                },
+            },
+            "required": ["dimension_name", "member_name"],
+        },
+    },
+    {
+        "name": "get_ancestors",
+        "description": "Get the ancestors of a member from its parent up to the root / Obter ancestrais de um membro",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "dimension_name": {
+                    "type": "string",
+                    "description": "The name of the dimension",
+                },
+                "member_name": {
+                    "type": "string",
+                    "description": "The member to look up",
+                },
+            },
+            "required": ["dimension_name", "member_name"],
+        },
+    },
+    {
+        "name": "find_members",
+        "description": "Find members by metadata property values, e.g. all stored revenue accounts / Encontrar membros por propriedades",
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                "dimension_name": {
+                    "type": "string",
+                    "description": "The name of the dimension",
+                },
+                "filters": {
+                    "type": "object",
+                    "description": "Property name -> value, e.g. {\"Account Type\": \"revenue\", \"Data Storage\": \"store\"}; a list matches any of its values",
+                },
+                "ancestor": {
+                    "type": "string",
+                    "description": "Only return descendants of this member",
+                },
+                "leaves_only": {
+                    "type": "boolean",
+                    "description": "Only return level 0 (leaf) members",
+                    "default": False,
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of members to return",
+                    "default": 100,
+                },
+            },
+            "required": ["dimension_name", "filters"],
+        },
+    },
 ]
-
-
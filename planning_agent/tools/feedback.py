@@ -4,6 +4,7 @@ from typing import Any, Optional
 
 from planning_agent.services.feedback_service import get_feedback_service
 from planning_agent.services.rl_service import get_rl_service
+from planning_agent.utils.session_store import SessionStore
 
 
 async def submit_feedback(
@@ -126,21 +127,27 @@ async def get_recent_executions(
 
 
 # Global tracking of last execution per session
-_last_executions: dict[str, dict] = {}
+_last_executions = SessionStore(namespace="last_execution")
+
+
+def set_session_store(store: SessionStore):
+    """Set the store holding the last execution per session."""
+    global _last_executions
+    _last_executions = store
 
 
 def track_last_execution(session_id: str, execution_id: int, tool_name: str, context_hash: str = None):
     """Track the last execution for a session (called from agent.py)."""
-    _last_executions[session_id] = {
+    _last_executions.set(session_id, {
         "execution_id": execution_id,
         "tool_name": tool_name,
         "context_hash": context_hash
-    }
+    })
 
 
 def get_last_execution(session_id: str) -> dict:
     """Get the last execution for a session."""
-    return _last_executions.get(session_id, {})
+    return _last_executions.get(session_id) or {}
 
 
 async def rate_last_tool(
@@ -1,13 +1,83 @@
 """Local cache for dimension members and other metadata."""
 
 import json
-import os
+import sys
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, Union
+
+from planning_agent.utils.member_store import (
+    SOURCE_CSV,
+    SOURCE_JSON,
+    MemberStore,
+    open_member_store,
+    write_member_store,
+)
+from planning_agent.utils.metadata import get_metadata_file, read_metadata_file
 
 # Cache directory in project root
 CACHE_DIR = Path(__file__).parent.parent.parent / ".cache"
 MEMBERS_CACHE_DIR = CACHE_DIR / "members"
+ENDPOINTS_CACHE_FILE = CACHE_DIR / "endpoints.json"
+
+# In-memory copy of the endpoint discovery file (loaded on first use)
+_endpoint_variants: Optional[dict[str, dict[str, int]]] = None
+
+
+class _MemoryEntry:
+    """Members kept in process, with the source files' stat signature.
+
+    Holds either parsed members or a mapped binary store; views of a store
+    are built on first request. ``size_bytes`` grows as they are built.
+    """
+
+    def __init__(
+        self,
+        signature: tuple,
+        checked_at: float,
+        members: Optional[dict[str, Any]] = None,
+        store: Optional[MemberStore] = None
+    ):
+        self.signature = signature
+        self.checked_at = checked_at
+        self.members = members
+        self.store = store
+        self.size_bytes = _estimate_members_size(members) if members is not None else 0
+        # Members without their properties, built on first request
+        self.stripped: Optional[dict[str, Any]] = None
+
+    def view(self, include_properties: bool) -> dict[str, Any]:
+        if include_properties:
+            if self.members is None:
+                self.members = self.store.to_members()
+                self.size_bytes += _estimate_members_size(self.members)
+            return self.members
+        if self.stripped is None:
+            if self.members is None:
+                # Straight from the base columns, without decoding any properties
+                self.stripped = self.store.to_members(include_properties=False)
+            else:
+                self.stripped = strip_member_properties(self.members)
+            if self.stripped is not self.members:
+                self.size_bytes += _estimate_members_size(self.stripped)
+        return self.stripped
+
+
+# Process-level member cache: (app, dimension) -> entry, least recently used first
+_members_memory: "OrderedDict[tuple[str, str], _MemoryEntry]" = OrderedDict()
+_members_memory_bytes = 0
+_members_memory_max_bytes = 128 * 1024 * 1024
+# Seconds between stat() checks of a cached dimension's source files
+_members_memory_check_interval = 5.0
+
+
+def configure_members_memory_cache(max_bytes: int, check_interval: float):
+    """Set the process-level member cache budget and revalidation interval."""
+    global _members_memory_max_bytes, _members_memory_check_interval
+    _members_memory_max_bytes = max_bytes
+    _members_memory_check_interval = check_interval
+    _evict_members_memory()
 
 
 def ensure_cache_dir():
@@ -24,77 +94,226 @@ def get_cache_file_path(app_name: str, dimension_name: str) -> Path:
     return MEMBERS_CACHE_DIR / f"{safe_app}_{safe_dim}.json"
 
 
-def load_members_from_cache(app_name: str, dimension_name: str) -> Optional[dict[str, Any]]:
+def get_binary_cache_path(app_name: str, dimension_name: str) -> Path:
+    """Get the binary (memory-mapped) cache file path for a dimension's members."""
+    return get_cache_file_path(app_name, dimension_name).with_suffix(".bin")
+
+
+def _load_members_json(json_file: Path) -> Optional[dict[str, Any]]:
+    """Parse a JSON members cache file."""
+    try:
+        with open(json_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            if data.get("items"):
+                return data
+    except Exception:
+        pass
+    return None
+
+
+def _load_members_csv(csv_file: Path, dimension_name: str) -> Optional[dict[str, Any]]:
+    """Parse an ExportedMetadata_<Dimension>.csv file, typed properties included."""
+    try:
+        members = read_metadata_file(csv_file, dimension_name).to_members()
+        if members["items"]:
+            return members
+    except Exception:
+        pass
+    return None
+
+
+def _get_members_csv_file(dimension_name: str) -> Optional[Path]:
+    """CSV export in the project root, if the dimension has one."""
+    return get_metadata_file(dimension_name)
+
+
+def _members_sources(app_name: str, dimension_name: str) -> list[tuple[Optional[Path], int]]:
+    """Candidate member sources in priority order."""
+    return [
+        (get_cache_file_path(app_name, dimension_name), SOURCE_JSON),
+        (_get_members_csv_file(dimension_name), SOURCE_CSV),
+    ]
+
+
+def _sources_signature(sources: list[tuple[Optional[Path], int]]) -> tuple:
+    """(size, mtime) of every candidate source - changes when any of them does."""
+    signature = []
+    for source_file, _ in sources:
+        try:
+            stat = source_file.stat() if source_file is not None else None
+        except OSError:
+            stat = None
+        signature.append((stat.st_size, stat.st_mtime_ns) if stat else None)
+    return tuple(signature)
+
+
+def _estimate_value_size(value: Any) -> int:
+    """Rough in-memory size of a JSON-like value, nested dicts and lists included."""
+    if isinstance(value, str):
+        return 50 + len(value)
+    if isinstance(value, dict):
+        # Dict overhead plus a slot per entry
+        return 64 + sum(
+            24 + _estimate_value_size(k) + _estimate_value_size(v) for k, v in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return 56 + sum(8 + _estimate_value_size(v) for v in value)
+    return 32
+
+
+# Members sized one by one before the rest are extrapolated from them
+_SIZE_SAMPLE = 256
+
+
+def _estimate_members_size(members: dict[str, Any]) -> int:
+    """Rough in-memory size of a members dict.
+
+    Large dimensions are sized from evenly spaced members rather than all
+    of them, which would take longer than loading the members.
+    """
+    items = members.get("items")
+    if not isinstance(items, list) or len(items) <= _SIZE_SAMPLE:
+        return _estimate_value_size(members)
+    step = len(items) / _SIZE_SAMPLE
+    sampled = sum(_estimate_value_size(items[int(i * step)]) for i in range(_SIZE_SAMPLE))
+    others = _estimate_value_size({k: v for k, v in members.items() if k != "items"})
+    return others + 56 + len(items) * (8 + sampled // _SIZE_SAMPLE)
+
+
+def strip_member_properties(members: dict[str, Any]) -> dict[str, Any]:
+    """Members without each item's "properties" (the same dict if no item has any)."""
+    items = members.get("items") if isinstance(members, dict) else None
+    if not items or not any("properties" in item for item in items):
+        return members
+    return {
+        **members,
+        "items": [{k: v for k, v in item.items() if k != "properties"} for item in items]
+    }
+
+
+def _evict_members_memory():
+    global _members_memory_bytes
+    while _members_memory_bytes > _members_memory_max_bytes and _members_memory:
+        _, entry = _members_memory.popitem(last=False)
+        _members_memory_bytes -= entry.size_bytes
+
+
+def _forget_members_memory(app_name: Optional[str] = None, dimension_name: Optional[str] = None):
+    """Drop process-level entries for a dimension, an app, or everything."""
+    global _members_memory_bytes
+    for key in list(_members_memory):
+        if (app_name is None or key[0] == app_name) and (dimension_name is None or key[1] == dimension_name):
+            _members_memory_bytes -= _members_memory.pop(key).size_bytes
+
+
+def get_members_signature(app_name: str, dimension_name: str) -> tuple:
+    """Stat signature of a dimension's member sources.
+
+    It changes whenever the members load_members_from_cache returns may have
+    changed, so it can key data derived from them.
+    """
+    entry = _members_memory.get((app_name, dimension_name))
+    if entry is not None and time.monotonic() - entry.checked_at < _members_memory_check_interval:
+        return entry.signature
+    return _sources_signature(_members_sources(app_name, dimension_name))
+
+
+def load_members_from_cache(
+    app_name: str,
+    dimension_name: str,
+    include_properties: bool = True
+) -> Optional[dict[str, Any]]:
     """Load dimension members from local cache.
     
-    First checks JSON cache file, then falls back to CSV file in project root.
+    Parsed members are kept in process (LRU, bounded by memory) and reused
+    without touching the filesystem; every few seconds the source files are
+    stat()ed and the entry is dropped if their size or mtime changed.
+    
+    On a miss, first checks JSON cache file, then falls back to CSV file in
+    project root. Whichever source is used is compiled once into a binary
+    file next to the JSON cache; later loads memory-map that file instead of
+    re-parsing the source, until the source's size or modification time changes.
+    Members are built from the mapped store per view, so a property-free
+    request never decodes the properties.
+    
+    The returned dict is shared between callers and must not be modified.
+    Without ``include_properties``, a copy without the member properties is
+    returned; it is built once per cached source and shared as well.
     
     Returns:
         Cached members dict or None if not found.
     """
-    # First, try JSON cache file
-    cache_file = get_cache_file_path(app_name, dimension_name)
-    if cache_file.exists():
-        try:
-            with open(cache_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                if data.get("items"):
-                    return data
-        except Exception:
-            pass
-    
-    # Fallback: Check for CSV file in project root (for Entity and Account dimensions)
-    csv_file = None
-    if dimension_name == "Entity":
-        csv_file = cache_file.parent.parent.parent / "ExportedMetadata_Entity.csv"
-    elif dimension_name == "Account":
-        csv_file = cache_file.parent.parent.parent / "ExportedMetadata_Account.csv"
-    elif dimension_name == "CostCenter":
-        csv_file = cache_file.parent.parent.parent / "ExportedMetadata_CostCenter.csv"
-    elif dimension_name == "Region":
-        csv_file = cache_file.parent.parent.parent / "ExportedMetadata_Region.csv"
-    
-    if csv_file and csv_file.exists():
+    global _members_memory_bytes
+    key = (app_name, dimension_name)
+    sources = _members_sources(app_name, dimension_name)
+    now = time.monotonic()
+
+    entry = _members_memory.get(key)
+    if entry is not None:
+        if now - entry.checked_at < _members_memory_check_interval:
+            return _members_view(key, entry, include_properties)
+        if _sources_signature(sources) == entry.signature:
+            entry.checked_at = now
+            return _members_view(key, entry, include_properties)
+        _forget_members_memory(app_name, dimension_name)
+
+    signature = _sources_signature(sources)
+    loaded = _load_members_from_files(app_name, dimension_name, sources)
+    if loaded is None:
+        return None
+    if isinstance(loaded, MemberStore):
+        entry = _MemoryEntry(signature, now, store=loaded)
+    else:
+        entry = _MemoryEntry(signature, now, members=loaded)
+    _members_memory[key] = entry
+    _members_memory_bytes += entry.size_bytes
+    return _members_view(key, entry, include_properties)
+
+
+def _members_view(key: tuple[str, str], entry: _MemoryEntry, include_properties: bool) -> dict[str, Any]:
+    """Requested view of a cached entry, accounting for anything it had to build."""
+    global _members_memory_bytes
+    size_before = entry.size_bytes
+    members = entry.view(include_properties)
+    if key in _members_memory:
+        _members_memory.move_to_end(key)
+        _members_memory_bytes += entry.size_bytes - size_before
+        _evict_members_memory()
+    return members
+
+
+def _load_members_from_files(
+    app_name: str,
+    dimension_name: str,
+    sources: list[tuple[Optional[Path], int]]
+) -> Optional[Union[MemberStore, dict[str, Any]]]:
+    """Map the binary cache, or parse the first usable source file (and compile it)."""
+    binary_file = get_binary_cache_path(app_name, dimension_name)
+
+    for source_file, source_kind in sources:
+        if source_file is None:
+            continue
         try:
-            import csv
-            members = []
-            encodings = ["utf-8", "utf-8-sig", "latin-1", "cp1252"]
-            
-            for encoding in encodings:
-                try:
-                    with open(csv_file, "r", encoding=encoding) as f:
-                        reader = csv.DictReader(f)
-                        for row in reader:
-                            if dimension_name == "Entity":
-                                member_name = row.get("Entity", "").strip()
-                            elif dimension_name == "Account":
-                                member_name = row.get("Account", "").strip()
-                            elif dimension_name == "CostCenter":
-                                member_name = row.get("CostCenter", "").strip()
-                            elif dimension_name == "Region":
-                                member_name = row.get("Region", "").strip()
-                            else:
-                                continue
-                            
-                            parent = row.get("Parent", "").strip()
-                            alias = row.get("Alias: Default", "").strip()
-                            description = row.get("Description", "").strip()
-                            
-                            if member_name and member_name != dimension_name:
-                                members.append({
-                                    "name": member_name,
-                                    "parent": parent if parent else "Root",
-                                    "description": description or alias or member_name,
-                                    "alias": alias if alias else None
-                                })
-                    if members:
-                        return {"items": members}
-                except Exception:
-                    if encoding == encodings[-1]:
-                        raise
-                    continue
-        except Exception:
-            pass
+            stat = source_file.stat()
+        except OSError:
+            continue
+
+        store = open_member_store(binary_file, source_kind, stat.st_size, stat.st_mtime_ns)
+        if store is not None:
+            return store
+
+        if source_kind == SOURCE_JSON:
+            members = _load_members_json(source_file)
+        else:
+            members = _load_members_csv(source_file, dimension_name)
+
+        if members:
+            try:
+                write_member_store(binary_file, members, source_kind, stat.st_size, stat.st_mtime_ns)
+            except Exception as e:
+                # Don't fail if cache write fails
+                print(f"Warning: Could not write binary member cache: {e}", file=sys.stderr)
+            return members
     
     return None
 
@@ -102,12 +321,68 @@ def load_members_from_cache(app_name: str, dimension_name: str) -> Optional[dict
 def save_members_to_cache(app_name: str, dimension_name: str, members: dict[str, Any]):
     """Save dimension members to local cache."""
     cache_file = get_cache_file_path(app_name, dimension_name)
+    _forget_members_memory(app_name, dimension_name)
     try:
         with open(cache_file, "w", encoding="utf-8") as f:
             json.dump(members, f, indent=2, ensure_ascii=False)
     except Exception as e:
         # Don't fail if cache write fails
-        print(f"Warning: Could not write to cache: {e}", file=os.sys.stderr)
+        print(f"Warning: Could not write to cache: {e}", file=sys.stderr)
+
+
+def _endpoint_key(app_name: str, api_version: str) -> str:
+    return f"{app_name}:{api_version}"
+
+
+def _load_endpoint_variants() -> dict[str, dict[str, int]]:
+    global _endpoint_variants
+    if _endpoint_variants is None:
+        _endpoint_variants = {}
+        if ENDPOINTS_CACHE_FILE.exists():
+            try:
+                with open(ENDPOINTS_CACHE_FILE, "r", encoding="utf-8") as f:
+                    _endpoint_variants = json.load(f)
+            except Exception:
+                pass
+    return _endpoint_variants
+
+
+def load_endpoint_variant(app_name: str, api_version: str, operation: str) -> Optional[int]:
+    """Get the index of the endpoint variant known to work for an operation.
+
+    Args:
+        app_name: Planning application name
+        api_version: REST API version (e.g. 'v3')
+        operation: Client operation using a fallback chain (e.g. 'get_members')
+
+    Returns:
+        Index into the operation's endpoint list, or None if not discovered yet.
+    """
+    return _load_endpoint_variants().get(_endpoint_key(app_name, api_version), {}).get(operation)
+
+
+def save_endpoint_variant(app_name: str, api_version: str, operation: str, variant: int):
+    """Remember which endpoint variant worked for an operation."""
+    variants = _load_endpoint_variants()
+    app_variants = variants.setdefault(_endpoint_key(app_name, api_version), {})
+    if app_variants.get(operation) == variant:
+        return
+    app_variants[operation] = variant
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(ENDPOINTS_CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump(variants, f, indent=2)
+    except Exception as e:
+        # Don't fail if cache write fails
+        print(f"Warning: Could not write endpoint cache: {e}", file=sys.stderr)
+
+
+def clear_endpoint_cache():
+    """Forget all discovered endpoint variants."""
+    global _endpoint_variants
+    _endpoint_variants = {}
+    if ENDPOINTS_CACHE_FILE.exists():
+        ENDPOINTS_CACHE_FILE.unlink()
 
 
 def clear_members_cache(app_name: Optional[str] = None, dimension_name: Optional[str] = None):
@@ -117,23 +392,28 @@ def clear_members_cache(app_name: Optional[str] = None, dimension_name: Optional
         app_name: If provided, only clear cache for this app
         dimension_name: If provided, only clear cache for this dimension
     """
+    # Like the file cache below, a dimension without an app clears everything
+    _forget_members_memory(app_name, dimension_name if app_name else None)
     if not MEMBERS_CACHE_DIR.exists():
         return
     
     if app_name and dimension_name:
-        # Clear specific file
+        # Clear specific file (and its binary copy)
         cache_file = get_cache_file_path(app_name, dimension_name)
-        if cache_file.exists():
-            cache_file.unlink()
+        for path in (cache_file, cache_file.with_suffix(".bin")):
+            if path.exists():
+                path.unlink()
     elif app_name:
         # Clear all files for this app
         safe_app = app_name.replace("/", "_").replace("\\", "_")
-        for cache_file in MEMBERS_CACHE_DIR.glob(f"{safe_app}_*.json"):
-            cache_file.unlink()
+        for pattern in (f"{safe_app}_*.json", f"{safe_app}_*.bin"):
+            for cache_file in MEMBERS_CACHE_DIR.glob(pattern):
+                cache_file.unlink()
     else:
         # Clear all cache
-        for cache_file in MEMBERS_CACHE_DIR.glob("*.json"):
-            cache_file.unlink()
+        for pattern in ("*.json", "*.bin"):
+            for cache_file in MEMBERS_CACHE_DIR.glob(pattern):
+                cache_file.unlink()
 
 
 def list_cached_dimensions(app_name: Optional[str] = None) -> list[dict[str, str]]:
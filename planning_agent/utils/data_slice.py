@@ -0,0 +1,156 @@
+"""Columnar decoding of exportdataslice responses into NumPy arrays."""
+
+from typing import Any, Optional
+
+import numpy as np
+
+# Cell values Planning uses for empty intersections
+MISSING_TOKENS = ("#Missing", "#missing", "#MISSING", "", "#NoAccess")
+
+
+class DecodedSlice:
+    """An exportdataslice response as a float64 matrix plus header arrays.
+
+    Attributes:
+        values: (rows x columns) float64 matrix, NaN where the cell is #Missing.
+        row_headers: (rows x row dimensions) object array of member names.
+        column_headers: (columns x column dimensions) object array of member names.
+        pov: POV member names echoed by the response.
+    """
+
+    def __init__(
+        self,
+        values: np.ndarray,
+        row_headers: np.ndarray,
+        column_headers: np.ndarray,
+        pov: Optional[list[str]] = None
+    ):
+        self.values = values
+        self.row_headers = row_headers
+        self.column_headers = column_headers
+        self.pov = pov or []
+
+    @property
+    def row_labels(self) -> list[str]:
+        """Row headers joined into one label per row."""
+        return [" | ".join(str(h) for h in headers) for headers in self.row_headers]
+
+    @property
+    def column_labels(self) -> list[str]:
+        """Column headers joined into one label per column."""
+        return [" | ".join(str(h) for h in headers) for headers in self.column_headers]
+
+    def row_totals(self) -> np.ndarray:
+        """Sum of each row, ignoring #Missing cells (all-missing rows total NaN)."""
+        totals = np.nansum(self.values, axis=1)
+        totals[np.isnan(self.values).all(axis=1)] = np.nan
+        return totals
+
+    def column_totals(self) -> np.ndarray:
+        """Sum of each column, ignoring #Missing cells (all-missing columns total NaN)."""
+        totals = np.nansum(self.values, axis=0)
+        totals[np.isnan(self.values).all(axis=0)] = np.nan
+        return totals
+
+    def top_n(self, n: int = 10, column: Optional[int] = None) -> list[tuple[str, float]]:
+        """Rows with the largest values, as (row label, value) pairs.
+
+        Args:
+            n: Number of rows to return.
+            column: Column index to rank by; defaults to the row totals.
+        """
+        scores = self.row_totals() if column is None else self.values[:, column]
+        valid = np.flatnonzero(~np.isnan(scores))
+        if valid.size == 0:
+            return []
+        n = min(n, valid.size)
+        # Partial sort: only the top n are ordered
+        top = valid[np.argpartition(-scores[valid], n - 1)[:n]]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        labels = self.row_labels
+        return [(labels[i], float(scores[i])) for i in top]
+
+    def variance(self, other: "DecodedSlice") -> tuple[np.ndarray, np.ndarray]:
+        """Cell-wise variance against another slice with the same layout.
+
+        Returns:
+            (amount, percent) matrices; percent is NaN where the base is 0 or missing.
+        """
+        if self.values.shape != other.values.shape:
+            raise ValueError(
+                f"Slices have different shapes: {self.values.shape} vs {other.values.shape}"
+            )
+        amount = self.values - other.values
+        base = np.abs(other.values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percent = np.where(base > 0, amount / base * 100.0, np.nan)
+        return amount, percent
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable columnar form (#Missing becomes None)."""
+        values = self.values.astype(object)
+        values[np.isnan(self.values)] = None
+        row_totals = self.row_totals().astype(object)
+        row_totals[np.isnan(self.row_totals())] = None
+        return {
+            "pov": self.pov,
+            "row_headers": self.row_headers.tolist(),
+            "column_headers": self.column_headers.tolist(),
+            "values": values.tolist(),
+            "row_totals": row_totals.tolist(),
+        }
+
+
+def _to_float_matrix(cells: np.ndarray) -> np.ndarray:
+    """Convert an object matrix of raw cell values to float64 with NaN for missing."""
+    missing = np.isin(cells, MISSING_TOKENS) | np.equal(cells, None)
+    cells = cells.copy()
+    cells[missing] = np.nan
+    try:
+        return cells.astype(np.float64)
+    except (TypeError, ValueError):
+        # Unexpected text cells (e.g. smart list labels) - fall back per cell
+        def to_float(v):
+            try:
+                return float(v)
+            except (TypeError, ValueError):
+                return np.nan
+        return np.vectorize(to_float, otypes=[np.float64])(cells)
+
+
+def decode_data_slice(response: dict[str, Any]) -> DecodedSlice:
+    """Decode an exportdataslice response into NumPy arrays.
+
+    Args:
+        response: Raw response from PlanningClient.export_data_slice.
+
+    Returns:
+        DecodedSlice with the value matrix and header arrays.
+    """
+    rows = response.get("rows") or []
+
+    width = max((len(r.get("data") or []) for r in rows), default=0)
+    depth = max((len(r.get("headers") or []) for r in rows), default=0)
+
+    cells = np.full((len(rows), width), None, dtype=object)
+    row_headers = np.full((len(rows), depth), "", dtype=object)
+    for i, row in enumerate(rows):
+        data = row.get("data") or []
+        cells[i, :len(data)] = data
+        headers = row.get("headers") or []
+        row_headers[i, :len(headers)] = headers
+
+    # Columns come back as one list of member names per column dimension
+    columns = response.get("columns") or []
+    if columns and all(isinstance(c, list) and len(c) == width for c in columns):
+        column_headers = np.array(columns, dtype=object).T.reshape(width, len(columns))
+    else:
+        column_headers = np.array([[str(i)] for i in range(width)], dtype=object).reshape(width, 1)
+
+    pov = response.get("pov")
+    return DecodedSlice(
+        values=_to_float_matrix(cells),
+        row_headers=row_headers,
+        column_headers=column_headers,
+        pov=pov if isinstance(pov, list) else None
+    )
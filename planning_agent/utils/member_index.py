@@ -0,0 +1,191 @@
+"""In-memory hierarchy index for dimension members."""
+
+from typing import Any, Optional
+
+
+class MemberIndex:
+    """Parent/child index over a dimension's members, built once per dimension.
+
+    Members are numbered in pre-order, so the descendants of a member are the
+    contiguous range ``order[pre[i] + 1 : end[i] + 1]``. That makes descendant
+    lists O(k) and ancestor checks O(1).
+
+    Generation follows Planning: roots are generation 1 and each child is one
+    deeper. Level counts up from the leaves: leaves are level 0 and a parent is
+    one more than its highest child.
+
+    Shared members (a name appearing under a second parent) keep their primary
+    position in the tree; the extra parent is listed by ``shared_parents``.
+    """
+
+    def __init__(self, members: list[dict[str, Any]]):
+        self.names: list[str] = []
+        self.members: list[dict[str, Any]] = []
+        self._ids: dict[str, int] = {}
+        self.shared_parents: dict[str, list[str]] = {}
+
+        parent_names: list[Optional[str]] = []
+        for member in members:
+            name = member.get("name") or member.get("memberName")
+            if not name:
+                continue
+            parent = member.get("parent") or member.get("parentName")
+            if name in self._ids:
+                if parent:
+                    self.shared_parents.setdefault(name, []).append(parent)
+                continue
+            self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.members.append(member)
+            parent_names.append(parent)
+
+        count = len(self.names)
+        self.parent: list[int] = [-1] * count
+        self.children: list[list[int]] = [[] for _ in range(count)]
+        for i, parent_name in enumerate(parent_names):
+            p = self._ids.get(parent_name, -1) if parent_name else -1
+            # Unknown parents ('Root', the dimension name) make the member a root
+            if p != -1 and p != i:
+                self.parent[i] = p
+                self.children[p].append(i)
+        self.roots: list[int] = [i for i in range(count) if self.parent[i] == -1]
+
+        self.pre: list[int] = [0] * count
+        self.end: list[int] = [0] * count
+        self.generation: list[int] = [0] * count
+        self.level: list[int] = [0] * count
+        self.order: list[int] = []
+        visited = [False] * count
+        self._number(self.roots, visited)
+
+        # Members whose parent chain loops never reach a root - break the cycle
+        if len(self.order) < count:
+            for i in range(count):
+                if not visited[i]:
+                    if self.parent[i] != -1:
+                        self.children[self.parent[i]].remove(i)
+                    self.parent[i] = -1
+                    self.roots.append(i)
+                    self._number([i], visited)
+
+        self._by_level: dict[int, list[int]] = {}
+        self._by_generation: dict[int, list[int]] = {}
+        for i in self.order:
+            self._by_level.setdefault(self.level[i], []).append(i)
+            self._by_generation.setdefault(self.generation[i], []).append(i)
+
+    def _number(self, starts: list[int], visited: list[bool]):
+        """Assign pre-order numbers, intervals, generations and levels (iteratively)."""
+        for start in starts:
+            if visited[start]:
+                continue
+            visited[start] = True
+            self.generation[start] = 1
+            self.pre[start] = len(self.order)
+            self.order.append(start)
+            stack = [(start, 0)]
+            while stack:
+                node, child_pos = stack[-1]
+                children = self.children[node]
+                if child_pos < len(children):
+                    stack[-1] = (node, child_pos + 1)
+                    child = children[child_pos]
+                    if visited[child]:
+                        continue
+                    visited[child] = True
+                    self.generation[child] = self.generation[node] + 1
+                    self.pre[child] = len(self.order)
+                    self.order.append(child)
+                    stack.append((child, 0))
+                else:
+                    stack.pop()
+                    self.end[node] = len(self.order) - 1
+                    if children:
+                        self.level[node] = 1 + max(self.level[c] for c in children)
+
+    @classmethod
+    def from_members(cls, members: dict[str, Any]) -> "MemberIndex":
+        """Build an index from a get_members response ({"items": [...]})."""
+        return cls(members.get("items") or [])
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _id(self, name: str) -> int:
+        try:
+            return self._ids[name]
+        except KeyError:
+            raise KeyError(f"Member not found: {name}") from None
+
+    def get(self, name: str) -> Optional[dict[str, Any]]:
+        """Get the member dict by name."""
+        i = self._ids.get(name)
+        return self.members[i] if i is not None else None
+
+    def get_parent(self, name: str) -> Optional[str]:
+        """Parent name, or None for a root member."""
+        p = self.parent[self._id(name)]
+        return self.names[p] if p != -1 else None
+
+    def get_children(self, name: str) -> list[str]:
+        """Direct children in hierarchy order."""
+        return [self.names[c] for c in self.children[self._id(name)]]
+
+    def get_descendants(
+        self,
+        name: str,
+        leaves_only: bool = False,
+        max_depth: Optional[int] = None
+    ) -> list[str]:
+        """All descendants in hierarchy (pre-order) order.
+
+        Args:
+            name: Ancestor member.
+            leaves_only: Only return level 0 descendants.
+            max_depth: Only return descendants at most this many generations below.
+        """
+        i = self._id(name)
+        ids = self.order[self.pre[i] + 1:self.end[i] + 1]
+        if leaves_only:
+            ids = [d for d in ids if not self.children[d]]
+        if max_depth is not None:
+            limit = self.generation[i] + max_depth
+            ids = [d for d in ids if self.generation[d] <= limit]
+        return [self.names[d] for d in ids]
+
+    def get_ancestors(self, name: str) -> list[str]:
+        """Ancestors from the parent up to the root."""
+        ancestors = []
+        p = self.parent[self._id(name)]
+        while p != -1:
+            ancestors.append(self.names[p])
+            p = self.parent[p]
+        return ancestors
+
+    def is_descendant(self, name: str, ancestor: str) -> bool:
+        """True if ``name`` is below ``ancestor`` in the hierarchy (O(1))."""
+        i, a = self._id(name), self._id(ancestor)
+        return self.pre[a] < self.pre[i] <= self.end[a]
+
+    def is_leaf(self, name: str) -> bool:
+        """True if the member has no children."""
+        return not self.children[self._id(name)]
+
+    def get_level(self, name: str) -> int:
+        """Level of a member (0 = leaf)."""
+        return self.level[self._id(name)]
+
+    def get_generation(self, name: str) -> int:
+        """Generation of a member (1 = root)."""
+        return self.generation[self._id(name)]
+
+    def members_at_level(self, level: int) -> list[str]:
+        """All members at a level, in hierarchy order."""
+        return [self.names[i] for i in self._by_level.get(level, [])]
+
+    def members_at_generation(self, generation: int) -> list[str]:
+        """All members at a generation, in hierarchy order."""
+        return [self.names[i] for i in self._by_generation.get(generation, [])]
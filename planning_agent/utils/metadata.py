@@ -0,0 +1,365 @@
+"""Ingestion of ExportedMetadata_<Dimension>.csv files into typed, columnar member tables."""
+
+import codecs
+import csv
+import io
+import re
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+import numpy as np
+
+from planning_agent.utils.member_index import MemberIndex
+
+# Metadata exports live in the project root
+METADATA_DIR = Path(__file__).parent.parent.parent
+METADATA_PREFIX = "ExportedMetadata_"
+
+# Cell values the export uses for "not set"
+NULL_TOKENS = ("", "<none>")
+
+# Columns that are always kept as text, even if every value looks numeric
+_TEXT_COLUMNS = ("Parent", "Description", "UUID", "Old Name", "Old Unique Name", "UDA", "Smart List")
+_TEXT_PREFIXES = ("Alias:", "Formula")
+
+_INT_RE = re.compile(r"^[+-]?\d+$")
+_FLOAT_RE = re.compile(r"^[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?$")
+
+# Process-level cache: path -> ((size, mtime_ns), DimensionMetadata)
+_loaded: dict[Path, tuple[tuple[int, int], "DimensionMetadata"]] = {}
+
+
+def decode_metadata_bytes(raw: bytes) -> tuple[str, str]:
+    """Decode an export with a single detected encoding.
+
+    Returns:
+        (text, encoding)
+    """
+    if raw.startswith(codecs.BOM_UTF8):
+        return raw[len(codecs.BOM_UTF8):].decode("utf-8"), "utf-8-sig"
+    if raw.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return raw.decode("utf-16"), "utf-16"
+    for encoding in ("utf-8", "cp1252"):
+        try:
+            return raw.decode(encoding), encoding
+        except UnicodeDecodeError:
+            continue
+    # latin-1 maps every byte, so it never fails
+    return raw.decode("latin-1"), "latin-1"
+
+
+def _is_text_column(column: str) -> bool:
+    return column in _TEXT_COLUMNS or column.startswith(_TEXT_PREFIXES)
+
+
+def _type_column(raw_values: list[str], text: bool) -> tuple[str, np.ndarray]:
+    """Convert a column of raw cells to its narrowest type.
+
+    Returns:
+        (type name, object array) - type is "bool", "int", "float" or "str";
+        unset cells are None.
+    """
+    values = [None if v in NULL_TOKENS else v for v in raw_values]
+    present = [v for v in values if v is not None]
+
+    kind = "str"
+    if present and not text:
+        lowered = {v.lower() for v in present}
+        if lowered <= {"true", "false"}:
+            kind = "bool"
+        elif all(_INT_RE.match(v) for v in present):
+            kind = "int"
+        elif all(_FLOAT_RE.match(v) for v in present):
+            kind = "float"
+
+    if kind == "bool":
+        values = [None if v is None else v.lower() == "true" for v in values]
+    elif kind == "int":
+        values = [None if v is None else int(v) for v in values]
+    elif kind == "float":
+        values = [None if v is None else float(v) for v in values]
+
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return kind, array
+
+
+class DimensionMetadata:
+    """One dimension's exported metadata, stored column by column.
+
+    ``names``, ``parents``, ``aliases`` and ``descriptions`` hold the base
+    member fields; every other export column is a typed property column in
+    ``columns`` (bool, int, float or str, None where unset).
+    """
+
+    def __init__(
+        self,
+        dimension: str,
+        names: list[str],
+        parents: list[Optional[str]],
+        aliases: list[Optional[str]],
+        descriptions: list[Optional[str]],
+        columns: dict[str, np.ndarray],
+        column_types: dict[str, str],
+        encoding: str = "utf-8"
+    ):
+        self.dimension = dimension
+        self.names = names
+        self.parents = parents
+        self.aliases = aliases
+        self.descriptions = descriptions
+        self.columns = columns
+        self.column_types = column_types
+        self.encoding = encoding
+        self._ids = {name: i for i, name in reversed(list(enumerate(names)))}
+        self._lower_columns: dict[str, np.ndarray] = {}
+        self._member_index: Optional[MemberIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._ids
+
+    @property
+    def property_names(self) -> list[str]:
+        """Property column names in export order."""
+        return list(self.columns)
+
+    def resolve_property(self, name: str) -> Optional[str]:
+        """Exact column name for a property, matched case-insensitively."""
+        if name in self.columns:
+            return name
+        lowered = name.strip().lower()
+        for column in self.columns:
+            if column.lower() == lowered:
+                return column
+        return None
+
+    def properties(self, index: int) -> dict[str, Any]:
+        """Set (non-None) properties of the member at ``index``."""
+        return {
+            column: values[index]
+            for column, values in self.columns.items()
+            if values[index] is not None
+        }
+
+    def get_properties(self, name: str) -> Optional[dict[str, Any]]:
+        """Set properties of a member by name."""
+        i = self._ids.get(name)
+        return self.properties(i) if i is not None else None
+
+    def member_index(self) -> MemberIndex:
+        """Hierarchy index over these rows (built on first use)."""
+        if self._member_index is None:
+            self._member_index = MemberIndex([
+                {"name": name, "parent": parent} for name, parent in zip(self.names, self.parents)
+            ])
+        return self._member_index
+
+    def to_members(self) -> dict[str, Any]:
+        """Members in get_members form ({"items": [...]}), properties included."""
+        items = []
+        for i, name in enumerate(self.names):
+            alias = self.aliases[i]
+            items.append({
+                "name": name,
+                "parent": self.parents[i] or "Root",
+                "description": self.descriptions[i] or alias or name,
+                "alias": alias,
+                "properties": self.properties(i),
+            })
+        return {"items": items}
+
+    def _coerce(self, column: str, value: Any) -> Any:
+        kind = self.column_types[column]
+        if value is None:
+            return None
+        if kind == "bool":
+            if isinstance(value, str):
+                return value.strip().lower() == "true"
+            return bool(value)
+        if kind == "int":
+            return int(value)
+        if kind == "float":
+            return float(value)
+        return str(value).lower()
+
+    def _column_for_match(self, column: str) -> np.ndarray:
+        values = self.columns[column]
+        if self.column_types[column] != "str":
+            return values
+        lowered = self._lower_columns.get(column)
+        if lowered is None:
+            lowered = np.empty(len(values), dtype=object)
+            lowered[:] = [v.lower() if v is not None else None for v in values]
+            self._lower_columns[column] = lowered
+        return lowered
+
+    def filter(self, filters: dict[str, Any]) -> np.ndarray:
+        """Indices of members matching every property filter.
+
+        Args:
+            filters: Property name -> value. Names match case-insensitively;
+                text values compare case-insensitively, a list matches any of
+                its values and None matches unset properties.
+
+        Returns:
+            Member indices in export (hierarchy) order.
+
+        Raises:
+            KeyError: If a property doesn't exist in this dimension.
+            ValueError: If a value can't be converted to the property's type.
+        """
+        mask = np.ones(len(self.names), dtype=bool)
+        for name, expected in filters.items():
+            column = self.resolve_property(name)
+            if column is None:
+                raise KeyError(f"Unknown property for {self.dimension}: {name}")
+            values = self._column_for_match(column)
+            if isinstance(expected, (list, tuple, set)):
+                wanted = [self._coerce(column, v) for v in expected]
+            else:
+                wanted = [self._coerce(column, expected)]
+
+            column_mask = np.zeros(len(values), dtype=bool)
+            for value in wanted:
+                if value is None:
+                    column_mask |= np.equal(values, None)
+                else:
+                    column_mask |= values == value
+            mask &= column_mask
+        return np.flatnonzero(mask)
+
+    def property_values(self, name: str) -> dict[Any, int]:
+        """Distinct values of a property and how many members have each."""
+        column = self.resolve_property(name)
+        if column is None:
+            raise KeyError(f"Unknown property for {self.dimension}: {name}")
+        counts: dict[Any, int] = {}
+        for value in self.columns[column].tolist():
+            counts[value] = counts.get(value, 0) + 1
+        return counts
+
+
+def parse_metadata(text: str, dimension: str, encoding: str = "utf-8") -> DimensionMetadata:
+    """Parse the text of a metadata export into a DimensionMetadata."""
+    # Exported headers have a space after each comma (", Parent")
+    rows = list(csv.reader(io.StringIO(text), skipinitialspace=True))
+    if not rows:
+        return DimensionMetadata(dimension, [], [], [], [], {}, {}, encoding)
+
+    header = [h.strip() for h in rows[0]]
+    width = len(header)
+    body = []
+    for row in rows[1:]:
+        if not row or not row[0].strip():
+            continue
+        if len(row) < width:
+            row = row + [""] * (width - len(row))
+        body.append([cell.strip() for cell in row[:width]])
+
+    # The first column holds the member name; drop the dimension's own row
+    body = [row for row in body if row[0] != dimension]
+    cells = list(zip(*body)) if body else [()] * width
+    by_name = {column: list(cells[i]) for i, column in enumerate(header)}
+
+    def base(column: str) -> list[Optional[str]]:
+        values = by_name.get(column)
+        if values is None:
+            return [None] * len(body)
+        return [None if v in NULL_TOKENS else v for v in values]
+
+    columns: dict[str, np.ndarray] = {}
+    column_types: dict[str, str] = {}
+    for i, column in enumerate(header[1:], start=1):
+        if column in ("Parent", "Alias: Default", "Description") or column in columns:
+            continue
+        column_types[column], columns[column] = _type_column(list(cells[i]), _is_text_column(column))
+
+    return DimensionMetadata(
+        dimension=dimension,
+        names=[row[0] for row in body],
+        parents=base("Parent"),
+        aliases=base("Alias: Default"),
+        descriptions=base("Description"),
+        columns=columns,
+        column_types=column_types,
+        encoding=encoding
+    )
+
+
+def read_metadata_file(path: Path, dimension: Optional[str] = None) -> DimensionMetadata:
+    """Read one export file (uncached).
+
+    Args:
+        path: Path to an ExportedMetadata_<Dimension>.csv file.
+        dimension: Dimension name; defaults to the name in the file name.
+    """
+    if dimension is None:
+        dimension = path.stem[len(METADATA_PREFIX):]
+    text, encoding = decode_metadata_bytes(path.read_bytes())
+    return parse_metadata(text, dimension, encoding)
+
+
+def get_metadata_file(dimension: str, directory: Optional[Path] = None) -> Optional[Path]:
+    """Path of a dimension's export, or None if there isn't one."""
+    path = (directory or METADATA_DIR) / f"{METADATA_PREFIX}{dimension}.csv"
+    return path if path.is_file() else None
+
+
+def list_metadata_dimensions(directory: Optional[Path] = None) -> list[str]:
+    """Dimensions that have an export file, sorted by name."""
+    return sorted(
+        path.stem[len(METADATA_PREFIX):]
+        for path in (directory or METADATA_DIR).glob(f"{METADATA_PREFIX}*.csv")
+    )
+
+
+def load_dimension_metadata(dimension: str, directory: Optional[Path] = None) -> Optional[DimensionMetadata]:
+    """Load a dimension's export, parsing it once per process.
+
+    The parsed table is reused until the file's size or modification time
+    changes. Returns None if the dimension has no export file.
+    """
+    path = get_metadata_file(dimension, directory)
+    if path is None:
+        return None
+    stat = path.stat()
+    signature = (stat.st_size, stat.st_mtime_ns)
+
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    metadata = read_metadata_file(path, dimension)
+    _loaded[path] = (signature, metadata)
+    return metadata
+
+
+def load_all_metadata(directory: Optional[Path] = None) -> dict[str, DimensionMetadata]:
+    """Load every ExportedMetadata_*.csv file, keyed by dimension."""
+    result = {}
+    for dimension in list_metadata_dimensions(directory):
+        metadata = load_dimension_metadata(dimension, directory)
+        if metadata is not None:
+            result[dimension] = metadata
+    return result
+
+
+def list_member_names(
+    dimension: str,
+    default: Optional[Iterable[str]] = None,
+    directory: Optional[Path] = None
+) -> list[str]:
+    """Member names of a dimension from its export, in hierarchy order.
+
+    Args:
+        dimension: Dimension name.
+        default: Names to return if there is no export (or it is empty).
+        directory: Directory holding the exports (defaults to the project root).
+    """
+    metadata = load_dimension_metadata(dimension, directory)
+    if metadata is not None and metadata.names:
+        return list(metadata.names)
+    return list(default or [])
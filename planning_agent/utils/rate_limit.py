@@ -0,0 +1,48 @@
+"""Async token-bucket rate limiting per Planning tenant."""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class RateLimiter:
+    """Token bucket allowing ``rate`` requests per second with bursts of ``burst``."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Serialize waiters so tokens are handed out in arrival order
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+# One limiter per tenant (Planning URL), shared by every batch against it
+_rate_limiters: dict[str, RateLimiter] = {}
+
+
+def get_rate_limiter(tenant: str, rate: float, burst: int = 1) -> RateLimiter:
+    """Get the shared rate limiter for a tenant, creating it on first use."""
+    limiter = _rate_limiters.get(tenant)
+    if limiter is None or limiter.rate != rate or limiter.burst != max(1, burst):
+        limiter = RateLimiter(rate, burst)
+        _rate_limiters[tenant] = limiter
+    return limiter
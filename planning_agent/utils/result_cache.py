@@ -0,0 +1,203 @@
+"""Content-addressed cache for export_data_slice results (memory LRU + optional disk tier)."""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from planning_agent.utils.cache import CACHE_DIR
+
+SLICES_CACHE_DIR = CACHE_DIR / "slices"
+
+
+def _safe_name(name: str) -> str:
+    return name.replace("/", "_").replace("\\", "_")
+
+
+def slice_cache_key(app_name: str, plan_type: str, grid_definition: dict[str, Any]) -> str:
+    """Canonical hash of (app, plan type, grid definition) - key order doesn't matter."""
+    canonical = json.dumps(
+        {"app": app_name, "plan_type": plan_type, "grid": grid_definition},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class SliceResultCache:
+    """Cache of exported data slices keyed by a hash of the request.
+
+    Entries live in a memory tier bounded by total payload size (least recently
+    used entries are evicted first) and, optionally, in a disk tier under
+    ``.cache/slices``. Each plan type can have its own TTL. Results are kept
+    serialized and every hit returns a fresh copy, so callers may modify them.
+
+    Each app has a generation, bumped by ``invalidate``. Callers read it
+    before starting an export and pass it to ``put``, which drops the result
+    if the app's data was invalidated while the export was in flight.
+    """
+
+    def __init__(
+        self,
+        default_ttl: float,
+        max_bytes: int,
+        plan_type_ttls: Optional[dict[str, float]] = None,
+        disk_dir: Optional[Path] = None
+    ):
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.plan_type_ttls = plan_type_ttls or {}
+        self.disk_dir = disk_dir
+
+        # key -> (app_name, expires_at, size_bytes, result JSON)
+        self._entries: OrderedDict[str, tuple[str, float, int, str]] = OrderedDict()
+        self._bytes = 0
+        # Invalidation counters: all apps, and per app
+        self._epoch = 0
+        self._generations: dict[str, int] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl_for(self, plan_type: str) -> float:
+        """TTL in seconds for a plan type (0 disables caching it)."""
+        return self.plan_type_ttls.get(plan_type, self.default_ttl)
+
+    def generation(self, app_name: str) -> tuple[int, int]:
+        """Current invalidation generation of an app's cached data."""
+        return self._epoch, self._generations.get(app_name, 0)
+
+    def _disk_path(self, app_name: str, key: str) -> Path:
+        return self.disk_dir / f"{_safe_name(app_name)}_{key}.json"
+
+    def get(
+        self,
+        app_name: str,
+        plan_type: str,
+        grid_definition: dict[str, Any]
+    ) -> Optional[dict[str, Any]]:
+        """Get a cached result, or None on a miss or expired entry."""
+        if self.ttl_for(plan_type) <= 0:
+            return None
+
+        key = slice_cache_key(app_name, plan_type, grid_definition)
+        now = time.time()
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[1] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[3])
+            self._remove(key)
+
+        if self.disk_dir is not None:
+            path = self._disk_path(app_name, key)
+            if path.exists():
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        stored = json.load(f)
+                    if stored.get("expires_at", 0) > now:
+                        result = stored["data"]
+                        self._store_memory(key, app_name, stored["expires_at"], json.dumps(result, ensure_ascii=False))
+                        self.disk_hits += 1
+                        return result
+                    path.unlink()
+                except Exception:
+                    pass
+
+        self.misses += 1
+        return None
+
+    def put(
+        self,
+        app_name: str,
+        plan_type: str,
+        grid_definition: dict[str, Any],
+        result: dict[str, Any],
+        generation: Optional[tuple[int, int]] = None
+    ):
+        """Store an export result.
+
+        With ``generation`` (read before the export started), the result is
+        dropped if the app was invalidated since.
+        """
+        ttl = self.ttl_for(plan_type)
+        if ttl <= 0:
+            return
+        if generation is not None and generation != self.generation(app_name):
+            return
+
+        key = slice_cache_key(app_name, plan_type, grid_definition)
+        expires_at = time.time() + ttl
+        payload = json.dumps(result, ensure_ascii=False)
+        self._store_memory(key, app_name, expires_at, payload)
+
+        if self.disk_dir is not None:
+            try:
+                self.disk_dir.mkdir(parents=True, exist_ok=True)
+                path = self._disk_path(app_name, key)
+                # Per-process name, so concurrent writers never share a temp file
+                tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    # Same layout as {"expires_at": ..., "data": result}, reusing the payload
+                    f.write(f'{{"expires_at": {json.dumps(expires_at)}, "data": {payload}}}')
+                os.replace(tmp_path, path)
+            except Exception as e:
+                # Don't fail if cache write fails
+                print(f"Warning: Could not write slice cache: {e}", file=sys.stderr)
+
+    def _store_memory(self, key: str, app_name: str, expires_at: float, payload: str):
+        size = len(payload)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (app_name, expires_at, size, payload)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def invalidate(self, app_name: Optional[str] = None):
+        """Drop cached results for an app (or everything), e.g. after data changes."""
+        if app_name is None:
+            self._epoch += 1
+            self._entries.clear()
+            self._bytes = 0
+        else:
+            self._generations[app_name] = self._generations.get(app_name, 0) + 1
+            for key in [k for k, e in self._entries.items() if e[0] == app_name]:
+                self._remove(key)
+
+        if self.disk_dir is not None and self.disk_dir.exists():
+            pattern = f"{_safe_name(app_name)}_*.json" if app_name else "*.json"
+            for path in self.disk_dir.glob(pattern):
+                try:
+                    path.unlink()
+                except Exception:
+                    pass
+
+    def get_stats(self) -> dict[str, Any]:
+        """Hit/miss counters and memory usage."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,199 @@
+"""Bounded per-session state with TTL expiry, in memory or shared between processes."""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+# Shared stores purge expired and excess sessions once per this many writes
+_SHARED_PURGE_EVERY = 100
+
+
+class SessionStore:
+    """Session ID -> state dict, bounded by age and count.
+
+    A session expires ``ttl`` seconds after it was last used (read or
+    written), and once ``max_entries`` sessions are stored the least
+    recently used one is evicted. Callers that change a state dict in place
+    must ``set`` it again to persist the change; ``update`` does a
+    read-modify-write atomically, also across processes.
+
+    By default state lives in this process (an ordered dict, so every
+    operation is O(1)). With ``shared_path``, it lives in a local SQLite
+    file instead, so several workers on one host see the same sessions;
+    values must then be JSON-serializable. ``namespace`` keeps different
+    stores apart in one file. Shared stores are trimmed every 100 writes,
+    so they can briefly hold up to that many sessions over the bound.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 21600.0,
+        max_entries: int = 10000,
+        shared_path: Optional[Path] = None,
+        namespace: str = "default"
+    ):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.namespace = namespace
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        # session_id -> (expires_at, value), least recently used first
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+
+        self._db: Optional[sqlite3.Connection] = None
+        self._writes = 0
+        if shared_path is not None:
+            Path(shared_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(shared_path), timeout=5.0, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "namespace TEXT NOT NULL, session_id TEXT NOT NULL, value TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (namespace, session_id))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS ix_sessions_expires ON sessions (namespace, expires_at)")
+            self._db.commit()
+
+    def get(self, session_id: str) -> Optional[dict[str, Any]]:
+        """State of a session (restarting its TTL), or None if unknown or expired."""
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                row = self._db.execute(
+                    "UPDATE sessions SET expires_at = ? "
+                    "WHERE namespace = ? AND session_id = ? AND expires_at > ? RETURNING value",
+                    (now + self.ttl, self.namespace, session_id, now)
+                ).fetchone()
+                self._db.commit()
+                return json.loads(row[0]) if row else None
+
+            return self._get_memory(session_id, now)
+
+    def set(self, session_id: str, value: dict[str, Any]):
+        """Store a session's state and restart its TTL."""
+        with self._lock:
+            if self._db is not None:
+                self._put_shared(session_id, value)
+                self._db.commit()
+                return
+
+            self._put_memory(session_id, value)
+
+    def update(
+        self,
+        session_id: str,
+        update: Callable[[Optional[dict[str, Any]]], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """Replace a session's state with ``update(current state or None)``, atomically.
+
+        Shared stores run the read and the write in one write transaction,
+        so workers updating the same session never lose each other's
+        changes. Returns the new state.
+        """
+        now = time.time()
+        with self._lock:
+            if self._db is not None:
+                # Take the write lock before reading
+                self._db.execute("BEGIN IMMEDIATE")
+                try:
+                    row = self._db.execute(
+                        "SELECT value FROM sessions WHERE namespace = ? AND session_id = ? AND expires_at > ?",
+                        (self.namespace, session_id, now)
+                    ).fetchone()
+                    value = update(json.loads(row[0]) if row else None)
+                    self._put_shared(session_id, value)
+                    self._db.commit()
+                except BaseException:
+                    self._db.rollback()
+                    raise
+                return value
+
+            value = update(self._get_memory(session_id, now))
+            self._put_memory(session_id, value)
+            return value
+
+    def delete(self, session_id: str):
+        with self._lock:
+            if self._db is not None:
+                self._db.execute(
+                    "DELETE FROM sessions WHERE namespace = ? AND session_id = ?", (self.namespace, session_id)
+                )
+                self._db.commit()
+            else:
+                self._entries.pop(session_id, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            if self._db is not None:
+                return self._db.execute(
+                    "SELECT COUNT(*) FROM sessions WHERE namespace = ? AND expires_at > ?",
+                    (self.namespace, time.time())
+                ).fetchone()[0]
+            self._purge_memory()
+            return len(self._entries)
+
+    def get_stats(self) -> dict[str, Any]:
+        """Counters for monitoring."""
+        return {
+            "sessions": len(self),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "evictions": self.evictions,
+            "shared": self._db is not None,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _get_memory(self, session_id: str, now: float) -> Optional[dict[str, Any]]:
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            del self._entries[session_id]
+            return None
+        self._entries[session_id] = (now + self.ttl, entry[1])
+        self._entries.move_to_end(session_id)
+        return entry[1]
+
+    def _put_memory(self, session_id: str, value: dict[str, Any]):
+        self._entries[session_id] = (time.time() + self.ttl, value)
+        self._entries.move_to_end(session_id)
+        self._purge_memory()
+
+    def _put_shared(self, session_id: str, value: dict[str, Any]):
+        self._db.execute(
+            "INSERT INTO sessions (namespace, session_id, value, expires_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (namespace, session_id) DO UPDATE SET value = excluded.value, "
+            "expires_at = excluded.expires_at",
+            (self.namespace, session_id, json.dumps(value), time.time() + self.ttl)
+        )
+        self._writes += 1
+        if self._writes % _SHARED_PURGE_EVERY == 0:
+            self._purge_shared()
+
+    def _purge_memory(self):
+        # Entries are in use order and every use restarts the TTL, so expired ones are at the front
+        now = time.time()
+        while self._entries:
+            session_id, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[session_id]
+            self.evictions += 1
+
+    def _purge_shared(self):
+        cursor = self._db.execute(
+            "DELETE FROM sessions WHERE namespace = ? AND (expires_at <= ? OR session_id IN ("
+            "SELECT session_id FROM sessions WHERE namespace = ? ORDER BY expires_at DESC LIMIT -1 OFFSET ?))",
+            (self.namespace, time.time(), self.namespace, self.max_entries)
+        )
+        self.evictions += max(0, cursor.rowcount)
@@ -0,0 +1,45 @@
+"""Compact old tool executions and RL episodes into daily rollups (e.g. from cron)."""
+
+import sys
+from pathlib import Path
+
+from planning_agent.config import PlanningConfig
+from planning_agent.services.feedback_service import FeedbackService
+from planning_agent.services.retention import RetentionManager
+from planning_agent.services.rl_service import RLService
+
+
+def main():
+    """Run one compaction pass with the configured retention windows."""
+    try:
+        config = PlanningConfig()
+    except Exception as e:
+        print(f"Error loading configuration: {e}")
+        sys.exit(1)
+
+    print(f"Database URL: {config.database_url}")
+    print(f"Retention: executions {config.feedback_retention_days} days, "
+          f"episodes {config.rl_episode_retention_days} days")
+
+    try:
+        feedback_service = FeedbackService(
+            config.database_url,
+            blob_dir=Path(config.feedback_result_blob_dir) if config.feedback_result_blob_store else None
+        )
+        rl_service = RLService(feedback_service, config.database_url)
+        stats = RetentionManager(
+            feedback_service,
+            rl_service,
+            execution_retention_days=config.feedback_retention_days,
+            episode_retention_days=config.rl_episode_retention_days
+        ).compact()
+    except Exception as e:
+        print(f"Error compacting database: {e}")
+        sys.exit(1)
+
+    print(f"Compacted {stats['tool_executions']} tool executions and {stats['rl_episodes']} RL episodes, "
+          f"deleted {stats['result_blobs']} stored results.")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,8 +28,11 @@ def init_schema(db_url: str) -> bool:
         print("Created tables:")
         print("  - tool_executions")
         print("  - tool_metrics")
+        print("  - tool_latency_buckets")
+        print("  - tool_execution_daily")
         print("  - rl_policy")
         print("  - rl_episodes")
+        print("  - rl_episode_daily")
         return True
     except Exception as e:
         print(f"Error initializing schema: {e}")
@@ -0,0 +1,60 @@
+"""Fold rl_policy rows in the old per-query context format into bucketed contexts."""
+
+import argparse
+import sys
+
+from planning_agent.config import PlanningConfig
+from planning_agent.services.feedback_service import FeedbackService
+from planning_agent.services.policy_migration import fold_legacy_policy
+from planning_agent.services.rl_service import RLService
+
+
+def main():
+    """Migrate the configured database's RL policy."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dry-run", action="store_true", help="Report what would change without writing")
+    parser.add_argument(
+        "--max-session-length", type=int, default=1000,
+        help="Longest session whose contexts are recovered (default: 1000)"
+    )
+    parser.add_argument(
+        "--drop-unrecoverable", action="store_true",
+        help="Delete old rows whose context can't be recovered (kept by default)"
+    )
+    args = parser.parse_args()
+
+    try:
+        config = PlanningConfig()
+    except Exception as e:
+        print(f"Error loading configuration: {e}")
+        sys.exit(1)
+
+    print(f"Database URL: {config.database_url}")
+
+    try:
+        # Tool names recover contexts whose previous tool was never itself a policy row
+        from planning_agent.agent import TOOL_HANDLERS
+
+        feedback_service = FeedbackService(config.database_url)
+        rl_service = RLService(feedback_service, config.database_url)
+        stats = fold_legacy_policy(
+            rl_service,
+            tool_names=TOOL_HANDLERS.keys(),
+            max_session_length=args.max_session_length,
+            dry_run=args.dry_run,
+            drop_unrecoverable=args.drop_unrecoverable
+        )
+    except Exception as e:
+        print(f"Error migrating RL policy: {e}")
+        sys.exit(1)
+
+    prefix = "Would fold" if args.dry_run else "Folded"
+    print(f"{prefix} {stats['folded']} of {stats['legacy_rows']} old rows into {stats['policy_rows']} policy rows.")
+    if args.drop_unrecoverable:
+        print(f"{stats['dropped']} rows with unrecoverable contexts {'would be ' if args.dry_run else ''}dropped.")
+    elif stats["kept"]:
+        print(f"{stats['kept']} rows with unrecoverable contexts kept; rerun with --drop-unrecoverable to delete them.")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import csv
 import json
 from pathlib import Path
 from planning_agent.agent import initialize_agent, execute_tool
+from planning_agent.utils.member_index import MemberIndex
 
 def load_revenue_accounts_from_csv():
     """Load revenue accounts from local CSV file, including hierarchy."""
@@ -20,7 +21,7 @@ def load_revenue_accounts_from_csv():
     try:
         # Read CSV file - try utf-8 first, then utf-8-sig for BOM
         with open(csv_file, "r", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
+            reader = csv.DictReader(f, skipinitialspace=True)
             row_count = 0
             for row in reader:
                 row_count += 1
@@ -53,21 +54,14 @@ def load_revenue_accounts_from_csv():
                 if account_name not in revenue_accounts:
                     revenue_accounts.append(account_name)
         
-        # Second pass: find all children of revenue accounts
-        # Keep expanding until we find all descendants
-        changed = True
-        while changed:
-            changed = False
-            for account in accounts:
-                account_name = account["name"]
-                parent = account["parent"]
-                
-                # If parent is a revenue account (or descendant), include this account
-                if parent in found_revenue_parents:
-                    if account_name not in revenue_accounts:
-                        revenue_accounts.append(account_name)
-                        found_revenue_parents.add(account_name)
-                        changed = True
+        # Second pass: add all descendants of the revenue parents (one index build, O(k) per parent)
+        index = MemberIndex(accounts)
+        seen = set(revenue_accounts)
+        for parent_name in list(found_revenue_parents):
+            for account_name in index.get_descendants(parent_name):
+                if account_name not in seen:
+                    seen.add(account_name)
+                    revenue_accounts.append(account_name)
         
         # Also include any account starting with 4 that's numeric (revenue codes)
         for account in accounts:
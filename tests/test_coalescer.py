@@ -0,0 +1,100 @@
+"""Tests for merging export_data_slice grids and splitting the merged response."""
+
+import asyncio
+
+import pytest
+
+from planning_agent.client.coalescer import GridCoalescer, _group_key, merge_grids
+
+
+def make_grid(scenario, accounts, period="Jan"):
+    return {
+        "suppressMissingBlocks": True,
+        "pov": {"dimensions": ["Scenario", "Period"], "members": [[scenario], [period]]},
+        "columns": [{"dimensions": ["Years"], "members": [["FY24"]]}],
+        "rows": [{"dimensions": ["Account"], "members": [accounts]}],
+    }
+
+
+def response_for(merged, value=1.0):
+    """Fake exportdataslice response: one row per combination of row members."""
+    rows = []
+    for segment in merged["rows"]:
+        combos = [[]]
+        for members in segment["members"]:
+            combos = [c + [m] for c in combos for m in members]
+        for headers in combos:
+            rows.append({"headers": headers, "data": [str(value)]})
+    return {"pov": [m[0] for m in merged["pov"]["members"]], "columns": [["FY24"]], "rows": rows}
+
+
+def test_differing_pov_members_move_onto_rows():
+    grids = [make_grid("Actual", ["Sales"]), make_grid("Budget", ["Sales", "COGS"])]
+    assert _group_key("App", "Plan1", grids[0]) == _group_key("App", "Plan1", grids[1])
+
+    merged, split = merge_grids(grids)
+    assert merged["pov"] == {"dimensions": ["Period"], "members": [["Jan"]]}
+    assert [s["dimensions"] for s in merged["rows"]] == [["Account", "Scenario"]] * 2
+
+    actual, budget = split(response_for(merged))
+    assert [r["headers"] for r in actual["rows"]] == [["Sales"]]
+    assert [r["headers"] for r in budget["rows"]] == [["Sales"], ["COGS"]]
+    assert actual["pov"] == ["Actual", "Jan"]
+    assert budget["pov"] == ["Budget", "Jan"]
+
+
+def test_duplicate_rows_are_requested_once_and_returned_to_each_grid():
+    grids = [make_grid("Actual", ["Sales"]), make_grid("Actual", ["Sales"])]
+    merged, split = merge_grids(grids)
+    assert len(merged["rows"]) == 1
+
+    first, second = split(response_for(merged))
+    assert first["rows"] == second["rows"] == [{"headers": ["Sales"], "data": ["1.0"]}]
+
+
+def test_alias_headers_are_not_split():
+    grids = [make_grid("Actual", ["Sales"]), make_grid("Budget", ["Sales"])]
+    merged, split = merge_grids(grids)
+    response = response_for(merged)
+    for row in response["rows"]:
+        row["headers"] = ["Total Sales", row["headers"][1]]
+
+    with pytest.raises(ValueError):
+        split(response)
+
+
+def test_unsplittable_grids_are_not_grouped():
+    alias_grid = {**make_grid("Actual", ["Sales"]), "aliasTableName": "Default"}
+    assert _group_key("App", "Plan1", alias_grid) is None
+
+    function_grid = make_grid("Actual", ["ILvl0Descendants(Sales)"])
+    assert _group_key("App", "Plan1", function_grid) is None
+
+    overlapping = make_grid("Actual", ["Sales"])
+    overlapping["pov"] = {"dimensions": ["Account", "Period"], "members": [["Sales"], ["Jan"]]}
+    assert _group_key("App", "Plan1", overlapping) is None
+
+
+def test_close_waits_for_dispatches_in_flight():
+    sent = []
+
+    async def send(app_name, plan_type, grid):
+        await asyncio.sleep(0.01)
+        sent.append(grid)
+        return response_for(grid)
+
+    async def run():
+        coalescer = GridCoalescer(send, window_ms=10000)
+        pending = [
+            asyncio.ensure_future(coalescer.submit("App", "Plan1", make_grid(scenario, ["Sales"])))
+            for scenario in ("Actual", "Budget")
+        ]
+        await asyncio.sleep(0)
+        await coalescer.close()
+        assert len(sent) == 1
+        assert not coalescer._tasks
+        return await asyncio.gather(*pending)
+
+    actual, budget = asyncio.run(run())
+    assert actual["pov"] == ["Actual", "Jan"]
+    assert budget["pov"] == ["Budget", "Jan"]
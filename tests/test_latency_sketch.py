@@ -0,0 +1,56 @@
+"""Tests for the log-bucket latency sketch."""
+
+import math
+import random
+
+import pytest
+
+from planning_agent.services import latency_sketch
+from planning_agent.services.latency_sketch import RELATIVE_ACCURACY, bucket_counts, bucket_index, bucket_value
+
+QUANTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def exact_quantile(ordered, q):
+    # Same rank convention as latency_sketch.percentiles
+    return ordered[math.floor(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize("sigma", [0.5, 1.5, 3.0])
+def test_percentiles_within_relative_accuracy(sigma):
+    rng = random.Random(sigma)
+    values = [rng.lognormvariate(math.log(200.0), sigma) for _ in range(20000)]
+    ordered = sorted(values)
+
+    estimates = latency_sketch.percentiles(bucket_counts(values).items(), QUANTILES)
+
+    for q in QUANTILES:
+        exact = exact_quantile(ordered, q)
+        assert abs(estimates[q] - exact) <= RELATIVE_ACCURACY * exact * (1 + 1e-9)
+
+
+def test_every_value_is_within_accuracy_of_its_bucket():
+    rng = random.Random(7)
+    for _ in range(10000):
+        value = 10 ** rng.uniform(-2, 6)
+        estimate = bucket_value(bucket_index(value))
+        assert abs(estimate - value) <= RELATIVE_ACCURACY * value * (1 + 1e-9)
+
+
+def test_merged_counts_give_the_same_percentiles():
+    rng = random.Random(3)
+    first = [rng.expovariate(1 / 50.0) for _ in range(5000)]
+    second = [rng.expovariate(1 / 500.0) for _ in range(5000)]
+
+    merged = bucket_counts(first)
+    for index, count in bucket_counts(second).items():
+        merged[index] = merged.get(index, 0) + count
+
+    assert latency_sketch.percentiles(merged.items(), QUANTILES) == \
+        latency_sketch.percentiles(bucket_counts(first + second).items(), QUANTILES)
+
+
+def test_tiny_values_and_empty_input():
+    assert bucket_value(bucket_index(0.0)) == 0.0
+    assert bucket_value(bucket_index(None)) == 0.0
+    assert latency_sketch.percentiles([]) == {}
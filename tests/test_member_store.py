@@ -0,0 +1,74 @@
+"""Tests for the binary member store."""
+
+import json
+
+from planning_agent.utils.member_store import SOURCE_CSV, SOURCE_JSON, open_member_store, write_member_store
+
+
+def csv_members():
+    items = []
+    for i in range(50):
+        properties = {
+            "Data Storage": "store" if i % 3 else "dynamic calc",
+            "Two Pass Calculation": i % 2 == 0,
+            "Data Id": 10 ** 15 + i,
+            "Solve Order": 0.5 * i,
+        }
+        if i % 10 == 0:
+            # Only some members have it, between two other columns
+            properties = {"Data Storage": properties.pop("Data Storage"), "UDA": "HSP_NOLINK", **properties}
+        items.append({
+            "name": f"M{i}",
+            "parent": f"M{(i - 1) // 2}" if i else "Root",
+            "description": f"Member {i}",
+            "alias": None,
+            "properties": properties,
+        })
+    return {"items": items}
+
+
+def test_round_trip_keeps_values_types_and_order(tmp_path):
+    members = csv_members()
+    path = tmp_path / "members.bin"
+    write_member_store(path, members, SOURCE_CSV, 100, 200)
+
+    store = open_member_store(path, SOURCE_CSV, 100, 200)
+    assert store.property_names == ["Data Storage", "UDA", "Two Pass Calculation", "Data Id", "Solve Order"]
+    assert json.dumps(store.to_members()) == json.dumps(members)
+    assert store.parent_indices.tolist()[:4] == [-1, 0, 0, 1]
+
+
+def test_odd_values_round_trip_through_json(tmp_path):
+    members = {
+        "totalResults": 3,
+        "items": [
+            {"name": "A", "parent": None, "links": [{"rel": "self"}],
+             "properties": {"Level": 1, "Huge": 2 ** 70, "Unset": None, "Tags": ["x"]}},
+            {"name": "B", "parent": "A", "alias": 7, "properties": {"Level": "one"}},
+            {"name": "C", "properties": ["not", "a", "dict"]},
+        ],
+    }
+    path = tmp_path / "members.bin"
+    write_member_store(path, members, SOURCE_JSON, 1, 1)
+
+    store = open_member_store(path, SOURCE_JSON, 1, 1)
+    assert store.to_members() == members
+    assert store.to_members(include_properties=False) == {
+        "totalResults": 3,
+        "items": [
+            {"name": "A", "parent": None, "links": [{"rel": "self"}]},
+            {"name": "B", "parent": "A", "alias": 7},
+            {"name": "C"},
+        ],
+    }
+
+
+def test_stale_or_foreign_store_is_not_opened(tmp_path):
+    path = tmp_path / "members.bin"
+    write_member_store(path, csv_members(), SOURCE_CSV, 100, 200)
+
+    assert open_member_store(path, SOURCE_CSV, 101, 200) is None
+    assert open_member_store(path, SOURCE_JSON, 100, 200) is None
+    assert open_member_store(tmp_path / "missing.bin", SOURCE_CSV, 100, 200) is None
+    path.write_bytes(path.read_bytes()[:-1])
+    assert open_member_store(path, SOURCE_CSV, 100, 200) is None
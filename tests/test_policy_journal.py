@@ -0,0 +1,32 @@
+"""Tests for the segmented RL policy journal."""
+
+from planning_agent.services.policy_journal import PolicyJournal
+
+
+def entry(value):
+    return {"tool_name": "get_members", "context_hash": "c", "action_value": value}
+
+
+def test_rotate_seals_segments_and_discard_deletes_them(tmp_path):
+    journal = PolicyJournal(tmp_path / "rl.journal")
+    assert journal.append(entry(1.0)) == 0
+    journal.rotate()
+    assert journal.append(entry(2.0)) == 1
+    journal.rotate()
+    journal.rotate()  # Nothing new to seal
+    assert journal.append(entry(3.0)) == 2
+
+    assert [e["action_value"] for e in journal.read()] == [1.0, 2.0, 3.0]
+    journal.discard(0)
+    journal.discard(2)  # Still being written to - kept
+    assert [e["action_value"] for e in journal.read()] == [2.0, 3.0]
+    journal.close()
+
+    # A new journal continues after the sealed segments it finds
+    reopened = PolicyJournal(tmp_path / "rl.journal")
+    assert [e["action_value"] for e in reopened.read()] == [2.0, 3.0]
+    assert reopened.append(entry(4.0)) == 2
+    reopened.truncate()
+    assert reopened.read() == []
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["rl.journal"]
+    reopened.close()
@@ -0,0 +1,62 @@
+"""Tests for folding old-format rl_policy rows into bucketed contexts."""
+
+import pytest
+from sqlalchemy import select
+
+from planning_agent.services.feedback_service import FeedbackService
+from planning_agent.services.policy_migration import fold_legacy_policy, legacy_context_hash
+from planning_agent.services.rl_service import RLPolicy, RLService, context_hash
+
+
+@pytest.fixture
+def rl_service(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'planning_agent.db'}"
+    service = RLService(FeedbackService(db_url), db_url)
+    with service.Session() as session:
+        session.add_all([
+            # Two old sessions that now share a length bucket (3-4)
+            RLPolicy(tool_name="get_members", context_hash=legacy_context_hash("get_dimensions", 3),
+                     action_value=2.0, visit_count=1),
+            RLPolicy(tool_name="get_members", context_hash=legacy_context_hash("get_dimensions", 4),
+                     action_value=6.0, visit_count=3),
+            # Per-query context, can't be recovered
+            RLPolicy(tool_name="get_members", context_hash=legacy_context_hash("", 2, ["export"]),
+                     action_value=9.0, visit_count=1),
+        ])
+        session.commit()
+    yield service
+    service.close()
+    service.engine.dispose()
+
+
+def policy_rows(service):
+    with service.Session() as session:
+        rows = session.execute(select(RLPolicy.context_hash, RLPolicy.action_value, RLPolicy.visit_count)).all()
+    return {row.context_hash: (row.action_value, row.visit_count) for row in rows}
+
+
+def test_fold_merges_recovered_rows_and_keeps_unrecoverable(rl_service):
+    stats = fold_legacy_policy(rl_service, tool_names=["get_dimensions"])
+    assert stats == {"legacy_rows": 3, "folded": 2, "kept": 1, "dropped": 0, "policy_rows": 1}
+
+    rows = policy_rows(rl_service)
+    new_context = context_hash("", "get_dimensions", 3)
+    # Visit-weighted mean of 2.0 (1 visit) and 6.0 (3 visits)
+    assert rows[new_context] == (pytest.approx(5.0), 4)
+    assert legacy_context_hash("", 2, ["export"]) in rows
+    assert len(rows) == 2
+
+
+def test_drop_unrecoverable_deletes_the_rest(rl_service):
+    stats = fold_legacy_policy(rl_service, tool_names=["get_dimensions"], drop_unrecoverable=True)
+    assert stats["dropped"] == 1
+    assert stats["kept"] == 0
+    assert list(policy_rows(rl_service)) == [context_hash("", "get_dimensions", 3)]
+
+
+def test_dry_run_writes_nothing(rl_service):
+    before = policy_rows(rl_service)
+    stats = fold_legacy_policy(rl_service, tool_names=["get_dimensions"], dry_run=True, drop_unrecoverable=True)
+    assert stats["folded"] == 2
+    assert stats["dropped"] == 1
+    assert policy_rows(rl_service) == before
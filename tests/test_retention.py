@@ -0,0 +1,33 @@
+"""Tests for compacting old tool executions."""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from planning_agent.services.feedback_service import FeedbackService, ToolExecution
+from planning_agent.services.retention import RetentionManager
+
+
+def test_compaction_deletes_blobs_no_execution_references(tmp_path):
+    service = FeedbackService(
+        f"sqlite:///{tmp_path / 'planning_agent.db'}", result_inline_max_bytes=10, blob_dir=tmp_path / "results"
+    )
+    old_only = {"status": "success", "data": "old"}
+    shared = {"status": "success", "data": "shared"}
+    old_ids = [service.log_execution("s", "get_members", {}, result, True, None, 1.0) for result in (old_only, shared)]
+    service.log_execution("s", "get_members", {}, shared, True, None, 1.0)
+    with service.Session() as session:
+        session.execute(
+            update(ToolExecution).where(ToolExecution.id.in_(old_ids))
+            .values(created_at=datetime.utcnow() - timedelta(days=100))
+        )
+        session.commit()
+
+    stats = RetentionManager(service, execution_retention_days=90).compact()
+
+    assert stats["tool_executions"] == 2
+    assert stats["result_blobs"] == 1
+    assert len(list((tmp_path / "results").rglob("*.z"))) == 1
+    remaining = service.get_recent_executions(limit=10)[0]["id"]
+    assert service.get_execution_result(remaining)["result"] == shared
+    service.engine.dispose()
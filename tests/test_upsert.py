@@ -0,0 +1,98 @@
+"""Tests for the ON CONFLICT upsert helpers."""
+
+import pytest
+from sqlalchemy import Column, Float, Integer, MetaData, String, Table, UniqueConstraint, create_engine, select
+from sqlalchemy.orm import Session
+
+from planning_agent.services import upsert
+from planning_agent.services.upsert import increment_upsert, replace_upsert
+
+metadata = MetaData()
+counters = Table(
+    "counters", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("day", String, nullable=False),
+    Column("calls", Integer),
+    Column("max_ms", Float),
+    UniqueConstraint("name", "day"),
+)
+
+
+@pytest.fixture(params=["sqlite", "fallback"])
+def session(request, monkeypatch):
+    if request.param == "fallback":
+        # Databases without ON CONFLICT take the UPDATE-then-INSERT path
+        monkeypatch.setattr(upsert, "dialect_insert", lambda name: None)
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def stored(session):
+    rows = session.execute(select(counters.c.name, counters.c.day, counters.c.calls, counters.c.max_ms)).all()
+    return {(r.name, r.day): (r.calls, r.max_ms) for r in rows}
+
+
+def test_increment_upsert_sums_and_keeps_max(session):
+    key = ("name", "day")
+    increment_upsert(session, counters, key, [
+        {"name": "a", "day": "d1", "calls": 1, "max_ms": 10.0},
+        {"name": "b", "day": "d1", "calls": 2, "max_ms": 5.0},
+    ], max_columns=["max_ms"])
+    increment_upsert(session, counters, key, [
+        {"name": "a", "day": "d1", "calls": 3, "max_ms": 4.0},
+        {"name": "b", "day": "d1", "calls": 1, "max_ms": 8.0},
+        {"name": "a", "day": "d2", "calls": 1, "max_ms": None},
+    ], max_columns=["max_ms"])
+    session.commit()
+
+    assert stored(session) == {
+        ("a", "d1"): (4, 10.0),
+        ("b", "d1"): (3, 8.0),
+        ("a", "d2"): (1, None),
+    }
+
+
+def test_increment_upsert_max_column_ignores_null(session):
+    key = ("name", "day")
+    increment_upsert(session, counters, key, [{"name": "a", "day": "d1", "calls": 1, "max_ms": None}],
+                     max_columns=["max_ms"])
+    increment_upsert(session, counters, key, [{"name": "a", "day": "d1", "calls": 1, "max_ms": 7.0}],
+                     max_columns=["max_ms"])
+    increment_upsert(session, counters, key, [{"name": "a", "day": "d1", "calls": 1, "max_ms": None}],
+                     max_columns=["max_ms"])
+    session.commit()
+
+    assert stored(session) == {("a", "d1"): (3, 7.0)}
+
+
+def test_increment_upsert_chunks_large_batches(session):
+    rows = [{"name": f"t{i}", "day": "d1", "calls": 1, "max_ms": 1.0} for i in range(upsert.UPSERT_CHUNK_ROWS + 10)]
+    increment_upsert(session, counters, ("name", "day"), rows)
+    increment_upsert(session, counters, ("name", "day"), rows)
+    session.commit()
+
+    values = stored(session)
+    assert len(values) == len(rows)
+    assert {calls for calls, _ in values.values()} == {2}
+
+
+def test_replace_upsert_overwrites_values(session):
+    key = ("name", "day")
+    replace_upsert(session, counters, key, [
+        {"name": "a", "day": "d1", "calls": 5, "max_ms": 50.0},
+        {"name": "b", "day": "d1", "calls": 1, "max_ms": 1.0},
+    ])
+    replace_upsert(session, counters, key, [{"name": "a", "day": "d1", "calls": 2, "max_ms": 3.0}])
+    session.commit()
+
+    assert stored(session) == {("a", "d1"): (2, 3.0), ("b", "d1"): (1, 1.0)}
+
+
+def test_empty_rows_are_a_no_op(session):
+    increment_upsert(session, counters, ("name", "day"), [])
+    replace_upsert(session, counters, ("name", "day"), [])
+    assert stored(session) == {}
@@ -87,6 +87,7 @@ def verify_rl_service(feedback_service):
         
         # Check if RL tables exist
         try:
+            rl_service.sync_policy()
             policy_dict = rl_service._get_policy_dict()
             print(f"{CHECK} RL policy table accessible ({len(policy_dict)} policies)")
         except Exception as e:
@@ -16,6 +16,9 @@ from planning_agent.agent import (
     close_agent,
     execute_tool,
     get_tool_definitions,
+    get_http_pool_stats,
+    get_slice_cache_stats,
+    get_session_stats,
 )
 from planning_agent.services.feedback_service import get_feedback_service
 from planning_agent.services.rl_service import get_rl_service
@@ -157,11 +160,28 @@ async def submit_feedback(request: FeedbackRequest):
 @app.get("/metrics")
 async def get_metrics(tool_name: Optional[str] = None):
     """Get tool execution metrics."""
+    http_pool = get_http_pool_stats()
+    slice_cache = get_slice_cache_stats()
+    sessions = get_session_stats()
     feedback_service = get_feedback_service()
+    rl_service = get_rl_service()
     if not feedback_service:
-        return {"metrics": [], "note": "Feedback service not available"}
+        return {
+            "metrics": [],
+            "http_pool": http_pool,
+            "slice_cache": slice_cache,
+            "sessions": sessions,
+            "note": "Feedback service not available"
+        }
 
-    return {"metrics": feedback_service.get_tool_metrics(tool_name)}
+    return {
+        "metrics": feedback_service.get_tool_metrics(tool_name, include_percentiles=True),
+        "http_pool": http_pool,
+        "slice_cache": slice_cache,
+        "sessions": sessions,
+        "feedback_writer": feedback_service.get_writer_stats(),
+        "rl_policy_writer": rl_service.get_writer_stats() if rl_service else None
+    }
 
 
 @app.get("/executions")
@@ -174,6 +194,19 @@ async def get_executions(tool_name: Optional[str] = None, limit: int = 50):
     return {"executions": feedback_service.get_recent_executions(tool_name, limit)}
 
 
+@app.get("/executions/{execution_id}/result")
+async def get_execution_result(execution_id: int):
+    """Get the full result of a tool execution (loaded from the blob store if offloaded)."""
+    feedback_service = get_feedback_service()
+    if not feedback_service:
+        raise HTTPException(status_code=503, detail="Feedback service not available")
+
+    result = feedback_service.get_execution_result(execution_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail=f"Execution not found: {execution_id}")
+    return result
+
+
 # RL Endpoints
 @app.get("/rl/metrics")
 async def get_rl_metrics():
@@ -250,11 +283,31 @@ async def get_rl_policy(tool_name: str):
 
 @app.post("/rl/recommendations")
 async def get_rl_recommendations(request: dict):
-    """Get RL-based tool recommendations for a query."""
+    """Get RL-based tool recommendations for a query, or for each of a list of "contexts"."""
     rl_service = get_rl_service()
     if not rl_service:
         return {"recommendations": [], "note": "RL service not available"}
 
+    top_k = request.get("top_k", 10)
+    if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+        raise HTTPException(status_code=400, detail="top_k must be a positive integer")
+
+    contexts = request.get("contexts")
+    if contexts is not None:
+        if not isinstance(contexts, list) or not all(isinstance(c, dict) for c in contexts):
+            raise HTTPException(status_code=400, detail="contexts must be a list of objects")
+        results = rl_service.get_tool_recommendations_batch(
+            contexts,
+            available_tools=request.get("available_tools"),
+            top_k=top_k
+        )
+        return {
+            "results": [
+                {"query": context.get("query", ""), "recommendations": recommendations}
+                for context, recommendations in zip(contexts, results)
+            ]
+        }
+
     user_query = request.get("query", "")
     request.get("session_id", "default")
     previous_tool = request.get("previous_tool")
@@ -263,12 +316,14 @@ async def get_rl_recommendations(request: dict):
     recommendations = rl_service.get_tool_recommendations(
         user_query=user_query,
         previous_tool=previous_tool,
-        session_length=session_length
+        session_length=session_length,
+        available_tools=request.get("available_tools"),
+        top_k=top_k
     )
 
     return {
         "query": user_query,
-        "recommendations": recommendations[:10]  # Top 10
+        "recommendations": recommendations
     }
 
 